@@ -21,8 +21,12 @@ import os
 from datetime import datetime
 
 # Import our custom modules
-from fetch_clickup import fetch_tasks_from_clickup, get_team_info, get_spaces_from_team, get_lists_from_space
-from organize_tasks import organize_tasks_by_employee, get_task_statistics, save_organized_tasks, save_task_statistics
+import requests
+
+from fetch_clickup import iter_task_pages, get_team_info, get_spaces_from_team, get_lists_from_space
+from stats_history import record_statistics_snapshot
+from task_changelog import ChangeLog
+from task_pipeline import stream_tasks_to_files
 
 
 def load_config():
@@ -166,30 +170,40 @@ def main():
     print(f"  Space: {config.get('space_name', 'Unknown')}")
     print(f"  List: {config.get('list_name', 'Unknown')}")
     
-    # Fetch tasks from ClickUp
+    # Fetch, organize, count and save tasks page by page
     print(f"\n📥 Fetching tasks from ClickUp...")
-    tasks = fetch_tasks_from_clickup(
+    print(f"📊 Organizing tasks by employee and generating statistics as pages arrive...")
+    pages = iter_task_pages(
         api_token=config["api_token"],
-        list_id=config["list_id"]
+        list_id=config["list_id"],
+        as_records=True
     )
+    try:
+        with ChangeLog("clickup_changes.jsonl") as changelog:
+            first_seq = changelog.seq
+            stats = stream_tasks_to_files(
+                pages,
+                "summary_clickup.json",
+                "clickup_statistics.json",
+                timing_filename="clickup_timing.json",
+                aggregates_filename="clickup_aggregates.json",
+                changelog=changelog,
+                on_page=lambda page, task_count: print(f"  📄 Page {page}: {task_count} tasks saved so far")
+            )
+            print(f"📝 Logged {changelog.seq - first_seq} task change(s) to clickup_changes.jsonl")
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Error fetching tasks from ClickUp: {e}")
+        return
     
-    if not tasks:
+    if not stats["total_tasks"]:
         print("❌ No tasks found or error occurred.")
         return
     
-    print(f"✅ Successfully fetched {len(tasks)} tasks")
-    
-    # Organize tasks by employee
-    print(f"\n📊 Organizing tasks by employee...")
-    organized_tasks = organize_tasks_by_employee(tasks)
-    
-    print(f"✅ Organized tasks for {len(organized_tasks)} employees:")
-    for employee, emp_tasks in organized_tasks.items():
-        print(f"  {employee}: {len(emp_tasks)} tasks")
-    
-    # Generate statistics
-    print(f"\n📈 Generating task statistics...")
-    stats = get_task_statistics(organized_tasks)
+    print(f"✅ Successfully fetched {stats['total_tasks']} tasks")
+    record_statistics_snapshot(stats)
+    print(f"✅ Organized tasks for {stats['total_employees']} employees:")
+    for employee, emp_stats in stats['employee_stats'].items():
+        print(f"  {employee}: {emp_stats['total_tasks']} tasks")
     
     print(f"\n📊 Summary Statistics:")
     print(f"  Total employees: {stats['total_employees']}")
@@ -205,16 +219,14 @@ def main():
         print(f"    🔔 Due soon: {emp_stats['due_soon_tasks']}")
         print(f"    📊 Completion rate: {emp_stats['completion_rate']}%")
     
-    # Save results
-    print(f"\n💾 Saving results...")
-    save_organized_tasks(organized_tasks, "summary_clickup.json")
-    save_task_statistics(stats, "clickup_statistics.json")
-    
-    
     print(f"\n🎉 Agent 2 completed successfully!")
     print(f"📁 Output files:")
     print(f"  - summary_clickup.json (organized tasks)")
     print(f"  - clickup_statistics.json (detailed statistics)")
+    print(f"  - clickup_timing.json (lead time, cycle time and estimate accuracy)")
+    print(f"  - clickup_aggregates.json (dashboard count tables)")
+    print(f"  - clickup_stats_history.db (statistics history)")
+    print(f"  - clickup_changes.jsonl (task change log)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,274 @@
+"""
+ClickUp Task Records
+====================
+
+Decodes ClickUp task responses straight from the raw response bytes into
+compact, slotted TaskRecord objects that keep only the fields this project
+uses. Timestamps are parsed to epoch milliseconds once, at decode time.
+
+msgspec is used when it is installed: it decodes into typed structs and skips
+every field we don't declare without building dicts for them. Otherwise the
+standard json module is used.
+"""
+
+import json
+from sys import intern
+from typing import Any, List, Optional, Union
+
+from organize_tasks import parse_clickup_timestamp
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _intern(value):
+    """Share one string object for repeated low-cardinality values (statuses, names, tags)"""
+    return intern(value) if isinstance(value, str) else value
+
+
+class TaskRecord:
+    """
+    One ClickUp task, reduced to the fields the agents and dashboard use
+
+    Records behave like read-only mappings with the same keys as the task
+    info dicts produced by normalize_task (``record["status"]``,
+    ``record.get("due_date")``, ``dict(record)``), so they can be used
+    wherever those dicts are.
+    """
+
+    __slots__ = (
+        "id", "name", "description", "status", "priority", "assignees", "creator",
+        "due_date", "start_date", "date_created", "date_updated", "date_closed", "url", "tags",
+        "time_estimate", "time_spent", "parent", "waiting_on", "blocking", "custom_fields",
+    )
+
+    # Keys exposed through the mapping interface, in normalize_task order
+    FIELDS = (
+        "id", "name", "description", "status", "priority", "due_date", "start_date",
+        "date_created", "date_updated", "date_closed", "url", "tags", "time_estimate",
+        "time_spent", "creator", "assignees", "parent", "waiting_on", "blocking", "custom_fields",
+    )
+    TIMESTAMP_FIELDS = ("due_date", "start_date", "date_created", "date_updated", "date_closed")
+
+    def __init__(self, id="", name="Untitled Task", description="", status="Unknown",
+                 priority="Normal", assignees=(), creator="Unknown", due_date=None, start_date=None,
+                 date_created=None, date_updated=None, date_closed=None, url="", tags=(),
+                 time_estimate=None, time_spent=None, parent=None, waiting_on=(), blocking=(),
+                 custom_fields=None):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.status = status
+        self.priority = priority
+        self.assignees = tuple(assignees)
+        self.creator = creator
+        self.due_date = due_date
+        self.start_date = start_date
+        self.date_created = date_created
+        self.date_updated = date_updated
+        self.date_closed = date_closed
+        self.url = url
+        self.tags = tuple(tags)
+        self.time_estimate = time_estimate
+        self.time_spent = time_spent
+        self.parent = parent
+        self.waiting_on = tuple(waiting_on)
+        self.blocking = tuple(blocking)
+        self.custom_fields = custom_fields
+
+    @property
+    def employee(self):
+        """Employee the task is filed under: the first assignee, as organize_tasks_by_employee does"""
+        return self.assignees[0] if self.assignees else "Unassigned"
+
+    @classmethod
+    def from_raw(cls, task):
+        """Build a record from a raw ClickUp task dict"""
+        status = task.get("status") or {}
+        priority = task.get("priority") or {}
+        creator = task.get("creator") or {}
+        task_id = task.get("id", "")
+        dependencies = task.get("dependencies") or []
+        waiting_on = [d.get("depends_on") for d in dependencies if d.get("task_id") == task_id and d.get("depends_on")]
+        blocking = [d.get("task_id") for d in dependencies if d.get("depends_on") == task_id and d.get("task_id")]
+        custom_fields = task.get("custom_fields") or None
+        if custom_fields:
+            custom_fields = {
+                field.get("name", "Unknown Field"): field.get("value", "") for field in custom_fields
+            }
+        return cls(
+            id=task_id,
+            name=task.get("name", "Untitled Task"),
+            description=task.get("description", ""),
+            status=_intern(status.get("status", "Unknown")) if status else "Unknown",
+            priority=_intern(priority.get("priority", "Normal")) if priority else "Normal",
+            assignees=[_intern(a.get("username", "Unknown")) for a in task.get("assignees") or []],
+            creator=_intern(creator.get("username", "Unknown")) if creator else "Unknown",
+            due_date=parse_clickup_timestamp(task.get("due_date")),
+            start_date=parse_clickup_timestamp(task.get("start_date")),
+            date_created=parse_clickup_timestamp(task.get("date_created")),
+            date_updated=parse_clickup_timestamp(task.get("date_updated")),
+            date_closed=parse_clickup_timestamp(task.get("date_closed")),
+            url=task.get("url", ""),
+            tags=[_intern(tag.get("name", "")) for tag in task.get("tags") or [] if tag],
+            time_estimate=task.get("time_estimate"),
+            time_spent=task.get("time_spent"),
+            parent=task.get("parent"),
+            waiting_on=waiting_on,
+            blocking=blocking,
+            custom_fields=custom_fields,
+        )
+
+    # --- read-only mapping interface ---
+    def keys(self):
+        if self.custom_fields:
+            return self.FIELDS
+        return self.FIELDS[:-1]
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def get(self, key, default=None):
+        if key not in self.FIELDS:
+            return default
+        return getattr(self, key)
+
+    def to_dict(self):
+        """
+        Convert back to the task info dict written to summary_clickup.json
+
+        Timestamps are written as ms epoch strings, as ClickUp sends them.
+        """
+        task_info = {key: getattr(self, key) for key in self.keys()}
+        task_info["tags"] = list(self.tags)
+        task_info["assignees"] = list(self.assignees)
+        task_info["waiting_on"] = list(self.waiting_on)
+        task_info["blocking"] = list(self.blocking)
+        for key in self.TIMESTAMP_FIELDS:
+            if task_info[key] is not None:
+                task_info[key] = str(task_info[key])
+        return task_info
+
+    def __repr__(self):
+        return f"TaskRecord(id={self.id!r}, name={self.name!r}, status={self.status!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, TaskRecord):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+
+def _decode_page_json(body):
+    data = json.loads(body)
+    return [TaskRecord.from_raw(task) for task in data.get("tasks", []) if task], data.get("last_page", True)
+
+
+if msgspec is not None:
+    Timestamp = Optional[Union[int, str]]
+
+    class _RawUser(msgspec.Struct):
+        username: Optional[str] = "Unknown"
+
+    class _RawStatus(msgspec.Struct):
+        status: str = "Unknown"
+
+    class _RawPriority(msgspec.Struct):
+        priority: Optional[str] = "Normal"
+
+    class _RawTag(msgspec.Struct):
+        name: str = ""
+
+    class _RawDependency(msgspec.Struct):
+        task_id: Optional[str] = None
+        depends_on: Optional[str] = None
+
+    class _RawField(msgspec.Struct):
+        name: str = "Unknown Field"
+        value: Any = ""
+
+    class _RawTask(msgspec.Struct):
+        id: str = ""
+        name: str = "Untitled Task"
+        description: Optional[str] = ""
+        status: Optional[_RawStatus] = None
+        priority: Optional[_RawPriority] = None
+        assignees: List[_RawUser] = []
+        creator: Optional[_RawUser] = None
+        due_date: Timestamp = None
+        start_date: Timestamp = None
+        date_created: Timestamp = None
+        date_updated: Timestamp = None
+        date_closed: Timestamp = None
+        url: str = ""
+        tags: List[Optional[_RawTag]] = []
+        time_estimate: Optional[int] = None
+        time_spent: Optional[int] = None
+        parent: Optional[str] = None
+        dependencies: List[_RawDependency] = []
+        custom_fields: Optional[List[_RawField]] = None
+
+    class _RawPage(msgspec.Struct):
+        tasks: List[_RawTask] = []
+        last_page: bool = True
+
+    _page_decoder = msgspec.json.Decoder(_RawPage, strict=False)
+
+    def _decode_page_msgspec(body):
+        page = _page_decoder.decode(body)
+        records = []
+        for task in page.tasks:
+            custom_fields = None
+            if task.custom_fields:
+                custom_fields = {field.name: field.value for field in task.custom_fields}
+            records.append(TaskRecord(
+                id=task.id,
+                name=task.name,
+                description=task.description,
+                status=_intern(task.status.status) if task.status else "Unknown",
+                priority=_intern(task.priority.priority) if task.priority else "Normal",
+                assignees=[_intern(a.username) for a in task.assignees],
+                creator=_intern(task.creator.username) if task.creator else "Unknown",
+                due_date=parse_clickup_timestamp(task.due_date),
+                start_date=parse_clickup_timestamp(task.start_date),
+                date_created=parse_clickup_timestamp(task.date_created),
+                date_updated=parse_clickup_timestamp(task.date_updated),
+                date_closed=parse_clickup_timestamp(task.date_closed),
+                url=task.url,
+                tags=[_intern(tag.name) for tag in task.tags if tag],
+                time_estimate=task.time_estimate,
+                time_spent=task.time_spent,
+                parent=task.parent,
+                waiting_on=[d.depends_on for d in task.dependencies if d.task_id == task.id and d.depends_on],
+                blocking=[d.task_id for d in task.dependencies if d.depends_on == task.id and d.task_id],
+                custom_fields=custom_fields,
+            ))
+        return records, page.last_page
+
+
+def decode_task_page(body):
+    """
+    Decode a ClickUp task list response body into TaskRecords
+
+    Args:
+        body (bytes): Raw response body of a list, space or team task request
+
+    Returns:
+        tuple: (list of TaskRecord, last_page flag)
+    """
+    if msgspec is not None:
+        return _decode_page_msgspec(body)
+    return _decode_page_json(body)
+
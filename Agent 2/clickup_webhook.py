@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+ClickUp Webhook Receiver
+========================
+
+Accepts ClickUp task webhooks and applies each event to the local task store,
+so summary_clickup.json and clickup_statistics.json stay current without
+polling the API. The dashboard's aggregate tables (clickup_aggregates.json)
+are updated along with them.
+
+Usage:
+    python clickup_webhook.py --port 8766 --secret <webhook secret>
+    python clickup_webhook.py --register https://example.com/clickup/webhook
+
+Handled events: taskCreated, taskUpdated, taskStatusUpdated,
+taskAssigneeUpdated and taskDeleted.
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from due_index import DeadlineScheduler
+from fetch_clickup import create_webhook, get_task_from_clickup
+from organize_tasks import COMPLETED_STATUSES, normalize_task
+from stats_history import HISTORY_FILENAME, StatsHistory
+from task_aggregates import AGGREGATES_FILENAME
+from task_changelog import ChangeLog
+from task_index import task_assignees
+from task_store import TaskStore
+
+
+WEBHOOK_PATH = "/clickup/webhook"
+
+TASK_EVENTS = [
+    "taskCreated",
+    "taskUpdated",
+    "taskStatusUpdated",
+    "taskAssigneeUpdated",
+    "taskDeleted",
+]
+
+
+def verify_signature(body, signature, secret):
+    """
+    Check a webhook body against ClickUp's X-Signature header
+
+    ClickUp signs the raw request body with HMAC-SHA256 using the webhook secret
+    and sends the hex digest.
+
+    Args:
+        body (bytes): Raw request body
+        signature (str): Value of the X-Signature header
+        secret (str): Webhook secret returned when the webhook was created
+
+    Returns:
+        bool: True if the signature matches
+    """
+    if not signature or not secret:
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def apply_webhook_event(store, event, fetch_task=None):
+    """
+    Apply one ClickUp webhook event to the task store
+
+    Status and assignee changes are applied straight from the event's history
+    items. Creations, general updates and events for tasks the store has not
+    seen need the full task, which is requested through ``fetch_task``.
+
+    Args:
+        store (TaskStore): Store to update
+        event (dict): Decoded webhook payload
+        fetch_task (callable): Optional task_id -> raw task dict (or None)
+
+    Returns:
+        str: Short description of what was applied
+    """
+    name = event.get("event")
+    task_id = event.get("task_id")
+    history = event.get("history_items") or []
+
+    if not task_id:
+        return f"ignored {name}: no task_id"
+
+    if name == "taskDeleted":
+        return f"deleted {task_id}" if store.remove(task_id) else f"ignored delete of unknown {task_id}"
+
+    if name == "taskStatusUpdated" and store.get(task_id):
+        status = None
+        for item in history:
+            if item.get("field") == "status":
+                status = (item.get("after") or {}).get("status", status)
+        if status is not None:
+            event_date = _event_date(history)
+            # Closed when it moves into a completed status, reopened otherwise
+            closed = status.lower() in COMPLETED_STATUSES
+            changes = {"status": status, "date_updated": event_date, "date_closed": event_date if closed else None}
+            store.patch(task_id, changes)
+            return f"status of {task_id} -> {status}"
+
+    if name == "taskAssigneeUpdated" and store.get(task_id):
+        assignees = [a for a in task_assignees(store.get(task_id), store.employee_of(task_id)) if a != "Unassigned"]
+        for item in history:
+            if item.get("field") == "assignee_add":
+                username = (item.get("after") or {}).get("username")
+                if username and username not in assignees:
+                    assignees.append(username)
+            elif item.get("field") == "assignee_rem":
+                username = (item.get("before") or {}).get("username")
+                if username in assignees:
+                    assignees.remove(username)
+        employee = assignees[0] if assignees else "Unassigned"
+        changes = {"assignees": assignees, "date_updated": _event_date(history)}
+        store.patch(task_id, changes, employee=employee)
+        return f"assignees of {task_id} -> {', '.join(assignees) or 'Unassigned'}"
+
+    if name not in TASK_EVENTS:
+        return f"ignored {name}"
+
+    if fetch_task is None:
+        return f"ignored {name} for {task_id}: no way to fetch the task"
+    task = fetch_task(task_id)
+    if not task:
+        return f"ignored {name} for {task_id}: task could not be fetched"
+    employee, task_info = normalize_task(task)
+    store.upsert(employee, task_info)
+    return f"stored {task_id} for {employee}"
+
+
+def _event_date(history):
+    """Latest history item date (ms epoch string), falling back to now"""
+    dates = [item.get("date") for item in history if item.get("date")]
+    return max(dates, key=int) if dates else str(int(time.time() * 1000))
+
+
+class ClickUpWebhookServer:
+    """
+    HTTP receiver that applies ClickUp webhook events to a TaskStore
+
+    The store is written back to disk at most every ``flush_interval`` seconds
+    so bursts of events cost one file write. A DeadlineScheduler moves tasks
+    into the due soon / overdue counts as their deadlines pass and reports
+    each crossing to ``on_deadline``.
+
+    Args:
+        store (TaskStore): Store to update
+        secret (str): Webhook secret for signature verification
+        fetch_task (callable): task_id -> raw task dict, used for creates/updates
+        tasks_filename (str): Where to write organized tasks
+        stats_filename (str): Where to write statistics
+        checkpoint_filename (str): Where to checkpoint the running statistics
+        history_filename (str): Statistics history database; a snapshot is
+            recorded on every write (None to disable)
+        aggregates_filename (str): Where to write the dashboard's aggregate tables
+        host (str): Interface to bind
+        port (int): Port to bind
+        flush_interval (float): Seconds between writes of pending changes
+        on_deadline (callable): Notification hook, called as
+            on_deadline(kind, task_info) with kind "due_soon" or "overdue"
+    """
+
+    def __init__(self, store, secret, fetch_task=None, tasks_filename="summary_clickup.json",
+                 stats_filename="clickup_statistics.json",
+                 checkpoint_filename="clickup_stats_checkpoint.json", history_filename=HISTORY_FILENAME,
+                 aggregates_filename=AGGREGATES_FILENAME,
+                 host="127.0.0.1", port=8766, flush_interval=2.0, on_deadline=None):
+        self.store = store
+        self.secret = secret
+        self.fetch_task = fetch_task
+        self.tasks_filename = tasks_filename
+        self.stats_filename = stats_filename
+        self.checkpoint_filename = checkpoint_filename
+        self.aggregates_filename = aggregates_filename
+        self.history = StatsHistory(history_filename) if history_filename else None
+        self.flush_interval = flush_interval
+        self.dirty = threading.Event()
+        self.stopping = threading.Event()
+
+        handler = type("Handler", (_WebhookHandler,), {"receiver": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self.on_deadline = on_deadline or _print_deadline
+        self.scheduler = DeadlineScheduler(store.due_index, self._handle_deadline)
+
+    def handle_event(self, body, signature):
+        """Verify, decode and apply one webhook delivery; returns an HTTP status code"""
+        if not verify_signature(body, signature, self.secret):
+            return 401
+        try:
+            event = json.loads(body)
+        except ValueError:
+            return 400
+        if not isinstance(event, dict):
+            return 400
+        print(f"📨 {apply_webhook_event(self.store, event, self.fetch_task)}")
+        self.dirty.set()
+        return 200
+
+    def _handle_deadline(self, kind, task_id, due_ms):
+        self.store.apply_deadline_alert(kind, task_id)
+        self.dirty.set()
+        task_info = self.store.get(task_id)
+        if task_info is not None:
+            self.on_deadline(kind, task_info)
+
+    def flush(self):
+        if self.dirty.is_set():
+            self.dirty.clear()
+            self.store.save(self.tasks_filename, self.stats_filename, self.checkpoint_filename,
+                            self.aggregates_filename)
+            if self.history is not None:
+                self.history.record(self.store.statistics())
+            if self.store.changelog is not None:
+                self.store.changelog.save_state()
+
+    def _flush_loop(self):
+        while not self.stopping.wait(self.flush_interval):
+            self.flush()
+
+    def serve_forever(self):
+        self.flusher.start()
+        self.scheduler.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.scheduler.stop()
+            self.stopping.set()
+            self.flush()
+            self.httpd.server_close()
+            if self.history is not None:
+                self.history.close()
+
+
+def _print_deadline(kind, task_info):
+    label = "is now overdue" if kind == "overdue" else "is due soon"
+    print(f"⏰ Task '{task_info.get('name', 'Untitled Task')}' ({task_info.get('id')}) {label}")
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    receiver = None
+
+    def do_POST(self):
+        if self.path != WEBHOOK_PATH:
+            self.send_response(404)
+            self.end_headers()
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        status = self.receiver.handle_event(body, self.headers.get("X-Signature"))
+        self.send_response(status)
+        self.end_headers()
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    from agent2_main import load_config
+
+    parser = argparse.ArgumentParser(description="Receive ClickUp task webhooks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--secret", default=os.getenv("CLICKUP_WEBHOOK_SECRET"),
+                        help="webhook secret (defaults to CLICKUP_WEBHOOK_SECRET)")
+    parser.add_argument("--register", metavar="PUBLIC_URL",
+                        help="register a webhook pointing at PUBLIC_URL and print its secret")
+    args = parser.parse_args()
+
+    config = load_config()
+
+    if args.register:
+        webhook = create_webhook(config["api_token"], config["team_id"], args.register, TASK_EVENTS)
+        if not webhook:
+            sys.exit(1)
+        print(f"🔑 Webhook secret: {webhook.get('secret')}")
+        print("   Start the receiver with --secret or CLICKUP_WEBHOOK_SECRET set to it.")
+        sys.exit(0)
+
+    if not args.secret:
+        print("❌ A webhook secret is required (--secret or CLICKUP_WEBHOOK_SECRET)")
+        sys.exit(1)
+
+    store = TaskStore.load("summary_clickup.json")
+    store.changelog = ChangeLog("clickup_changes.jsonl")
+    print(f"✅ Loaded {len(store.tasks)} tasks into the local store")
+
+    receiver = ClickUpWebhookServer(
+        store,
+        args.secret,
+        fetch_task=lambda task_id: get_task_from_clickup(config["api_token"], task_id),
+        host=args.host,
+        port=args.port
+    )
+    print(f"👂 Listening for ClickUp webhooks on http://{args.host}:{args.port}{WEBHOOK_PATH}")
+    try:
+        receiver.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Receiver stopped.")
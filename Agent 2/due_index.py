@@ -0,0 +1,198 @@
+"""
+Due Date Index
+==============
+
+DueDateIndex keeps open tasks sorted by due date so "overdue now" and "due in
+the next N days" are answered with a binary search plus the matching slice
+(O(log n + k)) instead of checking every task against the clock.
+
+DeadlineScheduler watches the index from a background thread and calls back
+exactly when a task comes within the due-soon window or passes its deadline.
+It sleeps until the next crossing rather than rescanning on a timer.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+
+from organize_tasks import COMPLETED_STATUSES, DAY_MS, DUE_SOON_DAYS, parse_clickup_timestamp
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class DueDateIndex:
+    """
+    Sorted (due_ms, task_id) entries for open tasks that have a due date
+
+    Thread-safe; ``changed`` is notified on every modification so a
+    DeadlineScheduler can re-plan its next wake-up.
+    """
+
+    def __init__(self):
+        self.entries = []  # sorted (due_ms, task_id)
+        self.due = {}      # task id -> due_ms
+        self.changed = threading.Condition()
+
+    @classmethod
+    def from_employee_tasks(cls, employee_tasks):
+        """Build an index from an organized tasks dict (employee -> list of tasks)"""
+        index = cls()
+        entries = []
+        for tasks in employee_tasks.values():
+            for task_info in tasks:
+                due_ms = _open_due_ms(task_info)
+                if due_ms is not None:
+                    index.due[task_info["id"]] = due_ms
+                    entries.append((due_ms, task_info["id"]))
+        entries.sort()
+        index.entries = entries
+        return index
+
+    def __len__(self):
+        return len(self.entries)
+
+    def track(self, task_info):
+        """Index a task if it is open and has a due date, otherwise drop it"""
+        due_ms = _open_due_ms(task_info)
+        if due_ms is None:
+            self.remove(task_info["id"])
+        else:
+            self.set(task_info["id"], due_ms)
+
+    def set(self, task_id, due_ms):
+        with self.changed:
+            if self.due.get(task_id) == due_ms:
+                return
+            self._discard(task_id)
+            self.due[task_id] = due_ms
+            insort(self.entries, (due_ms, task_id))
+            self.changed.notify_all()
+
+    def remove(self, task_id):
+        with self.changed:
+            if self._discard(task_id):
+                self.changed.notify_all()
+
+    def _discard(self, task_id):
+        due_ms = self.due.pop(task_id, None)
+        if due_ms is None:
+            return False
+        del self.entries[bisect_left(self.entries, (due_ms, task_id))]
+        return True
+
+    def between(self, start_ms, end_ms):
+        """Task ids with start_ms <= due < end_ms, earliest first"""
+        with self.changed:
+            lo = bisect_left(self.entries, (start_ms,))
+            hi = bisect_left(self.entries, (end_ms,))
+            return [task_id for _, task_id in self.entries[lo:hi]]
+
+    def overdue(self, now_ms=None):
+        """Open task ids whose due date has passed"""
+        now_ms = _now_ms() if now_ms is None else now_ms
+        with self.changed:
+            return [task_id for _, task_id in self.entries[:bisect_left(self.entries, (now_ms,))]]
+
+    def due_within(self, days=DUE_SOON_DAYS, now_ms=None):
+        """Open task ids due from now through the next ``days`` days"""
+        now_ms = _now_ms() if now_ms is None else now_ms
+        return self.between(now_ms, now_ms + days * DAY_MS + 1)
+
+    def first_at_or_after(self, ms):
+        """Earliest due date >= ``ms``, or None"""
+        position = bisect_left(self.entries, (ms,))
+        return self.entries[position][0] if position < len(self.entries) else None
+
+
+def _open_due_ms(task_info):
+    if (task_info.get("status") or "").lower() in COMPLETED_STATUSES:
+        return None
+    return parse_clickup_timestamp(task_info.get("due_date"))
+
+
+class DeadlineScheduler:
+    """
+    Calls ``on_alert(kind, task_id, due_ms)`` when open tasks cross a deadline
+
+    ``kind`` is "due_soon" when a task comes within ``due_soon_days`` of its due
+    date and "overdue" once the due date has passed. Only crossings after the
+    scheduler starts are reported; tasks already overdue or due soon at that
+    point are assumed to be counted already.
+
+    Args:
+        index (DueDateIndex): Index to watch
+        on_alert (callable): Called from the scheduler thread, outside any lock
+        due_soon_days (int): Size of the due-soon window
+    """
+
+    def __init__(self, index, on_alert, due_soon_days=DUE_SOON_DAYS):
+        self.index = index
+        self.on_alert = on_alert
+        self.window_ms = due_soon_days * DAY_MS
+        self.stopping = False
+        self.thread = None
+        self.overdue_cursor = None   # tasks due before this have been reported overdue
+        self.due_soon_cursor = None  # tasks due at or before this have been reported due soon
+
+    def start(self, now_ms=None):
+        now_ms = _now_ms() if now_ms is None else now_ms
+        self.overdue_cursor = now_ms
+        self.due_soon_cursor = now_ms + self.window_ms
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        with self.index.changed:
+            self.stopping = True
+            self.index.changed.notify_all()
+        if self.thread:
+            self.thread.join()
+
+    def collect(self, now_ms):
+        """
+        Advance the cursors to ``now_ms`` and return the crossings in between
+
+        Returns:
+            list: (kind, task_id, due_ms) tuples, earliest first per kind
+        """
+        entries = self.index.entries
+        alerts = []
+
+        lo = bisect_left(entries, (self.due_soon_cursor + 1,))
+        hi = bisect_left(entries, (now_ms + self.window_ms + 1,))
+        alerts.extend(("due_soon", task_id, due_ms) for due_ms, task_id in entries[lo:hi])
+        self.due_soon_cursor = max(self.due_soon_cursor, now_ms + self.window_ms)
+
+        lo = bisect_left(entries, (self.overdue_cursor,))
+        hi = bisect_left(entries, (now_ms,))
+        alerts.extend(("overdue", task_id, due_ms) for due_ms, task_id in entries[lo:hi])
+        self.overdue_cursor = max(self.overdue_cursor, now_ms)
+        return alerts
+
+    def next_crossing(self):
+        """Time (ms) of the next crossing, or None if nothing is pending"""
+        next_due_soon = self.index.first_at_or_after(self.due_soon_cursor + 1)
+        next_overdue = self.index.first_at_or_after(self.overdue_cursor)
+        candidates = []
+        if next_due_soon is not None:
+            candidates.append(next_due_soon - self.window_ms)
+        if next_overdue is not None:
+            candidates.append(next_overdue + 1)
+        return min(candidates) if candidates else None
+
+    def _run(self):
+        while True:
+            with self.index.changed:
+                if self.stopping:
+                    return
+                alerts = self.collect(_now_ms())
+                if not alerts:
+                    wake_at = self.next_crossing()
+                    timeout = None if wake_at is None else min(max(wake_at - _now_ms(), 0) / 1000, threading.TIMEOUT_MAX)
+                    self.index.changed.wait(timeout)
+                    continue
+            for kind, task_id, due_ms in alerts:
+                self.on_alert(kind, task_id, due_ms)
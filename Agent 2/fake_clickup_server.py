@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Fake ClickUp API Server
+=======================
+
+A local stand-in for the parts of the ClickUp v2 API that Agent 2 and the
+dashboard use: teams, spaces, lists, members and tasks (paginated, with
+date_updated filtering, plus create/update/delete). Workspaces are generated
+synthetically at any size so sync throughput can be measured without
+touching the real API.
+
+Usage:
+    python fake_clickup_server.py --tasks 100000 --port 8765
+    python fake_clickup_server.py --tasks 100000 --bench
+
+Point the client at it with:
+    export CLICKUP_API_BASE=http://127.0.0.1:8765/api/v2
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+PAGE_SIZE = 100
+
+STATUSES = [
+    ("to do", "open"),
+    ("in progress", "custom"),
+    ("review", "custom"),
+    ("complete", "closed"),
+]
+PRIORITIES = ["urgent", "high", "normal", "low", None]
+TAGS = ["bug", "feature", "frontend", "backend", "documentation", "review", "infra"]
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def generate_workspace(num_tasks=1000, num_members=20, num_lists=1, seed=0, now_ms=None, first_task=0):
+    """
+    Generate a synthetic ClickUp workspace
+
+    Args:
+        num_tasks (int): Total number of tasks, spread evenly across lists
+        num_members (int): Number of team members
+        num_lists (int): Number of lists in the single space
+        seed (int): Random seed so workspaces are reproducible
+        now_ms (int): Reference time in ms; defaults to the current time
+        first_task (int): Number of the first task, so a large workspace can
+            be generated in parts with distinct task ids
+
+    Returns:
+        dict: Workspace with "team", "space", "lists", "members" and "tasks"
+            (task id -> raw ClickUp task dict, ordered by creation)
+    """
+    rng = random.Random(seed)
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+
+    team = {"id": "9000", "name": "Fake Workspace"}
+    space = {"id": "9100", "name": "Fake Space"}
+    lists = [{"id": str(9200 + i), "name": f"Fake List {i + 1}"} for i in range(max(num_lists, 1))]
+    members = [
+        {"id": 100 + i, "username": f"member_{i:03d}", "email": f"member_{i:03d}@example.com"}
+        for i in range(num_members)
+    ]
+
+    tasks = {}
+    for i in range(first_task, first_task + num_tasks):
+        task_id = f"fk{i:07d}"
+        list_item = lists[i % len(lists)]
+        status, status_type = rng.choice(STATUSES)
+        priority = rng.choice(PRIORITIES)
+        created = now_ms - rng.randint(1, 180) * DAY_MS
+        updated = created + rng.randint(0, now_ms - created)
+        due = created + rng.randint(1, 60) * DAY_MS if rng.random() < 0.8 else None
+        closed = updated if status_type == "closed" else None
+        started = created + (updated - created) // 3 if status_type != "open" else None
+        estimate = rng.choice([None, 1, 2, 4, 8, 16])
+        assignees = rng.sample(members, k=rng.choice([0, 1, 1, 1, 2])) if members else []
+        creator = rng.choice(members) if members else {"id": 1, "username": "fake_admin"}
+
+        tasks[task_id] = {
+            "id": task_id,
+            "name": f"Task {i + 1}",
+            "description": f"Synthetic task {i + 1}",
+            "status": {"status": status, "type": status_type},
+            "priority": {"priority": priority} if priority else None,
+            "assignees": [dict(member) for member in assignees],
+            "creator": {"id": creator["id"], "username": creator["username"]},
+            "due_date": str(due) if due else None,
+            "start_date": str(started) if started else None,
+            "date_created": str(created),
+            "date_updated": str(updated),
+            "date_closed": str(closed) if closed else None,
+            "url": f"https://app.clickup.com/t/{task_id}",
+            "tags": [{"name": tag} for tag in rng.sample(TAGS, k=rng.randint(0, 2))],
+            "time_estimate": estimate * 3600000 if estimate else None,
+            "time_spent": int(estimate * 3600000 * rng.uniform(0.5, 1.5)) if estimate and closed else None,
+            "custom_fields": [],
+            "parent": None,
+            "dependencies": [],
+            "list": {"id": list_item["id"]},
+            "space": {"id": space["id"]},
+            "team_id": team["id"],
+        }
+
+    _link_tasks(list(tasks.values()), random.Random(seed + 1))
+    return {"team": team, "space": space, "lists": lists, "members": members, "tasks": tasks}
+
+
+def _link_tasks(task_list, rng, subtask_rate=0.15, dependency_rate=0.2):
+    """
+    Make some tasks subtasks of a later task and some wait on an earlier task
+
+    A parent waits on its subtasks, so in both cases the waiting task comes
+    later in creation order and the generated graph has no cycles.
+    Dependencies are recorded on both tasks, as ClickUp does.
+    """
+    for position, task in enumerate(task_list):
+        if position + 1 < len(task_list) and rng.random() < subtask_rate:
+            task["parent"] = task_list[rng.randrange(position + 1, min(len(task_list), position + 51))]["id"]
+        if position and rng.random() < dependency_rate:
+            blocker = task_list[rng.randrange(max(0, position - 50), position)]
+            dependency = {"task_id": task["id"], "depends_on": blocker["id"], "type": 1}
+            task["dependencies"].append(dependency)
+            blocker["dependencies"].append(dict(dependency))
+
+
+class FakeClickUpServer:
+    """
+    In-process HTTP server serving a generated workspace over the ClickUp v2 routes
+
+    Args:
+        workspace (dict): Workspace from generate_workspace
+        host (str): Interface to bind
+        port (int): Port to bind; 0 picks a free port
+        latency (float): Seconds added to every response
+        rate_limit (int): Requests per minute per token before answering 429; 0 disables
+        failure_rate (float): Probability (0-1) of answering a request with a 500
+        seed (int): Seed for failure injection
+    """
+
+    def __init__(self, workspace, host="127.0.0.1", port=0, latency=0.0, rate_limit=0,
+                 failure_rate=0.0, seed=0):
+        self.workspace = workspace
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.windows = {}  # token -> (window start, requests in window)
+        self.next_task_number = len(workspace["tasks"])
+        self.version = 0  # bumped on every mutation
+        self.selections = {}
+
+        handler = type("Handler", (_FakeClickUpHandler,), {"server_state": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v2"
+
+    def start(self):
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def check_rate_limit(self, token):
+        """Return the reset time (unix seconds) if ``token`` is over its budget, else None"""
+        if not self.rate_limit:
+            return None
+        with self.lock:
+            now = time.time()
+            start, count = self.windows.get(token, (now, 0))
+            if now - start >= 60:
+                start, count = now, 0
+            if count >= self.rate_limit:
+                return start + 60
+            self.windows[token] = (start, count + 1)
+            return None
+
+    def touch(self):
+        """Record a workspace mutation so cached task selections are rebuilt"""
+        with self.lock:
+            self.version += 1
+            self.selections.clear()
+
+    def should_fail(self):
+        with self.lock:
+            self.request_count += 1
+            return self.failure_rate > 0 and self.rng.random() < self.failure_rate
+
+    def list_tasks(self, scope, scope_id, query):
+        """Select, filter and paginate tasks for a list, space or team route"""
+        include_closed = query.get("include_closed", ["false"])[0] == "true"
+        updated_gt = int(query["date_updated_gt"][0]) if "date_updated_gt" in query else None
+        updated_lt = int(query["date_updated_lt"][0]) if "date_updated_lt" in query else None
+
+        # Paging through a large workspace asks the same question once per page,
+        # so keep the filtered selection until the workspace changes
+        key = (scope, scope_id, include_closed, updated_gt, updated_lt)
+        with self.lock:
+            cached = self.selections.get(key)
+        if cached is not None and cached[0] == self.version:
+            selected = cached[1]
+        else:
+            tasks = list(self.workspace["tasks"].values())
+            if scope == "list":
+                tasks = [t for t in tasks if t["list"]["id"] == scope_id]
+            selected = []
+            for task in tasks:
+                if not include_closed and task["status"]["type"] == "closed":
+                    continue
+                updated = int(task["date_updated"])
+                if updated_gt is not None and updated <= updated_gt:
+                    continue
+                if updated_lt is not None and updated >= updated_lt:
+                    continue
+                selected.append(task)
+            with self.lock:
+                self.selections[key] = (self.version, selected)
+
+        page = int(query.get("page", ["0"])[0])
+        chunk = selected[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+        return {"tasks": chunk, "last_page": (page + 1) * PAGE_SIZE >= len(selected)}
+
+    def create_task(self, list_id, body):
+        with self.lock:
+            number = self.next_task_number
+            self.next_task_number += 1
+        now = str(int(time.time() * 1000))
+        task_id = f"fk{number:07d}"
+        status = body.get("status", "to do")
+        task = {
+            "id": task_id,
+            "name": body.get("name", "Untitled Task"),
+            "description": body.get("description", ""),
+            "status": {"status": status, "type": _status_type(status)},
+            "priority": {"priority": _priority_name(body.get("priority"))} if body.get("priority") else None,
+            "assignees": [m for m in self.workspace["members"] if m["id"] in body.get("assignees", [])],
+            "creator": {"id": 1, "username": "fake_admin"},
+            "due_date": str(body["due_date"]) if body.get("due_date") else None,
+            "start_date": None,
+            "date_created": now,
+            "date_updated": now,
+            "date_closed": now if _status_type(status) == "closed" else None,
+            "url": f"https://app.clickup.com/t/{task_id}",
+            "tags": [{"name": tag} for tag in body.get("tags", [])],
+            "time_estimate": body.get("time_estimate"),
+            "time_spent": None,
+            "custom_fields": [],
+            "parent": body.get("parent"),
+            "dependencies": [],
+            "list": {"id": list_id},
+            "space": {"id": self.workspace["space"]["id"]},
+            "team_id": self.workspace["team"]["id"],
+        }
+        self.workspace["tasks"][task_id] = task
+        self.touch()
+        return task
+
+    def update_task(self, task_id, body):
+        task = self.workspace["tasks"].get(task_id)
+        if task is None:
+            return None
+        now = str(int(time.time() * 1000))
+        for field in ("name", "description", "time_estimate"):
+            if field in body:
+                task[field] = body[field]
+        if "status" in body:
+            task["status"] = {"status": body["status"], "type": _status_type(body["status"])}
+            task["date_closed"] = now if task["status"]["type"] == "closed" else None
+        if "priority" in body:
+            task["priority"] = {"priority": _priority_name(body["priority"])} if body["priority"] else None
+        if "due_date" in body:
+            task["due_date"] = str(body["due_date"]) if body["due_date"] else None
+        if "assignees" in body:
+            changes = body["assignees"]
+            ids = {a["id"] for a in task["assignees"]}
+            ids = (ids | set(changes.get("add", []))) - set(changes.get("rem", []))
+            task["assignees"] = [m for m in self.workspace["members"] if m["id"] in ids]
+        task["date_updated"] = now
+        self.touch()
+        return task
+
+
+def _status_type(status):
+    return dict(STATUSES).get(status, "closed" if status in ("done", "closed") else "custom")
+
+
+def _priority_name(priority):
+    """ClickUp accepts priorities as 1 (urgent) to 4 (low) on write"""
+    names = {1: "urgent", 2: "high", 3: "normal", 4: "low"}
+    return names.get(priority, priority)
+
+
+class _FakeClickUpHandler(BaseHTTPRequestHandler):
+    server_state = None
+
+    ROUTES = [
+        ("GET", re.compile(r"^/api/v2/team$"), "get_teams"),
+        ("GET", re.compile(r"^/api/v2/team/(?P<id>[^/]+)/space$"), "get_spaces"),
+        ("GET", re.compile(r"^/api/v2/team/(?P<id>[^/]+)/member$"), "get_members"),
+        ("GET", re.compile(r"^/api/v2/team/(?P<id>[^/]+)/task$"), "get_team_tasks"),
+        ("GET", re.compile(r"^/api/v2/space/(?P<id>[^/]+)/list$"), "get_lists"),
+        ("GET", re.compile(r"^/api/v2/space/(?P<id>[^/]+)/task$"), "get_space_tasks"),
+        ("GET", re.compile(r"^/api/v2/list/(?P<id>[^/]+)/task$"), "get_list_tasks"),
+        ("POST", re.compile(r"^/api/v2/list/(?P<id>[^/]+)/task$"), "create_task"),
+        ("GET", re.compile(r"^/api/v2/task/(?P<id>[^/]+)$"), "get_task"),
+        ("PUT", re.compile(r"^/api/v2/task/(?P<id>[^/]+)$"), "update_task"),
+        ("DELETE", re.compile(r"^/api/v2/task/(?P<id>[^/]+)$"), "delete_task"),
+    ]
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        state = self.server_state
+        if state.latency:
+            time.sleep(state.latency)
+
+        token = self.headers.get("Authorization")
+        if not token:
+            return self._send(401, {"err": "Token invalid", "ECODE": "OAUTH_025"})
+
+        reset = state.check_rate_limit(token)
+        if reset is not None:
+            return self._send(429, {"err": "Rate limit reached", "ECODE": "APP_002"}, {
+                "X-RateLimit-Limit": str(state.rate_limit),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(reset)),
+            })
+
+        if state.should_fail():
+            return self._send(500, {"err": "Injected failure", "ECODE": "FAKE_500"})
+
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.match(url.path)
+            if match and route_method == method:
+                return getattr(self, name)(match.group("id") if "id" in pattern.groupindex else None, query)
+        self._send(404, {"err": "Route not found", "ECODE": "FAKE_404"})
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8") if status != 204 else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_teams(self, _, query):
+        workspace = self.server_state.workspace
+        self._send(200, {"teams": [dict(workspace["team"], members=[{"user": m} for m in workspace["members"]])]})
+
+    def get_spaces(self, team_id, query):
+        workspace = self.server_state.workspace
+        spaces = [workspace["space"]] if team_id == workspace["team"]["id"] else []
+        self._send(200, {"spaces": spaces})
+
+    def get_members(self, team_id, query):
+        workspace = self.server_state.workspace
+        members = [{"user": m} for m in workspace["members"]] if team_id == workspace["team"]["id"] else []
+        self._send(200, {"members": members})
+
+    def get_lists(self, space_id, query):
+        workspace = self.server_state.workspace
+        lists = workspace["lists"] if space_id == workspace["space"]["id"] else []
+        self._send(200, {"lists": lists})
+
+    def get_team_tasks(self, team_id, query):
+        if team_id != self.server_state.workspace["team"]["id"]:
+            return self._send(404, {"err": "Team not found", "ECODE": "FAKE_404"})
+        self._send(200, self.server_state.list_tasks("team", team_id, query))
+
+    def get_space_tasks(self, space_id, query):
+        if space_id != self.server_state.workspace["space"]["id"]:
+            return self._send(404, {"err": "Space not found", "ECODE": "FAKE_404"})
+        self._send(200, self.server_state.list_tasks("space", space_id, query))
+
+    def get_list_tasks(self, list_id, query):
+        if not any(l["id"] == list_id for l in self.server_state.workspace["lists"]):
+            return self._send(404, {"err": "List not found", "ECODE": "ITEM_013"})
+        self._send(200, self.server_state.list_tasks("list", list_id, query))
+
+    def create_task(self, list_id, query):
+        self._send(200, self.server_state.create_task(list_id, self._read_body()))
+
+    def get_task(self, task_id, query):
+        task = self.server_state.workspace["tasks"].get(task_id)
+        if task is None:
+            return self._send(404, {"err": "Task not found", "ECODE": "ITEM_015"})
+        self._send(200, task)
+
+    def update_task(self, task_id, query):
+        task = self.server_state.update_task(task_id, self._read_body())
+        if task is None:
+            return self._send(404, {"err": "Task not found", "ECODE": "ITEM_015"})
+        self._send(200, task)
+
+    def delete_task(self, task_id, query):
+        if self.server_state.workspace["tasks"].pop(task_id, None) is None:
+            return self._send(404, {"err": "Task not found", "ECODE": "ITEM_015"})
+        self.server_state.touch()
+        self._send(204, None)
+
+
+def run_sync_benchmark(server):
+    """Run Agent 2's fetch, organize and statistics steps against ``server`` and time them"""
+    import fetch_clickup
+    from organize_tasks import organize_tasks_by_employee, get_task_statistics
+
+    fetch_clickup.CLICKUP_API_BASE = server.base_url
+    list_id = server.workspace["lists"][0]["id"]
+
+    started = time.perf_counter()
+    tasks = fetch_clickup.fetch_tasks_from_clickup(api_token="pk_fake", list_id=list_id)
+    fetched = time.perf_counter()
+    organized = organize_tasks_by_employee(tasks)
+    organized_at = time.perf_counter()
+    get_task_statistics(organized)
+    finished = time.perf_counter()
+
+    print(f"\n⏱️ Sync benchmark ({len(tasks)} tasks, {server.request_count} requests)")
+    print(f"  Fetch:      {fetched - started:.2f}s ({len(tasks) / max(fetched - started, 1e-9):,.0f} tasks/s)")
+    print(f"  Organize:   {organized_at - fetched:.2f}s")
+    print(f"  Statistics: {finished - organized_at:.2f}s")
+    print(f"  Total:      {finished - started:.2f}s")
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a synthetic ClickUp workspace locally")
+    parser.add_argument("--tasks", type=int, default=1000, help="number of tasks to generate")
+    parser.add_argument("--members", type=int, default=20, help="number of team members")
+    parser.add_argument("--lists", type=int, default=1, help="number of lists")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per minute per token (0 = off)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability of a 500 response")
+    parser.add_argument("--bench", action="store_true", help="run a sync benchmark and exit")
+    args = parser.parse_args()
+
+    print(f"🏗️ Generating workspace with {args.tasks} tasks...")
+    workspace = generate_workspace(args.tasks, args.members, args.lists, args.seed)
+    server = FakeClickUpServer(workspace, args.host, 0 if args.bench else args.port,
+                               args.latency, args.rate_limit, args.failure_rate, args.seed)
+
+    if args.bench:
+        with server:
+            run_sync_benchmark(server)
+    else:
+        print(f"✅ Fake ClickUp API listening on {server.base_url}")
+        print(f"   export CLICKUP_API_BASE={server.base_url}")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n⏹️ Server stopped.")
+            server.httpd.server_close()
@@ -1,57 +1,141 @@
 import requests
 import json
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from clickup_models import decode_task_page
 
-def fetch_tasks_from_clickup(api_token, team_id=None, space_id=None, list_id=None):
+# Base URL for ClickUp API (override to point at a local stand-in such as fake_clickup_server.py)
+CLICKUP_API_BASE = os.getenv("CLICKUP_API_BASE", "https://api.clickup.com/api/v2")
+
+# ClickUp returns at most this many tasks per page
+TASKS_PAGE_SIZE = 100
+
+
+def _rate_limit_delay(response, attempt):
+    """Seconds to wait after a 429, using ClickUp's reset header (unix seconds) when present"""
+    reset = response.headers.get("X-RateLimit-Reset")
+    try:
+        delay = max(float(reset) - time.time(), 1.0)
+    except (TypeError, ValueError):
+        delay = 2.0 ** attempt
+    return min(delay, 60.0)
+
+
+def iter_task_pages(api_token, team_id=None, space_id=None, list_id=None,
+                    date_updated_gt=None, include_closed=True, max_retries=3, as_records=False):
     """
-    Fetch tasks from ClickUp API
+    Yield ClickUp tasks one page at a time
+    
+    Follows ClickUp's pagination until the last page and waits out 429
+    responses before retrying the page.
     
     Args:
         api_token (str): ClickUp API token
         team_id (str): Optional team ID to filter tasks
         space_id (str): Optional space ID to filter tasks  
         list_id (str): Optional list ID to filter tasks
+        date_updated_gt (int): Optional ms timestamp; only tasks updated after it are returned
+        include_closed (bool): Whether to include tasks in closed statuses
+        max_retries (int): Retries per page when rate limited
+        as_records (bool): Decode pages into TaskRecords instead of raw dicts
     
-    Returns:
-        list: List of task dictionaries
+    Yields:
+        list: Tasks on one page (raw dicts or TaskRecords)
+    
+    Raises:
+        ValueError: If no team, space or list ID is given
+        requests.exceptions.RequestException: If a request fails
     """
     headers = {
         "Authorization": api_token,
         "Content-Type": "application/json"
     }
     
-    # Base URL for ClickUp API
-    base_url = "https://api.clickup.com/api/v2"
-    
     # Build the endpoint based on what IDs are provided
     if list_id:
-        endpoint = f"{base_url}/list/{list_id}/task"
+        endpoint = f"{CLICKUP_API_BASE}/list/{list_id}/task"
     elif space_id:
-        endpoint = f"{base_url}/space/{space_id}/task"
+        endpoint = f"{CLICKUP_API_BASE}/space/{space_id}/task"
     elif team_id:
-        endpoint = f"{base_url}/team/{team_id}/task"
+        endpoint = f"{CLICKUP_API_BASE}/team/{team_id}/task"
     else:
-        # If no specific ID, get all tasks (requires team_id)
-        print("❌ Error: At least team_id is required")
-        return []
+        raise ValueError("At least team_id is required")
+    
+    params = {"include_closed": str(include_closed).lower()}
+    if date_updated_gt is not None:
+        params["date_updated_gt"] = int(date_updated_gt)
     
-    print(f"\n📡 Fetching tasks from ClickUp API...")
     print(f"🔗 Endpoint: {endpoint}")
     
+    page = 0
+    attempt = 0
+    with requests.Session() as session:
+        session.headers.update(headers)
+        while True:
+            response = session.get(endpoint, params={**params, "page": page})
+            
+            if response.status_code == 429 and attempt < max_retries:
+                time.sleep(_rate_limit_delay(response, attempt))
+                attempt += 1
+                continue
+            response.raise_for_status()
+            attempt = 0
+            
+            if as_records:
+                page_tasks, last_page = decode_task_page(response.content)
+            else:
+                data = response.json()
+                page_tasks, last_page = data.get('tasks', []), data.get('last_page', True)
+            yield page_tasks
+            
+            if last_page or len(page_tasks) < TASKS_PAGE_SIZE:
+                break
+            page += 1
+
+
+def fetch_tasks_from_clickup(api_token, team_id=None, space_id=None, list_id=None,
+                             date_updated_gt=None, include_closed=True, max_retries=3,
+                             as_records=False):
+    """
+    Fetch tasks from ClickUp API
+    
+    Args:
+        api_token (str): ClickUp API token
+        team_id (str): Optional team ID to filter tasks
+        space_id (str): Optional space ID to filter tasks  
+        list_id (str): Optional list ID to filter tasks
+        date_updated_gt (int): Optional ms timestamp; only tasks updated after it are returned
+        include_closed (bool): Whether to include tasks in closed statuses
+        max_retries (int): Retries per page when rate limited
+        as_records (bool): Return compact TaskRecords decoded from the response
+            bytes instead of raw task dictionaries
+    
+    Returns:
+        list: List of task dictionaries (or TaskRecords)
+    """
+    print(f"\n📡 Fetching tasks from ClickUp API...")
+    
+    tasks = []
+    pages = 0
     try:
-        response = requests.get(endpoint, headers=headers)
-        print(f"📥 Status Code: {response.status_code}")
+        for page_tasks in iter_task_pages(api_token, team_id, space_id, list_id, date_updated_gt,
+                                          include_closed, max_retries, as_records):
+            tasks.extend(page_tasks)
+            pages += 1
         
-        if response.status_code == 200:
-            data = response.json()
-            tasks = data.get('tasks', [])
-            print(f"✅ Successfully fetched {len(tasks)} tasks")
-            return tasks
-        else:
-            print(f"❌ Error: {response.status_code} - {response.text}")
-            return []
-            
+        print(f"✅ Successfully fetched {len(tasks)} tasks ({pages} page(s))")
+        return tasks
+    
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return []
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Error: {e.response.status_code} - {e.response.text}")
+        return []
     except requests.exceptions.RequestException as e:
         print(f"❌ Request failed: {str(e)}")
         return []
@@ -65,7 +149,7 @@ def get_team_info(api_token):
     }
     
     try:
-        response = requests.get("https://api.clickup.com/api/v2/team", headers=headers)
+        response = requests.get(f"{CLICKUP_API_BASE}/team", headers=headers)
         if response.status_code == 200:
             teams = response.json().get('teams', [])
             print(f"✅ Found {len(teams)} teams:")
@@ -88,7 +172,7 @@ def get_spaces_from_team(api_token, team_id):
     }
     
     try:
-        response = requests.get(f"https://api.clickup.com/api/v2/team/{team_id}/space", headers=headers)
+        response = requests.get(f"{CLICKUP_API_BASE}/team/{team_id}/space", headers=headers)
         if response.status_code == 200:
             spaces = response.json().get('spaces', [])
             print(f"✅ Found {len(spaces)} spaces in team {team_id}:")
@@ -111,7 +195,7 @@ def get_lists_from_space(api_token, space_id):
     }
     
     try:
-        response = requests.get(f"https://api.clickup.com/api/v2/space/{space_id}/list", headers=headers)
+        response = requests.get(f"{CLICKUP_API_BASE}/space/{space_id}/list", headers=headers)
         if response.status_code == 200:
             lists = response.json().get('lists', [])
             print(f"✅ Found {len(lists)} lists in space {space_id}:")
@@ -170,6 +254,33 @@ if __name__ == "__main__":
         print("❌ No teams found. Please check your API token and try again.")
 
 
+def get_task_from_clickup(api_token, task_id):
+    """
+    Fetch a single task from ClickUp
+    
+    Args:
+        api_token (str): ClickUp API token
+        task_id (str): Task ID to fetch
+    
+    Returns:
+        dict: Raw task data or None if failed
+    """
+    headers = {
+        "Authorization": api_token
+    }
+    
+    url = f"{CLICKUP_API_BASE}/task/{task_id}"
+    
+    try:
+        response = requests.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
+        
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Error fetching task {task_id}: {e}")
+        return None
+
+
 def create_task_in_clickup(api_token, list_id, task_data):
     """
     Create a new task in ClickUp
@@ -187,7 +298,7 @@ def create_task_in_clickup(api_token, list_id, task_data):
         "Content-Type": "application/json"
     }
     
-    url = f"https://api.clickup.com/api/v2/list/{list_id}/task"
+    url = f"{CLICKUP_API_BASE}/list/{list_id}/task"
     
     try:
         response = requests.post(url, headers=headers, json=task_data)
@@ -222,7 +333,7 @@ def update_task_in_clickup(api_token, task_id, task_data):
         "Content-Type": "application/json"
     }
     
-    url = f"https://api.clickup.com/api/v2/task/{task_id}"
+    url = f"{CLICKUP_API_BASE}/task/{task_id}"
     
     try:
         response = requests.put(url, headers=headers, json=task_data)
@@ -254,7 +365,7 @@ def delete_task_in_clickup(api_token, task_id):
         "Authorization": api_token
     }
     
-    url = f"https://api.clickup.com/api/v2/task/{task_id}"
+    url = f"{CLICKUP_API_BASE}/task/{task_id}"
     
     try:
         response = requests.delete(url, headers=headers)
@@ -270,6 +381,191 @@ def delete_task_in_clickup(api_token, task_id):
         return False
 
 
+class _RateLimiter:
+    """Spaces out requests shared by several threads to stay under a per-minute budget"""
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause_until(self, resume_at):
+        """Hold back every thread until ``resume_at`` (monotonic seconds)"""
+        with self.lock:
+            self.next_slot = max(self.next_slot, resume_at)
+
+
+def _coalesce_operations(operations):
+    """
+    Collapse a batch of task operations into the requests that actually need sending
+
+    Repeated updates to the same task are merged in order into one update, and a
+    delete replaces any earlier updates to that task. Operations on a task that was
+    already deleted in the batch are rejected without a request.
+
+    Args:
+        operations (list): Operation dicts as accepted by bulk_mutate_tasks
+
+    Returns:
+        tuple: (requests, owners, errors) where requests is a list of operation
+            dicts to send, owners maps each input index to its request index and
+            errors maps input indexes to an error message
+    """
+    requests_to_send = []
+    owners = {}
+    errors = {}
+    pending = {}  # task_id -> index into requests_to_send
+
+    for index, operation in enumerate(operations):
+        action = operation.get("action")
+        task_id = operation.get("task_id")
+
+        if action == "create":
+            if not operation.get("list_id"):
+                errors[index] = "create requires a list_id"
+                continue
+            owners[index] = len(requests_to_send)
+            requests_to_send.append({
+                "action": "create",
+                "list_id": operation["list_id"],
+                "task_data": dict(operation.get("task_data") or {})
+            })
+            continue
+
+        if action not in ("update", "delete"):
+            errors[index] = f"unknown action: {action}"
+            continue
+        if not task_id:
+            errors[index] = f"{action} requires a task_id"
+            continue
+
+        existing = pending.get(task_id)
+        if existing is not None and requests_to_send[existing]["action"] == "delete":
+            errors[index] = "task is deleted earlier in the batch"
+            continue
+
+        if action == "update":
+            if existing is None:
+                pending[task_id] = len(requests_to_send)
+                requests_to_send.append({
+                    "action": "update",
+                    "task_id": task_id,
+                    "task_data": dict(operation.get("task_data") or {})
+                })
+            else:
+                requests_to_send[existing]["task_data"].update(operation.get("task_data") or {})
+        else:
+            if existing is None:
+                pending[task_id] = len(requests_to_send)
+                requests_to_send.append({"action": "delete", "task_id": task_id})
+            else:
+                requests_to_send[existing] = {"action": "delete", "task_id": task_id}
+        owners[index] = pending[task_id]
+
+    return requests_to_send, owners, errors
+
+
+def _send_operation(session, limiter, operation, max_retries):
+    """Send one coalesced operation, retrying when ClickUp answers 429"""
+    action = operation["action"]
+    if action == "create":
+        method, url = "POST", f"{CLICKUP_API_BASE}/list/{operation['list_id']}/task"
+    elif action == "update":
+        method, url = "PUT", f"{CLICKUP_API_BASE}/task/{operation['task_id']}"
+    else:
+        method, url = "DELETE", f"{CLICKUP_API_BASE}/task/{operation['task_id']}"
+
+    for attempt in range(max_retries + 1):
+        limiter.wait()
+        try:
+            response = session.request(method, url, json=operation.get("task_data"), timeout=30)
+        except requests.exceptions.RequestException as e:
+            return {"ok": False, "task": None, "error": str(e)}
+
+        if response.status_code == 429:
+            if attempt == max_retries:
+                return {"ok": False, "task": None, "error": "rate limited"}
+            limiter.pause_until(time.monotonic() + _rate_limit_delay(response, attempt))
+            continue
+
+        if response.ok:
+            task = response.json() if action != "delete" and response.content else None
+            return {"ok": True, "task": task, "error": None}
+        return {"ok": False, "task": None, "error": f"{response.status_code} - {response.text}"}
+
+
+def bulk_mutate_tasks(api_token, operations, max_workers=8, requests_per_minute=100, max_retries=3):
+    """
+    Create, update and delete many ClickUp tasks in one call
+
+    Operations are coalesced first (see _coalesce_operations), then sent
+    concurrently over a shared HTTP session while keeping the whole batch
+    under the ClickUp rate limit.
+
+    Args:
+        api_token (str): ClickUp API token
+        operations (list): Operation dicts with an "action" of "create", "update"
+            or "delete". Creates need "list_id" and "task_data", updates need
+            "task_id" and "task_data", deletes need "task_id".
+        max_workers (int): Maximum number of requests in flight
+        requests_per_minute (int): Request budget for the batch (ClickUp allows 100)
+        max_retries (int): Retries for a rate-limited request
+
+    Returns:
+        list: One result dict per input operation, in input order, with keys
+            "action", "task_id", "ok", "task" and "error". Operations that were
+            merged into the same request share its outcome.
+    """
+    to_send, owners, errors = _coalesce_operations(operations)
+
+    headers = {
+        "Authorization": api_token,
+        "Content-Type": "application/json"
+    }
+    limiter = _RateLimiter(requests_per_minute)
+    outcomes = []
+
+    if to_send:
+        with requests.Session() as session:
+            session.headers.update(headers)
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_send)))) as pool:
+                outcomes = list(pool.map(
+                    lambda operation: _send_operation(session, limiter, operation, max_retries),
+                    to_send
+                ))
+
+    results = []
+    for index, operation in enumerate(operations):
+        result = {
+            "action": operation.get("action"),
+            "task_id": operation.get("task_id"),
+            "ok": False,
+            "task": None,
+            "error": errors.get(index)
+        }
+        if index in owners:
+            result.update(outcomes[owners[index]])
+            if result["task_id"] is None and result["task"]:
+                result["task_id"] = result["task"].get("id")
+        results.append(result)
+
+    succeeded = sum(1 for r in results if r["ok"])
+    print(f"✅ Bulk update finished: {succeeded}/{len(results)} operations succeeded "
+          f"({len(to_send)} requests sent)")
+    for index, result in enumerate(results):
+        if not result["ok"]:
+            print(f"❌ Operation {index} ({result['action']}) failed: {result['error']}")
+    return results
+
+
 def get_team_members(api_token, team_id):
     """
     Get team members for task assignment
@@ -285,7 +581,7 @@ def get_team_members(api_token, team_id):
         "Authorization": api_token
     }
     
-    url = f"https://api.clickup.com/api/v2/team/{team_id}/member"
+    url = f"{CLICKUP_API_BASE}/team/{team_id}/member"
     
     try:
         response = requests.get(url, headers=headers)
@@ -299,3 +595,38 @@ def get_team_members(api_token, team_id):
     except requests.exceptions.RequestException as e:
         print(f"❌ Error fetching team members: {e}")
         return []
+
+
+def create_webhook(api_token, team_id, endpoint, events):
+    """
+    Register a webhook so ClickUp pushes task events to ``endpoint``
+    
+    Args:
+        api_token (str): ClickUp API token
+        team_id (str): Team (workspace) ID
+        endpoint (str): Public URL of the webhook receiver
+        events (list): ClickUp event names, e.g. ["taskCreated", "taskUpdated"]
+    
+    Returns:
+        dict: Created webhook (including its signing "secret") or None if failed
+    """
+    headers = {
+        "Authorization": api_token,
+        "Content-Type": "application/json"
+    }
+    
+    url = f"{CLICKUP_API_BASE}/team/{team_id}/webhook"
+    
+    try:
+        response = requests.post(url, headers=headers, json={"endpoint": endpoint, "events": events})
+        response.raise_for_status()
+        
+        webhook = response.json().get("webhook", {})
+        print(f"✅ Webhook registered: {webhook.get('id', 'Unknown')}")
+        return webhook
+        
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Error registering webhook: {e}")
+        if hasattr(e, 'response') and e.response is not None:
+            print(f"Response: {e.response.text}")
+        return None
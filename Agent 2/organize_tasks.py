@@ -3,12 +3,140 @@ import json
 from datetime import datetime
 
 
+# Status names that count as finished work
+COMPLETED_STATUSES = ("complete", "done", "closed")
+
+
+def parse_clickup_timestamp(value):
+    """
+    Parse a ClickUp timestamp into epoch milliseconds
+    
+    ClickUp sends dates as millisecond epoch strings; older exports and the
+    mock data here use ISO 8601 strings instead.
+    
+    Args:
+        value: ms epoch as str/int, ISO 8601 string, or None
+    
+    Returns:
+        int: Epoch milliseconds, or None if missing or unparseable
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()
+    return int(parsed.timestamp() * 1000)
+
+
+# Open tasks due within this many days count as "due soon"
+DUE_SOON_DAYS = 7
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def classify_task(task_info, now_ms):
+    """
+    Work out which statistics buckets a single task falls into
+    
+    Args:
+        task_info (dict): Task record as produced by normalize_task
+        now_ms (int): Reference time in epoch milliseconds
+    
+    Returns:
+        tuple: (completed, overdue, due_soon) booleans
+    """
+    completed = (task_info.get("status") or "").lower() in COMPLETED_STATUSES
+    if completed:
+        return True, False, False
+    due_ms = parse_clickup_timestamp(task_info.get("due_date"))
+    if due_ms is None:
+        return False, False, False
+    if due_ms < now_ms:
+        return False, True, False
+    return False, False, due_ms - now_ms <= DUE_SOON_DAYS * DAY_MS
+
+
+def normalize_task(task):
+    """
+    Convert a raw ClickUp task into the compact task record used in our outputs
+    
+    Args:
+        task (dict): Raw ClickUp task dictionary
+    
+    Returns:
+        tuple: (assignee username, task info dict)
+    """
+    # Extract assignee information
+    assignees = [a.get("username", "Unknown") for a in task.get("assignees") or [] if a]
+    if assignees:
+        # ClickUp can have multiple assignees; tasks are filed under the first one
+        # and the full list is kept on the task for the task index
+        assignee = assignees[0]
+    else:
+        assignee = "Unassigned"
+    
+    # Dependencies are listed on both tasks as {"task_id": waiting task, "depends_on": blocking task}
+    task_id = task.get("id", "")
+    waiting_on, blocking = [], []
+    for dependency in task.get("dependencies") or []:
+        if dependency.get("task_id") == task_id and dependency.get("depends_on"):
+            waiting_on.append(dependency["depends_on"])
+        elif dependency.get("depends_on") == task_id and dependency.get("task_id"):
+            blocking.append(dependency["task_id"])
+    
+    # Extract task information
+    status_obj = task.get("status", {})
+    priority_obj = task.get("priority", {})
+    
+    task_info = {
+        "id": task_id,
+        "name": task.get("name", "Untitled Task"),
+        "description": task.get("description", ""),
+        "status": status_obj.get("status", "Unknown") if status_obj else "Unknown",
+        "priority": priority_obj.get("priority", "Normal") if priority_obj else "Normal",
+        "due_date": task.get("due_date"),
+        "start_date": task.get("start_date"),
+        "date_created": task.get("date_created"),
+        "date_updated": task.get("date_updated"),
+        "date_closed": task.get("date_closed"),
+        "url": task.get("url", ""),
+        "tags": [tag.get("name", "") for tag in task.get("tags", []) if tag],
+        "time_estimate": task.get("time_estimate"),
+        "time_spent": task.get("time_spent"),
+        "creator": task.get("creator", {}).get("username", "Unknown") if task.get("creator") else "Unknown",
+        "assignees": assignees,
+        "parent": task.get("parent"),
+        "waiting_on": waiting_on,
+        "blocking": blocking
+    }
+    
+    # Add custom fields if they exist
+    custom_fields = task.get("custom_fields", [])
+    if custom_fields:
+        task_info["custom_fields"] = {}
+        for field in custom_fields:
+            field_name = field.get("name", "Unknown Field")
+            field_value = field.get("value", "")
+            task_info["custom_fields"][field_name] = field_value
+    
+    return assignee, task_info
+
+
 def organize_tasks_by_employee(clickup_tasks):
     """
     Organize ClickUp tasks by assignee/employee
     
     Args:
-        clickup_tasks (list): List of ClickUp task dictionaries
+        clickup_tasks (list): List of ClickUp task dictionaries or TaskRecords
     
     Returns:
         dict: Tasks organized by employee name
@@ -16,102 +144,59 @@ def organize_tasks_by_employee(clickup_tasks):
     employee_tasks = defaultdict(list)
     
     for task in clickup_tasks:
+        # Decoded TaskRecords are already compact; file them without copying
+        if hasattr(task, "employee") and hasattr(task, "to_dict"):
+            employee_tasks[task.employee].append(task)
+            continue
+        
         # Skip if task is None or not a dictionary
         if not task or not isinstance(task, dict):
             print(f"⚠️ Skipping invalid task: {task}")
             continue
-            
-        # Extract assignee information
-        assignees = task.get("assignees", [])
-        if assignees and len(assignees) > 0:
-            # ClickUp can have multiple assignees, we'll use the first one
-            assignee = assignees[0].get("username", "Unknown")
-        else:
-            assignee = "Unassigned"
-        
-        # Extract task information
-        status_obj = task.get("status", {})
-        priority_obj = task.get("priority", {})
-        
-        task_info = {
-            "id": task.get("id", ""),
-            "name": task.get("name", "Untitled Task"),
-            "description": task.get("description", ""),
-            "status": status_obj.get("status", "Unknown") if status_obj else "Unknown",
-            "priority": priority_obj.get("priority", "Normal") if priority_obj else "Normal",
-            "due_date": task.get("due_date"),
-            "date_created": task.get("date_created"),
-            "date_updated": task.get("date_updated"),
-            "date_closed": task.get("date_closed"),
-            "url": task.get("url", ""),
-            "tags": [tag.get("name", "") for tag in task.get("tags", []) if tag],
-            "time_estimate": task.get("time_estimate"),
-            "time_spent": task.get("time_spent"),
-            "creator": task.get("creator", {}).get("username", "Unknown") if task.get("creator") else "Unknown"
-        }
-        
-        # Add custom fields if they exist
-        custom_fields = task.get("custom_fields", [])
-        if custom_fields:
-            task_info["custom_fields"] = {}
-            for field in custom_fields:
-                field_name = field.get("name", "Unknown Field")
-                field_value = field.get("value", "")
-                task_info["custom_fields"][field_name] = field_value
         
+        assignee, task_info = normalize_task(task)
         employee_tasks[assignee].append(task_info)
     
     return dict(employee_tasks)
 
 
-def get_task_statistics(employee_tasks):
+def employee_stats_entry(total_tasks, completed_tasks, overdue_tasks, due_soon_tasks):
+    """Build one employee's entry in the statistics ``employee_stats`` dict"""
+    return {
+        "total_tasks": total_tasks,
+        "completed_tasks": completed_tasks,
+        "pending_tasks": total_tasks - completed_tasks,
+        "overdue_tasks": overdue_tasks,
+        "due_soon_tasks": due_soon_tasks,
+        "completion_rate": round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 2)
+    }
+
+
+def get_task_statistics(employee_tasks, now_ms=None):
     """
     Generate statistics for the organized tasks
     
+    The tasks are converted to NumPy columns and aggregated per employee in
+    one pass (see task_columns.py). Due dates are read as ClickUp ms epoch
+    timestamps (ISO strings are still accepted).
+    
     Args:
         employee_tasks (dict): Tasks organized by employee
+        now_ms (int): Reference time in epoch ms for overdue/due soon; defaults to now
     
     Returns:
         dict: Statistics summary
     """
-    stats = {
-        "total_employees": len(employee_tasks),
-        "total_tasks": 0,
-        "employee_stats": {}
-    }
+    from task_columns import build_task_columns, compute_employee_stats
     
-    for employee, tasks in employee_tasks.items():
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.get("status", "").lower() in ["complete", "done", "closed"]])
-        overdue_tasks = 0
-        due_soon_tasks = 0
-        
-        # Check for overdue and due soon tasks
-        current_date = datetime.now()
-        for task in tasks:
-            due_date = task.get("due_date")
-            if due_date:
-                try:
-                    due_datetime = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                    if due_datetime < current_date and task.get("status", "").lower() not in ["complete", "done", "closed"]:
-                        overdue_tasks += 1
-                    elif (due_datetime - current_date).days <= 7 and task.get("status", "").lower() not in ["complete", "done", "closed"]:
-                        due_soon_tasks += 1
-                except:
-                    pass  # Skip if date parsing fails
-        
-        stats["employee_stats"][employee] = {
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks,
-            "pending_tasks": total_tasks - completed_tasks,
-            "overdue_tasks": overdue_tasks,
-            "due_soon_tasks": due_soon_tasks,
-            "completion_rate": round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 2)
-        }
-        
-        stats["total_tasks"] += total_tasks
-    
-    return stats
+    return compute_employee_stats(build_task_columns(employee_tasks), now_ms)
+
+
+def _encode_task(obj):
+    """Serialize TaskRecords (see clickup_models.py) like task info dicts"""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 def save_organized_tasks(employee_tasks, filename="summary_clickup.json"):
@@ -123,7 +208,7 @@ def save_organized_tasks(employee_tasks, filename="summary_clickup.json"):
         filename (str): Output filename
     """
     with open(filename, "w", encoding="utf-8") as f:
-        json.dump(employee_tasks, f, indent=2, ensure_ascii=False)
+        json.dump(employee_tasks, f, indent=2, ensure_ascii=False, default=_encode_task)
     print(f"✅ Organized tasks saved to {filename}")
 
 
@@ -220,8 +305,10 @@ if __name__ == "__main__":
         print(f"    Due Soon: {emp_stats['due_soon_tasks']}")
         print(f"    Completion Rate: {emp_stats['completion_rate']}%")
     
-    # Save results
+    # Save results, with the aggregate tables the dashboard reads next to the tasks
+    from task_aggregates import TaskAggregates
     save_organized_tasks(organized_tasks)
     save_task_statistics(stats)
+    TaskAggregates.from_employee_tasks(organized_tasks).save()
     
     print("\n✅ Test completed successfully!")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Incremental Task Statistics
+===========================
+
+StatsAccumulator keeps running per-employee totals (tasks, completed,
+overdue, due soon) and updates them in O(1) per task event instead of
+recomputing get_task_statistics over every task. It can be checkpointed to
+disk and checked against a full recompute.
+
+Usage:
+    python stats_accumulator.py   # verify clickup_stats_checkpoint.json against summary_clickup.json
+"""
+
+import json
+import os
+import sys
+import time
+
+from organize_tasks import classify_task, employee_stats_entry, get_task_statistics
+
+CHECKPOINT_VERSION = 1
+
+COUNTERS = ("total_tasks", "completed_tasks", "overdue_tasks", "due_soon_tasks")
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class StatsAccumulator:
+    """
+    Running per-employee task statistics
+
+    Each task's contribution (employee, completed, overdue, due soon) is
+    remembered, so an update or delete only subtracts the old contribution
+    and adds the new one.
+    """
+
+    def __init__(self):
+        self.counts = {}         # employee -> {counter: value}
+        self.contributions = {}  # task id -> (employee, completed, overdue, due_soon)
+        self.as_of_ms = None     # reference time of the latest classification
+
+    def __len__(self):
+        return len(self.contributions)
+
+    def __contains__(self, task_id):
+        return task_id in self.contributions
+
+    def insert(self, task_id, employee, task_info, now_ms=None):
+        """Count a new task (or replace an existing one)"""
+        now_ms = _now_ms() if now_ms is None else now_ms
+        self.delete(task_id)
+        completed, overdue, due_soon = classify_task(task_info, now_ms)
+        self._add(task_id, (employee, completed, overdue, due_soon))
+        self.as_of_ms = now_ms
+
+    # An update is a replace: take the old contribution out, put the new one in
+    update = insert
+
+    def transition(self, task_id, status, task_info, now_ms=None):
+        """Apply a status change to a counted task"""
+        employee = self.contributions[task_id][0]
+        self.insert(task_id, employee, dict(task_info, status=status), now_ms)
+
+    def reclassify(self, task_id, overdue, due_soon, now_ms=None):
+        """
+        Move a counted task between the overdue / due soon buckets
+
+        Used when a deadline passes (or comes within range) without the task
+        itself changing. ``now_ms`` is when the crossing was observed; the
+        reference time advances to it, so verify() recomputes at that time.
+        """
+        now_ms = _now_ms() if now_ms is None else now_ms
+        contribution = self.contributions.get(task_id)
+        if contribution is None or contribution[1]:
+            return
+        employee = contribution[0]
+        self._remove(task_id)
+        self._add(task_id, (employee, False, overdue, due_soon))
+        self.as_of_ms = max(self.as_of_ms or 0, now_ms)
+
+    def delete(self, task_id):
+        """Stop counting a task; returns True if it was counted"""
+        if task_id not in self.contributions:
+            return False
+        self._remove(task_id)
+        return True
+
+    def _add(self, task_id, contribution):
+        employee, completed, overdue, due_soon = contribution
+        counts = self.counts.get(employee)
+        if counts is None:
+            counts = self.counts[employee] = dict.fromkeys(COUNTERS, 0)
+        counts["total_tasks"] += 1
+        counts["completed_tasks"] += completed
+        counts["overdue_tasks"] += overdue
+        counts["due_soon_tasks"] += due_soon
+        self.contributions[task_id] = contribution
+
+    def _remove(self, task_id):
+        employee, completed, overdue, due_soon = self.contributions.pop(task_id)
+        counts = self.counts[employee]
+        counts["total_tasks"] -= 1
+        counts["completed_tasks"] -= completed
+        counts["overdue_tasks"] -= overdue
+        counts["due_soon_tasks"] -= due_soon
+        if counts["total_tasks"] == 0:
+            del self.counts[employee]
+
+    def statistics(self):
+        """Statistics in the shape get_task_statistics returns"""
+        stats = {
+            "total_employees": len(self.counts),
+            "total_tasks": len(self.contributions),
+            "employee_stats": {}
+        }
+        for employee, counts in self.counts.items():
+            stats["employee_stats"][employee] = employee_stats_entry(
+                counts["total_tasks"], counts["completed_tasks"],
+                counts["overdue_tasks"], counts["due_soon_tasks"]
+            )
+        return stats
+
+    # --- persistence ---
+    def checkpoint(self, filename):
+        """Write the accumulator state to ``filename`` atomically"""
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "as_of_ms": self.as_of_ms,
+            "counts": self.counts,
+            "contributions": {
+                task_id: [employee, int(completed), int(overdue), int(due_soon)]
+                for task_id, (employee, completed, overdue, due_soon) in self.contributions.items()
+            }
+        }
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_filename, filename)
+
+    @classmethod
+    def load_checkpoint(cls, filename):
+        """Restore an accumulator written by checkpoint()"""
+        with open(filename, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {state.get('version')}")
+        accumulator = cls()
+        accumulator.as_of_ms = state.get("as_of_ms")
+        accumulator.counts = state["counts"]
+        accumulator.contributions = {
+            task_id: (employee, bool(completed), bool(overdue), bool(due_soon))
+            for task_id, (employee, completed, overdue, due_soon) in state["contributions"].items()
+        }
+        return accumulator
+
+    @classmethod
+    def from_employee_tasks(cls, employee_tasks, now_ms=None):
+        """Build an accumulator by counting every task of an organized tasks dict"""
+        now_ms = _now_ms() if now_ms is None else now_ms
+        accumulator = cls()
+        for employee, tasks in employee_tasks.items():
+            for task_info in tasks:
+                accumulator.insert(task_info["id"], employee, task_info, now_ms)
+        return accumulator
+
+    def verify(self, employee_tasks, now_ms=None):
+        """
+        Compare the running totals with a full recompute
+
+        Overdue and due soon depend on the time, so the recompute uses the
+        accumulator's own reference time unless ``now_ms`` is given.
+
+        Args:
+            employee_tasks (dict): Tasks organized by employee
+            now_ms (int): Reference time for the recompute
+
+        Returns:
+            list: Human readable mismatches; empty when the totals agree
+        """
+        now_ms = self.as_of_ms if now_ms is None else now_ms
+        expected = get_task_statistics(employee_tasks, now_ms)
+        actual = self.statistics()
+
+        mismatches = []
+        for key in ("total_employees", "total_tasks"):
+            if expected[key] != actual[key]:
+                mismatches.append(f"{key}: expected {expected[key]}, got {actual[key]}")
+        for employee in sorted(set(expected["employee_stats"]) | set(actual["employee_stats"])):
+            want = expected["employee_stats"].get(employee)
+            have = actual["employee_stats"].get(employee)
+            if want != have:
+                mismatches.append(f"{employee}: expected {want}, got {have}")
+        return mismatches
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    checkpoint_file = "clickup_stats_checkpoint.json"
+    tasks_file = "summary_clickup.json"
+
+    if not os.path.exists(checkpoint_file):
+        print(f"❌ No checkpoint found at {checkpoint_file}")
+        sys.exit(1)
+
+    accumulator = StatsAccumulator.load_checkpoint(checkpoint_file)
+    with open(tasks_file, "r", encoding="utf-8") as f:
+        employee_tasks = json.load(f)
+
+    mismatches = accumulator.verify(employee_tasks)
+    if mismatches:
+        print(f"❌ Checkpoint disagrees with a full recompute ({len(mismatches)} mismatches):")
+        for mismatch in mismatches:
+            print(f"  - {mismatch}")
+        sys.exit(1)
+    print(f"✅ Checkpoint matches a full recompute ({len(accumulator)} tasks)")
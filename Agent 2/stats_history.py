@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Statistics History
+==================
+
+Keeps a time series of task statistics so trends survive the overwrite of
+clickup_statistics.json. Every sync records one snapshot of the per-employee
+counters into a SQLite file. Points are stored per minute, then rolled up
+into hours and days as they age, so storage stays bounded however often
+Agent 2 runs.
+
+Each point stores the sum of every counter over the snapshots it covers,
+plus how many snapshots that was. Rolling up or downsampling is just adding
+sums, and averages stay exact at any resolution.
+
+Usage:
+    python stats_history.py                      # team series for the last 7 days
+    python stats_history.py --employee alice_dev --days 30
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+from organize_tasks import DAY_MS
+
+HISTORY_FILENAME = "clickup_stats_history.db"
+
+# Pseudo-employee holding the team-wide totals of each snapshot
+TEAM = "*"
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+
+# resolution -> (bucket size, how long points are kept before rolling up into the next one)
+RESOLUTIONS = {
+    "minute": (MINUTE_MS, 2 * DAY_MS),
+    "hour": (HOUR_MS, 90 * DAY_MS),
+    "day": (DAY_MS, None),
+}
+ROLLUPS = (("minute", "hour"), ("hour", "day"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_points (
+    resolution TEXT NOT NULL,
+    employee TEXT NOT NULL,
+    bucket_ms INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    total_tasks INTEGER NOT NULL,
+    completed_tasks INTEGER NOT NULL,
+    overdue_tasks INTEGER NOT NULL,
+    due_soon_tasks INTEGER NOT NULL,
+    PRIMARY KEY (resolution, employee, bucket_ms)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS stats_points_by_time ON stats_points (resolution, bucket_ms);
+"""
+
+_ADD_SUMS = """
+ON CONFLICT (resolution, employee, bucket_ms) DO UPDATE SET
+    samples = samples + excluded.samples,
+    total_tasks = total_tasks + excluded.total_tasks,
+    completed_tasks = completed_tasks + excluded.completed_tasks,
+    overdue_tasks = overdue_tasks + excluded.overdue_tasks,
+    due_soon_tasks = due_soon_tasks + excluded.due_soon_tasks
+"""
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class StatsHistory:
+    """
+    Downsampled time series of per-employee task statistics
+
+    Example:
+        history = StatsHistory("clickup_stats_history.db")
+        history.record(get_task_statistics(organized_tasks))
+        points = history.series("alice_dev", start_ms=week_ago_ms)
+
+    Args:
+        filename (str): SQLite database file (created if missing)
+    """
+
+    def __init__(self, filename=HISTORY_FILENAME):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, stats, now_ms=None):
+        """
+        Add one statistics snapshot and roll up points that have aged out
+
+        Args:
+            stats (dict): Statistics as get_task_statistics returns them
+            now_ms (int): Snapshot time in epoch ms; defaults to now
+        """
+        now_ms = _now_ms() if now_ms is None else now_ms
+        bucket_ms = now_ms - now_ms % MINUTE_MS
+
+        team = [0, 0, 0, 0]
+        rows = []
+        for employee, emp_stats in stats.get("employee_stats", {}).items():
+            counts = (emp_stats["total_tasks"], emp_stats["completed_tasks"],
+                      emp_stats["overdue_tasks"], emp_stats["due_soon_tasks"])
+            rows.append(("minute", employee, bucket_ms, 1, *counts))
+            team = [a + b for a, b in zip(team, counts)]
+        rows.append(("minute", TEAM, bucket_ms, 1, *team))
+
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO stats_points VALUES (?, ?, ?, ?, ?, ?, ?, ?)" + _ADD_SUMS, rows
+            )
+            self._roll_up(now_ms)
+
+    def _roll_up(self, now_ms):
+        for source, target in ROLLUPS:
+            _, retention_ms = RESOLUTIONS[source]
+            target_size, _ = RESOLUTIONS[target]
+            cutoff = now_ms - retention_ms
+            # Only roll up whole target buckets so a bucket is never split across resolutions
+            cutoff -= cutoff % target_size
+            self.connection.execute(
+                f"""
+                INSERT INTO stats_points
+                SELECT ?, employee, bucket_ms - bucket_ms % ?, SUM(samples), SUM(total_tasks),
+                       SUM(completed_tasks), SUM(overdue_tasks), SUM(due_soon_tasks)
+                FROM stats_points
+                WHERE resolution = ? AND bucket_ms < ?
+                GROUP BY employee, bucket_ms - bucket_ms % ?
+                {_ADD_SUMS}
+                """,
+                (target, target_size, source, cutoff, target_size)
+            )
+            self.connection.execute(
+                "DELETE FROM stats_points WHERE resolution = ? AND bucket_ms < ?", (source, cutoff)
+            )
+
+    def employees(self):
+        """Employees with recorded history, sorted (TEAM excluded)"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT DISTINCT employee FROM stats_points WHERE employee != ? ORDER BY employee", (TEAM,)
+            ).fetchall()
+        return [employee for (employee,) in rows]
+
+    def series(self, employee=TEAM, start_ms=None, end_ms=None, step_ms=None):
+        """
+        Average statistics per time bucket for one employee (or the team)
+
+        Points come from whichever resolution covers each part of the range:
+        minutes for recent data, then hours, then days.
+
+        Args:
+            employee (str): Employee name, or TEAM for team-wide totals
+            start_ms (int): Range start in epoch ms (inclusive); defaults to the beginning
+            end_ms (int): Range end in epoch ms (exclusive); defaults to now
+            step_ms (int): Optional bucket size to downsample to, e.g. HOUR_MS
+
+        Returns:
+            list: Dicts with time_ms, total_tasks, completed_tasks,
+                pending_tasks (backlog), overdue_tasks, due_soon_tasks and
+                completion_rate, oldest first
+        """
+        start_ms = 0 if start_ms is None else start_ms
+        end_ms = _now_ms() + 1 if end_ms is None else end_ms
+        step_ms = step_ms or 1
+
+        with self.lock:
+            rows = self.connection.execute(
+                """
+                SELECT bucket_ms - bucket_ms % ? AS time_ms, SUM(samples), SUM(total_tasks),
+                       SUM(completed_tasks), SUM(overdue_tasks), SUM(due_soon_tasks)
+                FROM stats_points
+                WHERE employee = ? AND resolution IN ('minute', 'hour', 'day')
+                  AND bucket_ms >= ? AND bucket_ms < ?
+                GROUP BY time_ms
+                ORDER BY time_ms
+                """,
+                (step_ms, employee, start_ms, end_ms)
+            ).fetchall()
+
+        points = []
+        for time_ms, samples, total, completed, overdue, due_soon in rows:
+            points.append({
+                "time_ms": time_ms,
+                "total_tasks": round(total / samples, 2),
+                "completed_tasks": round(completed / samples, 2),
+                "pending_tasks": round((total - completed) / samples, 2),
+                "overdue_tasks": round(overdue / samples, 2),
+                "due_soon_tasks": round(due_soon / samples, 2),
+                "completion_rate": round((completed / total * 100) if total > 0 else 0, 2),
+            })
+        return points
+
+
+def record_statistics_snapshot(stats, filename=HISTORY_FILENAME, now_ms=None):
+    """Append one statistics snapshot to the history file"""
+    with StatsHistory(filename) as history:
+        history.record(stats, now_ms)
+    print(f"✅ Statistics snapshot added to {filename}")
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print recorded task statistics history")
+    parser.add_argument("--file", default=HISTORY_FILENAME)
+    parser.add_argument("--employee", default=TEAM, help="employee name (default: team totals)")
+    parser.add_argument("--days", type=float, default=7, help="how far back to look")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"❌ No history found at {args.file}")
+        raise SystemExit(1)
+
+    now_ms = _now_ms()
+    span_ms = args.days * DAY_MS
+    step_ms = MINUTE_MS if span_ms <= DAY_MS else HOUR_MS if span_ms <= 14 * DAY_MS else DAY_MS
+    with StatsHistory(args.file) as history:
+        points = history.series(args.employee, now_ms - int(span_ms), step_ms=step_ms)
+
+    label = "Team" if args.employee == TEAM else args.employee
+    print(f"📈 {label}: {len(points)} point(s) over the last {args.days:g} day(s)")
+    for point in points:
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(point["time_ms"] / 1000))
+        print(f"  {stamp}  total {point['total_tasks']:>8}  pending {point['pending_tasks']:>8}  "
+              f"overdue {point['overdue_tasks']:>6}  completion {point['completion_rate']:>6}%")
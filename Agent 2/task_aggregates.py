@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Materialized Task Aggregates
+============================
+
+Small count tables over the organized tasks, written to
+clickup_aggregates.json next to summary_clickup.json so the dashboard can
+draw its headline metrics and charts without reading every task:
+
+    status_counts           status -> tasks
+    status_priority_counts  (status, priority) -> tasks
+    employee_counts         employee the task is filed under -> tasks
+    assignee_counts         (assignee, completed) -> tasks, one per assignee
+    open_due_hours          hour an open task is due -> tasks
+    created_days            (day created, status) -> tasks
+
+Every table is a sum of per-task contributions, so a change is applied by
+subtracting the task's old contribution and adding the new one. The
+pipeline fills the tables page by page and TaskStore keeps them current
+for webhook events. Overdue and due-soon counts are derived from
+open_due_hours at read time, to the hour, so they never go stale.
+
+Usage:
+    python task_aggregates.py   # rebuild clickup_aggregates.json from summary_clickup.json
+"""
+
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from organize_tasks import COMPLETED_STATUSES, DAY_MS, DUE_SOON_DAYS, parse_clickup_timestamp
+from task_index import task_assignees
+
+AGGREGATES_FILENAME = "clickup_aggregates.json"
+AGGREGATES_VERSION = 1
+
+HOUR_MS = 60 * 60 * 1000
+
+# Table name -> key columns (every table also has a "count" column)
+TABLES = {
+    "status_counts": ("status",),
+    "status_priority_counts": ("status", "priority"),
+    "employee_counts": ("employee",),
+    "assignee_counts": ("assignee", "completed"),
+    "open_due_hours": ("due_hour_ms",),
+    "created_days": ("day_ms", "status"),
+}
+
+# TaskAggregates.version values, unique within the process
+_versions = itertools.count()
+
+
+def task_keys(employee, task_info):
+    """Table name -> keys one task counts towards"""
+    status = task_info.get("status") or "Unknown"
+    completed = status.lower() in COMPLETED_STATUSES
+    keys = {
+        "status_counts": [(status,)],
+        "status_priority_counts": [(status, task_info.get("priority") or "Normal")],
+        "employee_counts": [(employee,)],
+        "assignee_counts": [(assignee, completed) for assignee in task_assignees(task_info, employee)],
+        "open_due_hours": [],
+        "created_days": [],
+    }
+    due_ms = parse_clickup_timestamp(task_info.get("due_date"))
+    if not completed and due_ms is not None:
+        keys["open_due_hours"].append((due_ms // HOUR_MS * HOUR_MS,))
+    created_ms = parse_clickup_timestamp(task_info.get("date_created"))
+    if created_ms is not None:
+        keys["created_days"].append((created_ms // DAY_MS * DAY_MS, status))
+    return keys
+
+
+class TaskAggregates:
+    """
+    Count tables maintained from task contributions
+
+    Example:
+        aggregates = TaskAggregates.from_employee_tasks(employee_tasks)
+        aggregates.remove("alice_dev", old_task_info)
+        aggregates.add("alice_dev", new_task_info)
+        aggregates.save("clickup_aggregates.json")
+    """
+
+    def __init__(self):
+        self.tables = {name: Counter() for name in TABLES}
+        self.updated_ms = None
+        # Changes with every add/remove, for caching results derived from the tables
+        self.version = next(_versions)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_employee_tasks(cls, employee_tasks):
+        """Aggregates of an organized tasks dict (employee -> list of tasks)"""
+        aggregates = cls()
+        aggregates.add_page(employee_tasks)
+        return aggregates
+
+    def add(self, employee, task_info, weight=1):
+        """Count a task (or, with weight=-1, take it out again)"""
+        with self.lock:
+            for name, keys in task_keys(employee, task_info).items():
+                table = self.tables[name]
+                for key in keys:
+                    table[key] += weight
+                    if not table[key]:
+                        del table[key]
+            self.updated_ms = int(time.time() * 1000)
+            self.version = next(_versions)
+
+    def remove(self, employee, task_info):
+        """Take out a task previously counted with add()"""
+        self.add(employee, task_info, weight=-1)
+
+    def add_page(self, employee_tasks):
+        """Count one page of organized tasks"""
+        for employee, tasks in employee_tasks.items():
+            for task_info in tasks:
+                self.add(employee, task_info)
+
+    def merge(self, other):
+        """Fold another TaskAggregates (e.g. from another shard) into this one"""
+        with self.lock:
+            for name, other_table in other.tables.items():
+                table = self.tables[name]
+                for key, count in other_table.items():
+                    table[key] += count
+                    if not table[key]:
+                        del table[key]
+            self.updated_ms = int(time.time() * 1000)
+            self.version = next(_versions)
+        return self
+
+    # ---------------- Reading ----------------
+
+    def rows(self, name):
+        """Rows of one table as dicts (key columns plus count), most frequent first"""
+        columns = TABLES[name]
+        with self.lock:
+            items = sorted(self.tables[name].items(), key=lambda item: (-item[1], str(item[0])))
+        return [dict(zip(columns, key), count=count) for key, count in items]
+
+    def total_tasks(self):
+        with self.lock:
+            return sum(self.tables["employee_counts"].values())
+
+    def status_total(self, statuses):
+        """Tasks whose status is one of ``statuses`` (case-insensitive)"""
+        wanted = {status.lower() for status in statuses}
+        with self.lock:
+            return sum(count for (status,), count in self.tables["status_counts"].items()
+                       if status.lower() in wanted)
+
+    def due_counts(self, now_ms, due_soon_days=DUE_SOON_DAYS):
+        """
+        (overdue, due soon) open tasks at ``now_ms``, to the hour
+
+        Tasks due earlier in the current hour are still counted as due soon.
+        """
+        current_hour = now_ms // HOUR_MS * HOUR_MS
+        horizon = now_ms + due_soon_days * DAY_MS
+        overdue = due_soon = 0
+        with self.lock:
+            for (due_hour,), count in self.tables["open_due_hours"].items():
+                if due_hour < current_hour:
+                    overdue += count
+                elif due_hour <= horizon:
+                    due_soon += count
+        return overdue, due_soon
+
+    def assignee_totals(self):
+        """assignee -> (total tasks, completed tasks), counting every assignee of a task"""
+        totals = {}
+        with self.lock:
+            for (assignee, completed), count in self.tables["assignee_counts"].items():
+                total, done = totals.get(assignee, (0, 0))
+                totals[assignee] = (total + count, done + (count if completed else 0))
+        return totals
+
+    # ---------------- Files ----------------
+
+    def to_dict(self):
+        return {
+            "version": AGGREGATES_VERSION,
+            "updated_ms": self.updated_ms,
+            "tables": {
+                name: {"columns": list(TABLES[name]) + ["count"],
+                       "rows": [list(row.values()) for row in self.rows(name)]}
+                for name in TABLES
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Tables from to_dict()
+
+        Raises:
+            ValueError: If they were written by an incompatible version
+        """
+        if state.get("version") != AGGREGATES_VERSION:
+            raise ValueError(f"Unsupported aggregates version: {state.get('version')}")
+        aggregates = cls()
+        aggregates.updated_ms = state.get("updated_ms")
+        for name, table in state["tables"].items():
+            if name in aggregates.tables:
+                aggregates.tables[name] = Counter({tuple(row[:-1]): row[-1] for row in table["rows"]})
+        return aggregates
+
+    def save(self, filename=AGGREGATES_FILENAME):
+        """Write the tables to ``filename`` atomically"""
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_filename, filename)
+
+    @classmethod
+    def load(cls, filename=AGGREGATES_FILENAME):
+        """
+        Read tables written by save()
+
+        Raises:
+            ValueError: If the file was written by an incompatible version
+        """
+        with open(filename, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    tasks_file = sys.argv[1] if len(sys.argv) > 1 else "summary_clickup.json"
+    output_file = sys.argv[2] if len(sys.argv) > 2 else AGGREGATES_FILENAME
+    with open(tasks_file, "r", encoding="utf-8") as f:
+        aggregates = TaskAggregates.from_employee_tasks(json.load(f))
+    aggregates.save(output_file)
+    print(f"✅ Aggregates of {aggregates.total_tasks()} tasks saved to {output_file}")
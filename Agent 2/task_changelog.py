@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Task Change Log
+===============
+
+Append-only feed of task changes, so consumers (the dashboard, Agent 3,
+...) can process only what changed instead of reloading and diffing
+summary_clickup.json.
+
+Every line of clickup_changes.jsonl is one change:
+
+    {"seq": 42, "op": "update", "task_id": "abc", "employee": "alice_dev",
+     "ts": 1718000000000, "task": {...task info...}}
+
+``op`` is "insert", "update" or "delete" (deletes carry no task). ``seq``
+increases by one per line and never repeats.
+
+The producer keeps a fingerprint of every task it has logged, so recording
+an unchanged task writes nothing. Full syncs and webhook updates can
+therefore both feed the same log without duplicates. Several producers
+(the webhook receiver, agent2_main.py, the dashboard's refresher) may hold
+the same log open: every append takes an exclusive lock on the file and
+first reads the lines other producers appended, so sequence numbers and
+fingerprints stay shared. Consumers remember
+the byte position after the last change they processed and resume from
+there.
+
+Usage:
+    python task_changelog.py --consumer agent3           # print new changes and commit the offset
+    python task_changelog.py --consumer agent3 --peek    # print without committing
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within a process
+    fcntl = None
+
+from organize_tasks import _encode_task
+
+CHANGELOG_FILENAME = "clickup_changes.jsonl"
+
+OPERATIONS = ("insert", "update", "delete")
+
+
+def _fingerprint(employee, task_info):
+    encoded = json.dumps([employee, task_info], sort_keys=True, ensure_ascii=False, default=_encode_task)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def read_changes(filename=CHANGELOG_FILENAME, position=0):
+    """
+    Read changes starting at a byte position
+
+    A final line that is still being written (no trailing newline) is left
+    for the next read.
+
+    Yields:
+        tuple: (change dict, byte position just after it)
+    """
+    if not os.path.exists(filename):
+        return
+    with open(filename, "rb") as f:
+        f.seek(position)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            position += len(line)
+            yield json.loads(line), position
+
+
+class ChangeLog:
+    """
+    Producer side of the change log
+
+    Thread-safe, and safe to use from several processes or instances on
+    one file. The fingerprints and last sequence number are kept in
+    ``<filename>.state.json``; changes appended after the last save_state()
+    (by this or any other producer) are replayed from the log on open and
+    before every append, so a sequence number is never reused and no logged
+    change is forgotten.
+
+    Args:
+        filename (str): Log file (created if missing)
+    """
+
+    def __init__(self, filename=CHANGELOG_FILENAME):
+        self.filename = filename
+        self.state_filename = f"{filename}.state.json"
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.position = 0
+        self.fingerprints = {}  # task id -> (employee, fingerprint)
+        self.file = open(filename, "ab")
+        with self._locked():
+            self._load_state()
+            self._catch_up()
+
+    def _load_state(self):
+        if os.path.exists(self.state_filename):
+            with open(self.state_filename, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.seq = state["seq"]
+            self.position = state["position"]
+            self.fingerprints = {task_id: tuple(entry) for task_id, entry in state["tasks"].items()}
+
+    def _catch_up(self):
+        """Apply the changes appended since ``position``, by any producer"""
+        for change, position in read_changes(self.filename, self.position):
+            self._remember(change)
+            self.seq = change["seq"]
+            self.position = position
+
+    @contextmanager
+    def _locked(self):
+        """Hold the thread lock and an exclusive lock on the log file, caught up with it"""
+        with self.lock:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._catch_up()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+
+    def _remember(self, change):
+        if change["op"] == "delete":
+            self.fingerprints.pop(change["task_id"], None)
+        else:
+            self.fingerprints[change["task_id"]] = (
+                change["employee"], _fingerprint(change["employee"], change["task"])
+            )
+
+    def save_state(self):
+        """Persist fingerprints and the last sequence number (atomic)"""
+        with self._locked():
+            state = {
+                "seq": self.seq,
+                "position": self.position,
+                "tasks": {task_id: list(entry) for task_id, entry in self.fingerprints.items()},
+            }
+            temp_filename = f"{self.state_filename}.tmp"
+            with open(temp_filename, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(temp_filename, self.state_filename)
+
+    def close(self):
+        self.save_state()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, task_id):
+        return task_id in self.fingerprints
+
+    def task_ids(self):
+        """Ids of every task currently alive in the log"""
+        with self._locked():
+            return set(self.fingerprints)
+
+    def record(self, employee, task_info, now_ms=None):
+        """
+        Log a task as inserted or updated, unless it is unchanged
+
+        Returns:
+            dict: The appended change, or None if nothing changed
+        """
+        task_id = task_info["id"]
+        fingerprint = _fingerprint(employee, task_info)
+        with self._locked():
+            previous = self.fingerprints.get(task_id)
+            if previous == (employee, fingerprint):
+                return None
+            op = "insert" if previous is None else "update"
+            self.fingerprints[task_id] = (employee, fingerprint)
+            return self._append(op, task_id, employee, task_info, now_ms)
+
+    def record_delete(self, task_id, now_ms=None):
+        """Log a task as deleted; returns the change, or None if the task was not alive"""
+        with self._locked():
+            previous = self.fingerprints.pop(task_id, None)
+            if previous is None:
+                return None
+            return self._append("delete", task_id, previous[0], None, now_ms)
+
+    def record_missing(self, seen_task_ids, now_ms=None):
+        """After a full sync: log every task that was not seen as deleted"""
+        for task_id in self.task_ids() - set(seen_task_ids):
+            self.record_delete(task_id, now_ms)
+
+    def _append(self, op, task_id, employee, task_info, now_ms):
+        self.seq += 1
+        change = {
+            "seq": self.seq,
+            "op": op,
+            "task_id": task_id,
+            "employee": employee,
+            "ts": int(time.time() * 1000) if now_ms is None else now_ms,
+        }
+        if task_info is not None:
+            change["task"] = task_info
+        line = (json.dumps(change, ensure_ascii=False, default=_encode_task) + "\n").encode("utf-8")
+        self.file.write(line)
+        self.file.flush()
+        self.position += len(line)
+        return change
+
+
+class ChangeLogConsumer:
+    """
+    Reads the change log from where a named consumer left off
+
+    Offsets (byte position and last sequence number) are stored per consumer
+    in ``<log filename>.offsets.json``. Changes are delivered at least once:
+    commit() after processing a batch, and a consumer restarted before
+    committing sees the batch again.
+
+    Example:
+        consumer = ChangeLogConsumer("agent3")
+        for change in consumer.poll():
+            apply(change)
+        consumer.commit()
+    """
+
+    def __init__(self, name, filename=CHANGELOG_FILENAME):
+        self.name = name
+        self.filename = filename
+        self.offsets_filename = f"{filename}.offsets.json"
+        offsets = self._load_offsets().get(name, {})
+        self.position = offsets.get("position", 0)
+        self.seq = offsets.get("seq", 0)
+        self.pending = None  # (position, seq) after the last poll
+
+    def _load_offsets(self):
+        if not os.path.exists(self.offsets_filename):
+            return {}
+        with open(self.offsets_filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def poll(self, max_changes=None):
+        """Changes after the committed offset, oldest first"""
+        changes = []
+        position, seq = self.position, self.seq
+        for change, position in read_changes(self.filename, self.position):
+            changes.append(change)
+            seq = change["seq"]
+            if max_changes and len(changes) >= max_changes:
+                break
+        self.pending = (position, seq)
+        return changes
+
+    def commit(self):
+        """Mark everything returned by the last poll() as processed"""
+        if self.pending is None:
+            return
+        self.position, self.seq = self.pending
+        self.pending = None
+        offsets = self._load_offsets()
+        offsets[self.name] = {"position": self.position, "seq": self.seq}
+        temp_filename = f"{self.offsets_filename}.{os.getpid()}.tmp"
+        with open(temp_filename, "w", encoding="utf-8") as f:
+            json.dump(offsets, f, indent=2)
+        os.replace(temp_filename, self.offsets_filename)
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read the ClickUp task change log")
+    parser.add_argument("--file", default=CHANGELOG_FILENAME)
+    parser.add_argument("--consumer", default="cli", help="consumer name whose offset is used")
+    parser.add_argument("--peek", action="store_true", help="do not commit the offset")
+    parser.add_argument("--max", type=int, default=None, help="maximum number of changes to read")
+    args = parser.parse_args()
+
+    consumer = ChangeLogConsumer(args.consumer, args.file)
+    changes = consumer.poll(args.max)
+    icons = {"insert": "➕", "update": "✏️", "delete": "🗑️"}
+    for change in changes:
+        name = (change.get("task") or {}).get("name", "")
+        print(f"  {change['seq']:>8} {icons[change['op']]} {change['op']:<6} {change['task_id']} {name} ({change['employee']})")
+    if not args.peek:
+        consumer.commit()
+    print(f"✅ {len(changes)} change(s) for '{args.consumer}', now at seq {consumer.pending[1] if args.peek else consumer.seq}")
@@ -0,0 +1,150 @@
+"""
+Columnar Task Statistics
+========================
+
+Builds NumPy columns (employee codes, completion flags, due timestamps) from
+organized tasks once, then computes every per-employee metric with grouped,
+vectorized operations instead of per-task Python loops.
+"""
+
+import time
+from operator import attrgetter
+
+import numpy as np
+
+from organize_tasks import (
+    COMPLETED_STATUSES,
+    DAY_MS,
+    DUE_SOON_DAYS,
+    employee_stats_entry,
+    parse_clickup_timestamp,
+)
+
+# Stored in due_ms for tasks without a due date
+NO_DUE_DATE = np.iinfo(np.int64).min
+
+
+class TaskColumns:
+    """
+    Column arrays for a set of organized tasks
+
+    Attributes:
+        employees (list): Employee names; ``employee_codes`` index into it
+        employee_codes (np.ndarray): int32 employee code per task
+        completed (np.ndarray): bool, task is in a completed status
+        due_ms (np.ndarray): int64 due date in epoch ms, NO_DUE_DATE if unset
+    """
+
+    __slots__ = ("employees", "employee_codes", "completed", "due_ms")
+
+    def __init__(self, employees, employee_codes, completed, due_ms):
+        self.employees = employees
+        self.employee_codes = employee_codes
+        self.completed = completed
+        self.due_ms = due_ms
+
+    def __len__(self):
+        return len(self.employee_codes)
+
+
+def _due_ms(value):
+    # TaskRecords already hold ints; task info dicts hold ms epoch strings
+    if value is None:
+        return NO_DUE_DATE
+    if type(value) is int:
+        return value
+    parsed = parse_clickup_timestamp(value)
+    return NO_DUE_DATE if parsed is None else parsed
+
+
+def _column(employee_tasks, employees, field):
+    """One field for every task, in employee order, read by attribute from TaskRecords when possible"""
+    getter = attrgetter(field)
+    values = []
+    for employee in employees:
+        tasks = employee_tasks[employee]
+        try:
+            column = list(map(getter, tasks))
+        except AttributeError:
+            column = [task.get(field) for task in tasks]
+        values.extend(column)
+    return values
+
+
+def build_task_columns(employee_tasks):
+    """
+    Convert organized tasks into columns
+
+    Statuses are lowercased once per distinct value, not once per task.
+
+    Args:
+        employee_tasks (dict): Tasks organized by employee (task dicts or TaskRecords)
+
+    Returns:
+        TaskColumns: Columns in employee order, then task order
+    """
+    employees = list(employee_tasks)
+    counts = [len(employee_tasks[employee]) for employee in employees]
+    total = sum(counts)
+
+    statuses = _column(employee_tasks, employees, "status")
+    is_completed = {status: (status or "").lower() in COMPLETED_STATUSES for status in set(statuses)}
+
+    return TaskColumns(
+        employees=employees,
+        employee_codes=np.repeat(np.arange(len(employees), dtype=np.int32), counts),
+        completed=np.fromiter(map(is_completed.__getitem__, statuses), dtype=bool, count=total),
+        due_ms=np.fromiter(
+            map(_due_ms, _column(employee_tasks, employees, "due_date")),
+            dtype=np.int64,
+            count=total
+        ),
+    )
+
+
+def employee_counts(columns, now_ms):
+    """
+    Per-employee counters as arrays indexed by employee code
+
+    Returns:
+        tuple: (totals, completed, overdue, due_soon) int64 arrays
+    """
+    num_employees = len(columns.employees)
+    codes = columns.employee_codes
+
+    open_with_due = ~columns.completed & (columns.due_ms != NO_DUE_DATE)
+    overdue = open_with_due & (columns.due_ms < now_ms)
+    due_soon = open_with_due & (columns.due_ms >= now_ms) & (columns.due_ms - now_ms <= DUE_SOON_DAYS * DAY_MS)
+
+    return (
+        np.bincount(codes, minlength=num_employees),
+        np.bincount(codes[columns.completed], minlength=num_employees),
+        np.bincount(codes[overdue], minlength=num_employees),
+        np.bincount(codes[due_soon], minlength=num_employees),
+    )
+
+
+def compute_employee_stats(columns, now_ms=None):
+    """
+    Compute per-employee statistics from task columns
+
+    Args:
+        columns (TaskColumns): Columns from build_task_columns
+        now_ms (int): Reference time in epoch ms; defaults to now
+
+    Returns:
+        dict: Statistics in the shape get_task_statistics returns
+    """
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    totals, completed, overdue_counts, due_soon_counts = employee_counts(columns, now_ms)
+
+    stats = {
+        "total_employees": len(columns.employees),
+        "total_tasks": int(totals.sum()),
+        "employee_stats": {}
+    }
+    for code, employee in enumerate(columns.employees):
+        stats["employee_stats"][employee] = employee_stats_entry(
+            int(totals[code]), int(completed[code]), int(overdue_counts[code]), int(due_soon_counts[code])
+        )
+    return stats
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Task Dependency Graph
+=====================
+
+Builds a graph of "waits on" edges from the parent / waiting_on / blocking
+fields of organized tasks:
+
+- a task waits on every task in its ``waiting_on`` list;
+- every task in its ``blocking`` list waits on it;
+- a parent task waits on each of its subtasks.
+
+For every task the graph keeps:
+- the remaining work on the longest chain of open tasks ending at it (its
+  critical path);
+- the length of that chain (how many open tasks are blocking it, transitively).
+
+Completed tasks break chains. Open tasks in or downstream of a cycle of open
+tasks have no value until the cycle is broken.
+
+Changing a task only re-evaluates the tasks downstream of it, and stops as
+soon as values no longer change. Webhook-driven updates therefore stay cheap
+on large projects.
+
+Usage:
+    python task_graph.py                 # cycles and per-employee summary
+    python task_graph.py <task id>       # critical path and who is blocking a task
+"""
+
+import heapq
+import json
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+
+from organize_tasks import COMPLETED_STATUSES
+
+HOUR_MS = 60 * 60 * 1000
+
+# Remaining work assumed for open tasks without a time estimate
+DEFAULT_ESTIMATE_MS = HOUR_MS
+
+
+def remaining_work_ms(task_info):
+    """Estimated work left on a task in ms (0 once it is completed)"""
+    if (task_info.get("status") or "").lower() in COMPLETED_STATUSES:
+        return 0
+    estimate = task_info.get("time_estimate")
+    if not estimate:
+        return DEFAULT_ESTIMATE_MS
+    return max(int(estimate) - int(task_info.get("time_spent") or 0), 0)
+
+
+def _declared_edges(task_info):
+    """(waiting task, blocking task) pairs stated by one task"""
+    task_id = task_info["id"]
+    edges = {(task_id, blocker) for blocker in task_info.get("waiting_on") or ()}
+    edges.update((waiter, task_id) for waiter in task_info.get("blocking") or ())
+    if task_info.get("parent"):
+        edges.add((task_info["parent"], task_id))
+    edges.discard((task_id, task_id))
+    return edges
+
+
+class TaskGraph:
+    """
+    Dependency graph over tasks with incrementally maintained critical paths
+
+    An edge can be stated by either of its tasks (ClickUp lists a dependency on
+    both), so edges are reference counted and only disappear once no task
+    states them any more. Edges may point at tasks the graph has not seen;
+    they take effect when that task is added.
+
+    Example:
+        graph = TaskGraph.from_employee_tasks(organized_tasks)
+        graph.critical_path("release_task_id")
+        graph.blockers("release_task_id")  # employee -> open task ids upstream
+    """
+
+    def __init__(self):
+        self.employees = {}                 # task id -> employee
+        self.open = {}                      # task id -> still open
+        self.work = {}                      # task id -> remaining work (ms)
+        self.declared = {}                  # task id -> edges stated by that task
+        self.edge_refs = defaultdict(int)   # (waiter, blocker) -> number of tasks stating it
+        self.prereqs = defaultdict(set)     # task id -> task ids it waits on
+        self.dependents = defaultdict(set)  # task id -> task ids waiting on it
+        self.finish = {}                    # task id -> remaining work on its critical path, None if in/after a cycle
+        self.depth = {}                     # task id -> open tasks on its longest blocked chain, None if in/after a cycle
+        self.via = {}                       # task id -> previous task on its critical path
+        self.deferred = False
+
+    @classmethod
+    def from_employee_tasks(cls, employee_tasks):
+        """Build a graph from an organized tasks dict (employee -> list of tasks)"""
+        graph = cls()
+        with graph.batch():
+            for employee, tasks in employee_tasks.items():
+                for task_info in tasks:
+                    graph.update(task_info, employee)
+        return graph
+
+    def __len__(self):
+        return len(self.work)
+
+    def __contains__(self, task_id):
+        return task_id in self.work
+
+    @contextmanager
+    def batch(self):
+        """Defer re-evaluation until the block ends, then evaluate the whole graph once"""
+        self.deferred = True
+        try:
+            yield self
+        finally:
+            self.deferred = False
+            self._evaluate(set(self.work), full=True)
+
+    # --- changes ---
+    def update(self, task_info, employee=None):
+        """Add or replace a task and re-evaluate everything downstream of what changed"""
+        task_id = task_info["id"]
+        old_edges = self.declared.get(task_id, set())
+        new_edges = _declared_edges(task_info)
+
+        touched = {task_id}
+        for edge in old_edges - new_edges:
+            touched.add(self._unref(edge))
+        for edge in new_edges - old_edges:
+            touched.add(self._ref(edge))
+
+        self.declared[task_id] = new_edges
+        self.employees[task_id] = employee or "Unassigned"
+        self.open[task_id] = (task_info.get("status") or "").lower() not in COMPLETED_STATUSES
+        self.work[task_id] = remaining_work_ms(task_info)
+        self._evaluate(touched)
+
+    def remove(self, task_id):
+        """Remove a task and the edges it stated; returns True if it was in the graph"""
+        if task_id not in self.work:
+            return False
+        touched = set(self.dependents.get(task_id, ()))
+        for edge in self.declared.pop(task_id):
+            touched.add(self._unref(edge))
+        for table in (self.employees, self.open, self.work, self.finish, self.depth, self.via):
+            table.pop(task_id, None)
+        touched.discard(task_id)
+        self._evaluate(touched)
+        return True
+
+    def _ref(self, edge):
+        waiter, blocker = edge
+        self.edge_refs[edge] += 1
+        self.prereqs[waiter].add(blocker)
+        self.dependents[blocker].add(waiter)
+        return waiter
+
+    def _unref(self, edge):
+        waiter, blocker = edge
+        self.edge_refs[edge] -= 1
+        if self.edge_refs[edge] == 0:
+            del self.edge_refs[edge]
+            self.prereqs[waiter].discard(blocker)
+            self.dependents[blocker].discard(waiter)
+        return waiter
+
+    # --- evaluation ---
+    def _known_prereqs(self, task_id):
+        return [blocker for blocker in self.prereqs.get(task_id, ()) if blocker in self.work]
+
+    def _open_prereqs(self, task_id):
+        """Open tasks an open task is blocked by (completed tasks are never blocked)"""
+        if not self.open[task_id]:
+            return []
+        return [blocker for blocker in self._known_prereqs(task_id) if self.open[blocker]]
+
+    def _evaluate(self, roots, full=False):
+        """
+        Recompute finish/depth for ``roots`` and their downstream tasks
+
+        The affected subgraph is visited in topological order (Kahn) over
+        open -> open edges. A task is only recomputed if it is a root or one
+        of its prerequisites changed; tasks never reached are part of, or
+        downstream of, a cycle of open tasks.
+        """
+        if self.deferred:
+            return
+        roots = {task_id for task_id in roots if task_id in self.work}
+        affected = set(roots)
+        if not full:
+            stack = list(roots)
+            while stack:
+                for waiter in self.dependents.get(stack.pop(), ()):
+                    if waiter in self.work and waiter not in affected:
+                        affected.add(waiter)
+                        stack.append(waiter)
+
+        # Roots are ordered before their dependents even when closed, so a task
+        # that was just closed is seen as changed before anything it stopped blocking
+        def ordered_after(waiter, blocker):
+            return self.open[waiter] and (self.open[blocker] or blocker in roots)
+
+        pending = {
+            task_id: sum(1 for p in self._known_prereqs(task_id) if p in affected and ordered_after(task_id, p))
+            for task_id in affected
+        }
+        ready = [task_id for task_id, count in pending.items() if count == 0]
+        changed = set()
+        visited = set()
+        while ready:
+            task_id = ready.pop()
+            visited.add(task_id)
+            # Roots count as changed even if their values are not: a task that was
+            # just closed or reopened stops or starts blocking its dependents
+            if full or task_id in roots or any(p in changed for p in self._known_prereqs(task_id)):
+                if self._compute(task_id) or task_id in roots:
+                    changed.add(task_id)
+            for waiter in self.dependents.get(task_id, ()):
+                if waiter in pending and ordered_after(waiter, task_id):
+                    pending[waiter] -= 1
+                    if pending[waiter] == 0:
+                        ready.append(waiter)
+
+        for task_id in affected - visited:
+            self.finish[task_id] = self.depth[task_id] = self.via[task_id] = None
+
+    def _compute(self, task_id):
+        """Recompute one task from its prerequisites; returns True if its values changed"""
+        old = (self.finish.get(task_id), self.depth.get(task_id), self.via.get(task_id))
+        if not self.open[task_id]:
+            new = (0, 0, None)
+        else:
+            finish, depth, via = 0, 0, None
+            for blocker in self._open_prereqs(task_id):
+                if self.finish[blocker] is None:
+                    finish = depth = via = None
+                    break
+                depth = max(depth, self.depth[blocker] + 1)
+                if (self.finish[blocker], blocker) > (finish, via or ""):
+                    finish, via = self.finish[blocker], blocker
+            new = (None, None, None) if finish is None else (finish + self.work[task_id], depth, via)
+        self.finish[task_id], self.depth[task_id], self.via[task_id] = new
+        return new != old
+
+    # --- queries ---
+    def topological_order(self):
+        """
+        Task ids with every task after the tasks it waits on
+
+        Ties are broken by task id so the order is deterministic. Tasks in or
+        downstream of a cycle are left out (see cycles()).
+        """
+        pending = {task_id: len(self._known_prereqs(task_id)) for task_id in self.work}
+        ready = [task_id for task_id, count in pending.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            task_id = heapq.heappop(ready)
+            order.append(task_id)
+            for waiter in self.dependents.get(task_id, ()):
+                if waiter in pending:
+                    pending[waiter] -= 1
+                    if pending[waiter] == 0:
+                        heapq.heappush(ready, waiter)
+        return order
+
+    def cycles(self):
+        """Groups of tasks that (transitively) wait on each other, found with Tarjan's algorithm"""
+        index_of, lowlink, on_stack = {}, {}, set()
+        stack, components = [], []
+        counter = 0
+        for start in sorted(self.work):
+            if start in index_of:
+                continue
+            work = [(start, iter(sorted(self._known_prereqs(start))))]
+            index_of[start] = lowlink[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, successors = work[-1]
+                advanced = False
+                for successor in successors:
+                    if successor not in index_of:
+                        index_of[successor] = lowlink[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(sorted(self._known_prereqs(successor)))))
+                        advanced = True
+                        break
+                    if successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[successor])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        components.append(sorted(component))
+        return components
+
+    def critical_path(self, task_id=None):
+        """
+        Open tasks on the longest remaining-work chain ending at ``task_id``
+
+        Without ``task_id`` the longest chain in the whole graph is returned.
+
+        Returns:
+            list: Task ids, first blocker first; empty if the task is unknown,
+                completed or in/after a cycle
+        """
+        if task_id is None:
+            candidates = [(finish, t) for t, finish in self.finish.items() if finish]
+            if not candidates:
+                return []
+            task_id = max(candidates)[1]
+        if not self.finish.get(task_id):
+            return []
+        path = []
+        while task_id is not None:
+            path.append(task_id)
+            task_id = self.via[task_id]
+        return path[::-1]
+
+    def critical_path_ms(self, task_id):
+        """Remaining work (ms) on the critical path ending at ``task_id``, None if in/after a cycle"""
+        return self.finish.get(task_id)
+
+    def blocked_chain_length(self, task_id):
+        """Number of open tasks on the longest chain blocking ``task_id``"""
+        return self.depth.get(task_id)
+
+    def blockers(self, task_id):
+        """
+        Open tasks ``task_id`` is waiting on, directly or transitively, by employee
+
+        Answers "who is blocking this?" by walking only the upstream subgraph.
+
+        Returns:
+            dict: employee -> sorted open task ids
+        """
+        seen = set()
+        stack = [task_id]
+        while stack:
+            for blocker in self._known_prereqs(stack.pop()):
+                if blocker not in seen and self.open[blocker]:
+                    seen.add(blocker)
+                    stack.append(blocker)
+        by_employee = defaultdict(list)
+        for blocker in sorted(seen):
+            by_employee[self.employees[blocker]].append(blocker)
+        return dict(by_employee)
+
+    def employee_summary(self):
+        """
+        Per-employee dependency metrics
+
+        Returns:
+            dict: employee -> open_tasks, blocked_tasks (open tasks waiting on
+                open tasks), longest_blocked_chain, critical_path_hours (longest
+                remaining-work chain ending at one of their tasks) and
+                cyclic_tasks
+        """
+        summary = {}
+        for task_id, employee in self.employees.items():
+            entry = summary.setdefault(employee, {
+                "open_tasks": 0, "blocked_tasks": 0, "longest_blocked_chain": 0,
+                "critical_path_hours": 0, "cyclic_tasks": 0
+            })
+            if not self.open[task_id]:
+                continue
+            entry["open_tasks"] += 1
+            depth = self.depth.get(task_id)
+            if depth is None:
+                entry["cyclic_tasks"] += 1
+                continue
+            entry["blocked_tasks"] += depth > 0
+            entry["longest_blocked_chain"] = max(entry["longest_blocked_chain"], depth)
+            entry["critical_path_hours"] = max(entry["critical_path_hours"], round(self.finish[task_id] / HOUR_MS, 2))
+        return summary
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    with open("summary_clickup.json", "r", encoding="utf-8") as f:
+        graph = TaskGraph.from_employee_tasks(json.load(f))
+    print(f"🕸️ {len(graph)} tasks, {len(graph.edge_refs)} dependencies")
+
+    cycles = graph.cycles()
+    if cycles:
+        print(f"❌ {len(cycles)} dependency cycle(s):")
+        for cycle in cycles:
+            print(f"  - {' -> '.join(cycle)}")
+
+    if len(sys.argv) > 1:
+        target = sys.argv[1]
+        if target not in graph:
+            print(f"❌ Unknown task {target}")
+            sys.exit(1)
+        path = graph.critical_path(target)
+        print(f"\n🎯 Critical path to {target} ({(graph.critical_path_ms(target) or 0) / HOUR_MS:.1f}h of work):")
+        print(f"  {' -> '.join(path) if path else 'nothing open'}")
+        print(f"\n⛔ Blocking {target}:")
+        for employee, task_ids in graph.blockers(target).items():
+            print(f"  👤 {employee}: {', '.join(task_ids)}")
+    else:
+        for employee, entry in graph.employee_summary().items():
+            print(f"\n  👤 {employee}:")
+            print(f"    ⛔ Blocked tasks: {entry['blocked_tasks']} of {entry['open_tasks']} open")
+            print(f"    🔗 Longest blocked chain: {entry['longest_blocked_chain']}")
+            print(f"    🎯 Critical path: {entry['critical_path_hours']}h")
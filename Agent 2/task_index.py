@@ -0,0 +1,168 @@
+"""
+Task Index
+==========
+
+Keeps tasks by id together with secondary indexes from assignee, status,
+priority, tag and creator to task ids. Every assignee of a task is indexed,
+not just the first one, and combined filters are answered by intersecting
+the id sets smallest-first instead of scanning all tasks.
+"""
+
+from collections import defaultdict
+
+from organize_tasks import classify_task, employee_stats_entry
+
+INDEXED_FIELDS = ("assignee", "status", "priority", "tag", "creator")
+
+
+def task_assignees(task_info, employee=None):
+    """
+    All assignee usernames of a task
+
+    Tasks saved before assignees were recorded only carry the employee they
+    were filed under, so that is used as a fallback.
+    """
+    assignees = task_info.get("assignees")
+    if assignees:
+        return tuple(assignees)
+    return (employee or "Unassigned",)
+
+
+def _index_keys(task_info, employee=None):
+    """Indexed field -> values for one task"""
+    return {
+        "assignee": task_assignees(task_info, employee),
+        "status": (task_info.get("status") or "Unknown",),
+        "priority": (task_info.get("priority") or "Normal",),
+        "tag": tuple(task_info.get("tags") or ()),
+        "creator": (task_info.get("creator") or "Unknown",),
+    }
+
+
+class TaskIndex:
+    """
+    Tasks by id plus secondary indexes (field -> value -> set of task ids)
+
+    Example:
+        index = TaskIndex.from_employee_tasks(organized_tasks)
+        ids = index.query(priority="high", tag="bug", assignee="alice_dev")
+    """
+
+    def __init__(self):
+        self.tasks = {}  # task id -> task info
+        self.indexed_values = {}  # task id -> indexed values, so removal needs no rescan
+        self.indexes = {field: defaultdict(set) for field in INDEXED_FIELDS}
+
+    @classmethod
+    def from_employee_tasks(cls, employee_tasks):
+        """Build an index from an organized tasks dict (employee -> list of tasks)"""
+        index = cls()
+        for employee, tasks in employee_tasks.items():
+            for task_info in tasks:
+                index.add(task_info, employee)
+        return index
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self.tasks
+
+    def get(self, task_id):
+        return self.tasks.get(task_id)
+
+    def add(self, task_info, employee=None):
+        """Insert or replace a task, re-indexing it"""
+        task_id = task_info["id"]
+        self.remove(task_id)
+        keys = _index_keys(task_info, employee)
+        for field, values in keys.items():
+            for value in values:
+                self.indexes[field][value].add(task_id)
+        self.tasks[task_id] = task_info
+        self.indexed_values[task_id] = keys
+
+    def remove(self, task_id):
+        """Remove a task; returns its task info or None"""
+        keys = self.indexed_values.pop(task_id, None)
+        if keys is None:
+            return None
+        for field, values in keys.items():
+            index = self.indexes[field]
+            for value in values:
+                ids = index[value]
+                ids.discard(task_id)
+                if not ids:
+                    del index[value]
+        return self.tasks.pop(task_id)
+
+    def ids(self, field, value):
+        """Task ids with ``field == value`` (read-only view; do not mutate)"""
+        return self.indexes[field].get(value, frozenset())
+
+    def values(self, field):
+        """Distinct values of an indexed field, sorted"""
+        return sorted(self.indexes[field], key=str)
+
+    def query(self, **filters):
+        """
+        Task ids matching every given filter
+
+        Args:
+            **filters: Indexed field -> value, or a list/set of values meaning
+                "any of these". None or "All" leaves the field unfiltered.
+
+        Returns:
+            set: Matching task ids
+        """
+        candidates = []
+        for field, wanted in filters.items():
+            if field not in self.indexes:
+                raise ValueError(f"Unknown index field: {field}")
+            if wanted is None or wanted == "All":
+                continue
+            if isinstance(wanted, (list, tuple, set, frozenset)):
+                candidates.append(set().union(*(self.ids(field, value) for value in wanted)))
+            else:
+                candidates.append(self.ids(field, wanted))
+
+        if not candidates:
+            return set(self.tasks)
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for ids in candidates[1:]:
+            if not result:
+                break
+            result &= ids
+        return result
+
+    def statistics(self, now_ms):
+        """
+        Per-assignee statistics in the get_task_statistics shape
+
+        A task with several assignees counts towards each of them. Completed
+        counts come from intersecting status sets; only open tasks are
+        looked at individually for due dates.
+
+        Args:
+            now_ms (int): Reference time in epoch ms
+        """
+        statuses = self.indexes["status"]
+        completed_ids = set().union(*(
+            ids for status, ids in statuses.items() if classify_task({"status": status}, now_ms)[0]
+        ))
+
+        stats = {
+            "total_employees": len(self.indexes["assignee"]),
+            "total_tasks": len(self.tasks),
+            "employee_stats": {}
+        }
+        for assignee, ids in self.indexes["assignee"].items():
+            completed = len(ids & completed_ids)
+            overdue = due_soon = 0
+            for task_id in ids - completed_ids:
+                _, is_overdue, is_due_soon = classify_task(self.tasks[task_id], now_ms)
+                overdue += is_overdue
+                due_soon += is_due_soon
+            stats["employee_stats"][assignee] = employee_stats_entry(len(ids), completed, overdue, due_soon)
+        return stats
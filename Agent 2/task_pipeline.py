@@ -0,0 +1,312 @@
+"""
+Streaming Task Pipeline
+=======================
+
+Moves ClickUp tasks from the API to summary_clickup.json and
+clickup_statistics.json one page at a time:
+
+    fetch thread -> bounded page buffer -> organize page -> page statistics
+                                                         -> timing sketches
+                                                         -> aggregate tables
+                                                         -> change log (after commit)
+                                                         -> per-employee spill files
+
+Only a few pages are held in memory at once, whatever the size of the
+workspace. Tasks reach the spill files while later pages are still being
+fetched, and the final JSON file is assembled from them by copying bytes, in
+the same format save_organized_tasks writes.
+"""
+
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+from organize_tasks import _encode_task, employee_stats_entry, organize_tasks_by_employee
+from task_aggregates import TaskAggregates
+from task_columns import build_task_columns, employee_counts
+from task_timing import TimingAnalytics, save_timing_statistics
+
+# Pages buffered between the fetch thread and the organizer
+MAX_BUFFERED_PAGES = 4
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+def prefetch(iterable, max_buffered=MAX_BUFFERED_PAGES):
+    """
+    Run ``iterable`` in a background thread, buffering at most ``max_buffered`` items
+
+    The producer blocks once the buffer is full, so a slow consumer limits how
+    far ahead fetching gets. Exceptions from the producer are re-raised in the
+    consumer; closing the generator early stops the producer.
+    """
+    buffer = queue.Queue(maxsize=max_buffered)
+    stopping = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stopping.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(done)
+        except BaseException as e:  # handed to the consumer
+            put(_Failure(e))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stopping.set()
+
+
+def format_task_list(tasks):
+    """
+    Format one employee's tasks as they appear inside summary_clickup.json
+
+    The list is dumped at the file's nesting level without its brackets, so
+    fragments for the same employee can be joined with ",\\n".
+    """
+    text = json.dumps(tasks, indent=2, ensure_ascii=False, default=_encode_task)
+    return "  " + text[2:-2].replace("\n", "\n  ")
+
+
+class IncrementalTaskWriter:
+    """
+    Writes organized tasks to one JSON file without holding them all
+
+    Each page's tasks are formatted immediately and appended to a spill file
+    per employee; close() stitches the spill files into ``filename``
+    (employees in first-seen order) and replaces it atomically. The output is
+    byte-identical to save_organized_tasks on the same tasks.
+
+    Args:
+        filename (str): Final output path
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.spill_dir = tempfile.mkdtemp(prefix=".clickup_spill_", dir=os.path.dirname(os.path.abspath(filename)))
+        self.spills = {}  # employee -> open spill file, in first-seen order
+        self.task_count = 0
+
+    def add_page(self, employee_tasks):
+        """Append one page of organized tasks (employee -> list of tasks)"""
+        for employee, tasks in employee_tasks.items():
+            self.add_fragment(employee, format_task_list(tasks), len(tasks))
+
+    def add_fragment(self, employee, fragment, task_count):
+        """Append tasks already formatted by format_task_list"""
+        spill = self.spills.get(employee)
+        if spill is None:
+            path = os.path.join(self.spill_dir, f"{len(self.spills)}.json")
+            spill = self.spills[employee] = open(path, "w+", encoding="utf-8")
+        else:
+            spill.write(",\n")
+        spill.write(fragment)
+        self.task_count += task_count
+
+    def close(self, commit=True):
+        """Assemble the output file (unless ``commit`` is False) and remove the spill files"""
+        try:
+            if commit:
+                temp_filename = f"{self.filename}.tmp"
+                with open(temp_filename, "w", encoding="utf-8") as out:
+                    if not self.spills:
+                        out.write("{}")
+                    else:
+                        out.write("{")
+                        for position, (employee, spill) in enumerate(self.spills.items()):
+                            out.write(",\n  " if position else "\n  ")
+                            out.write(json.dumps(employee, ensure_ascii=False))
+                            out.write(": [\n")
+                            spill.seek(0)
+                            shutil.copyfileobj(spill, out)
+                            out.write("\n  ]")
+                        out.write("\n}")
+                os.replace(temp_filename, self.filename)
+        finally:
+            for spill in self.spills.values():
+                spill.close()
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+class PendingChanges:
+    """
+    Tasks of a sync to record in a ChangeLog once the task file is committed
+
+    The change log feeds consumers such as the search index, so nothing may
+    reach it from a sync whose task file is then thrown away. Tasks are
+    spilled to a temporary file, like IncrementalTaskWriter's, so a full
+    sync still holds only a few pages in memory.
+
+    Args:
+        changelog (ChangeLog): Log to record the tasks in
+        directory (str): Where to keep the spill file
+    """
+
+    def __init__(self, changelog, directory):
+        self.changelog = changelog
+        self.spill = tempfile.TemporaryFile("w+", encoding="utf-8", dir=directory)
+        self.task_ids = set()
+
+    def add_page(self, employee_tasks):
+        for employee, tasks in employee_tasks.items():
+            for task_info in tasks:
+                self.spill.write(json.dumps([employee, task_info], ensure_ascii=False, default=_encode_task))
+                self.spill.write("\n")
+                self.task_ids.add(task_info["id"])
+
+    def commit(self, now_ms):
+        """Record every spilled task, then every task the sync did not see as deleted"""
+        self.spill.seek(0)
+        for line in self.spill:
+            employee, task_info = json.loads(line)
+            self.changelog.record(employee, task_info, now_ms)
+        self.changelog.record_missing(self.task_ids, now_ms)
+
+    def close(self):
+        self.spill.close()
+
+
+def page_employee_counts(employee_tasks, now_ms):
+    """employee -> [total, completed, overdue, due_soon] for one page of organized tasks"""
+    columns = build_task_columns(employee_tasks)
+    totals, completed, overdue, due_soon = employee_counts(columns, now_ms)
+    return {
+        employee: [int(totals[code]), int(completed[code]), int(overdue[code]), int(due_soon[code])]
+        for code, employee in enumerate(columns.employees)
+    }
+
+
+class StreamingStats:
+    """
+    Per-employee counters summed page by page
+
+    Keeps four numbers per employee rather than anything per task, and
+    produces the same statistics as get_task_statistics over all pages.
+    """
+
+    def __init__(self, now_ms):
+        self.now_ms = now_ms
+        self.counts = {}  # employee -> [total, completed, overdue, due_soon]
+
+    def add_page(self, employee_tasks):
+        self.add_counts(page_employee_counts(employee_tasks, self.now_ms))
+
+    def add_counts(self, page_counts):
+        """Add counters from page_employee_counts (employee -> [total, completed, overdue, due_soon])"""
+        for employee, employee_page_counts in page_counts.items():
+            counts = self.counts.setdefault(employee, [0, 0, 0, 0])
+            for position, value in enumerate(employee_page_counts):
+                counts[position] += value
+
+    def statistics(self):
+        """Statistics in the shape get_task_statistics returns"""
+        stats = {
+            "total_employees": len(self.counts),
+            "total_tasks": sum(counts[0] for counts in self.counts.values()),
+            "employee_stats": {}
+        }
+        for employee, counts in self.counts.items():
+            stats["employee_stats"][employee] = employee_stats_entry(*counts)
+        return stats
+
+
+def stream_tasks_to_files(pages, tasks_filename="summary_clickup.json",
+                          stats_filename="clickup_statistics.json", now_ms=None,
+                          max_buffered_pages=MAX_BUFFERED_PAGES, on_page=None, timing_filename=None,
+                          changelog=None, aggregates_filename=None):
+    """
+    Organize, count and save tasks page by page
+
+    Nothing is written if there are no tasks, and existing output files are
+    left untouched if the page source fails.
+
+    Args:
+        pages (iterable): Pages of tasks (raw ClickUp dicts or TaskRecords),
+            e.g. fetch_clickup.iter_task_pages(..., as_records=True)
+        tasks_filename (str): Where to write organized tasks
+        stats_filename (str): Where to write statistics
+        now_ms (int): Reference time for overdue/due soon; defaults to now
+        max_buffered_pages (int): Pages fetched ahead of the organizer
+        on_page (callable): Progress hook, called as on_page(pages_done, tasks_done)
+        timing_filename (str): Where to write lead/cycle time percentiles
+            (see task_timing.py); skipped if None
+        changelog (ChangeLog): Log inserted/updated tasks to it, and tasks
+            that no longer exist as deleted, once the sync has completed and
+            the task file is committed
+        aggregates_filename (str): Where to write the dashboard's aggregate
+            tables (see task_aggregates.py); skipped if None
+
+    Returns:
+        dict: Statistics, as get_task_statistics returns them
+    """
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    writer = IncrementalTaskWriter(tasks_filename)
+    stats = StreamingStats(now_ms)
+    timing = TimingAnalytics() if timing_filename else None
+    aggregates = TaskAggregates() if aggregates_filename else None
+    pending = None
+    if changelog is not None:
+        pending = PendingChanges(changelog, os.path.dirname(os.path.abspath(tasks_filename)))
+    committed = False
+    try:
+        for page_number, page in enumerate(prefetch(pages, max_buffered_pages), start=1):
+            employee_tasks = organize_tasks_by_employee(page)
+            stats.add_page(employee_tasks)
+            if timing is not None:
+                timing.add_page(employee_tasks)
+            if aggregates is not None:
+                aggregates.add_page(employee_tasks)
+            if pending is not None:
+                pending.add_page(employee_tasks)
+            writer.add_page(employee_tasks)
+            if on_page:
+                on_page(page_number, writer.task_count)
+        committed = writer.task_count > 0
+    finally:
+        writer.close(commit=committed)
+        if pending is not None and not committed:
+            pending.close()
+
+    statistics = stats.statistics()
+    if committed:
+        with open(stats_filename, "w", encoding="utf-8") as f:
+            json.dump(statistics, f, indent=2, ensure_ascii=False)
+        if timing is not None:
+            save_timing_statistics(timing.summary(), timing_filename)
+        if aggregates is not None:
+            aggregates.save(aggregates_filename)
+    if pending is not None and committed:
+        try:
+            pending.commit(now_ms)
+            changelog.save_state()
+        finally:
+            pending.close()
+    return statistics
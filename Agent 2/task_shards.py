@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Sharded Task Processing
+=======================
+
+Map-reduce version of organize_tasks_by_employee + get_task_statistics for
+very large workspaces. Tasks are split into contiguous shards, and a process
+pool decodes, organizes, counts and (for file output) formats each shard.
+The partial results are merged in shard order.
+
+Because shards are contiguous and merged in order, employees keep their
+first-seen order and every employee's tasks keep their input order. The
+result is identical to the serial path: the same dicts in memory, and
+byte-identical summary_clickup.json / clickup_statistics.json on disk.
+
+Only compact data crosses process boundaries. Workers take raw JSON bytes
+and hand back preformatted JSON text plus four counters per employee,
+instead of pickling task dicts both ways.
+
+Usage:
+    python task_shards.py tasks_export.jsonl --workers 8
+    python task_shards.py --bench 1000000
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from clickup_models import decode_task_page
+from organize_tasks import organize_tasks_by_employee
+from task_aggregates import TaskAggregates
+from task_pipeline import IncrementalTaskWriter, StreamingStats, format_task_list, page_employee_counts
+from task_timing import TimingAnalytics, save_timing_statistics
+
+SHARD_SIZE = 20000
+
+
+def _process_shard(shard, now_ms, as_fragments, with_timing, with_aggregates=False):
+    """
+    Worker: organize and count one shard
+
+    Args:
+        shard (bytes | list): Raw ClickUp tasks as JSONL lines (bytes) or a
+            list of raw task dicts
+        now_ms (int): Reference time for overdue/due soon
+        as_fragments (bool): Return formatted JSON text instead of task dicts
+        with_timing (bool): Also return timing sketches
+        with_aggregates (bool): Also return aggregate tables
+
+    Returns:
+        dict: tasks (employee -> task dicts or (fragment, count)), counts
+            (employee -> counters), timing (serialized sketches or None) and
+            aggregates (serialized tables or None)
+    """
+    if isinstance(shard, bytes):
+        lines = [line for line in shard.splitlines() if line.strip()]
+        tasks, _ = decode_task_page(b"{\"tasks\":[" + b",".join(lines) + b"]}")
+    else:
+        tasks = shard
+    employee_tasks = organize_tasks_by_employee(tasks)
+
+    if as_fragments:
+        organized = {
+            employee: (format_task_list(emp_tasks), len(emp_tasks))
+            for employee, emp_tasks in employee_tasks.items()
+        }
+    else:
+        # Ship plain dicts back; TaskRecords would pickle every slot
+        organized = {
+            employee: [task.to_dict() if hasattr(task, "to_dict") else task for task in emp_tasks]
+            for employee, emp_tasks in employee_tasks.items()
+        }
+    return {
+        "tasks": organized,
+        "counts": page_employee_counts(employee_tasks, now_ms),
+        "timing": TimingAnalytics.from_employee_tasks(employee_tasks).to_dict() if with_timing else None,
+        "aggregates": TaskAggregates.from_employee_tasks(employee_tasks).to_dict() if with_aggregates else None,
+    }
+
+
+def map_shards(shards, now_ms, as_fragments=False, with_timing=False, workers=None, with_aggregates=False):
+    """
+    Process shards in a process pool, yielding results in shard order
+
+    At most two shards per worker are in flight, so the input can be a lazy
+    stream of any length.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for shard in shards:
+            pending.append(pool.submit(_process_shard, shard, now_ms, as_fragments, with_timing,
+                                       with_aggregates))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def split_tasks(tasks, shard_size=SHARD_SIZE):
+    """Contiguous shards of a task list"""
+    for start in range(0, len(tasks), shard_size):
+        yield tasks[start:start + shard_size]
+
+
+def iter_jsonl_shards(filename, shard_size=SHARD_SIZE):
+    """
+    Read a JSONL export (one raw ClickUp task per line) as shards of raw bytes
+
+    Lines are not parsed here; decoding happens in the workers.
+    """
+    with open(filename, "rb") as f:
+        lines = []
+        for line in f:
+            lines.append(line)
+            if len(lines) >= shard_size:
+                yield b"".join(lines)
+                lines = []
+        if lines:
+            yield b"".join(lines)
+
+
+def organize_tasks_sharded(clickup_tasks, workers=None, shard_size=SHARD_SIZE, now_ms=None):
+    """
+    organize_tasks_by_employee + get_task_statistics on a process pool
+
+    Task dicts are pickled to the workers and back, which costs about as much
+    as organizing them, so this only pays off with several cores. When the
+    tasks come from a file, shard_tasks_to_files with iter_jsonl_shards
+    avoids that cost.
+
+    Args:
+        clickup_tasks (list): Raw ClickUp task dicts
+        workers (int): Worker processes; defaults to the CPU count
+        shard_size (int): Tasks per shard
+        now_ms (int): Reference time for overdue/due soon; defaults to now
+
+    Returns:
+        tuple: (tasks organized by employee, statistics), equal to the serial results
+    """
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    employee_tasks = {}
+    stats = StreamingStats(now_ms)
+    for result in map_shards(split_tasks(clickup_tasks, shard_size), now_ms, workers=workers):
+        for employee, tasks in result["tasks"].items():
+            employee_tasks.setdefault(employee, []).extend(tasks)
+        stats.add_counts(result["counts"])
+    return employee_tasks, stats.statistics()
+
+
+def shard_tasks_to_files(shards, tasks_filename="summary_clickup.json",
+                         stats_filename="clickup_statistics.json", timing_filename=None,
+                         workers=None, now_ms=None, aggregates_filename=None):
+    """
+    Organize, count and save pre-split shards on a process pool
+
+    Produces the same files as stream_tasks_to_files, and likewise leaves
+    existing files untouched if there are no tasks or a shard fails.
+
+    Args:
+        shards (iterable): Shards as accepted by the workers, e.g. from iter_jsonl_shards
+        tasks_filename (str): Where to write organized tasks
+        stats_filename (str): Where to write statistics
+        timing_filename (str): Where to write timing percentiles; skipped if None
+        workers (int): Worker processes; defaults to the CPU count
+        now_ms (int): Reference time for overdue/due soon; defaults to now
+        aggregates_filename (str): Where to write the dashboard's aggregate
+            tables (see task_aggregates.py); skipped if None
+
+    Returns:
+        dict: Statistics, as get_task_statistics returns them
+    """
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    writer = IncrementalTaskWriter(tasks_filename)
+    stats = StreamingStats(now_ms)
+    timing = TimingAnalytics() if timing_filename else None
+    aggregates = TaskAggregates() if aggregates_filename else None
+    committed = False
+    try:
+        for result in map_shards(shards, now_ms, as_fragments=True, with_timing=timing is not None,
+                                 workers=workers, with_aggregates=aggregates is not None):
+            for employee, (fragment, count) in result["tasks"].items():
+                writer.add_fragment(employee, fragment, count)
+            stats.add_counts(result["counts"])
+            if timing is not None:
+                timing.merge(TimingAnalytics.from_dict(result["timing"]))
+            if aggregates is not None:
+                aggregates.merge(TaskAggregates.from_dict(result["aggregates"]))
+        committed = writer.task_count > 0
+    finally:
+        writer.close(commit=committed)
+
+    statistics = stats.statistics()
+    if committed:
+        with open(stats_filename, "w", encoding="utf-8") as f:
+            json.dump(statistics, f, indent=2, ensure_ascii=False)
+        if timing is not None:
+            save_timing_statistics(timing.summary(), timing_filename)
+        if aggregates is not None:
+            aggregates.save(aggregates_filename)
+    return statistics
+
+
+def run_shard_benchmark(num_tasks, workers=None, shard_size=SHARD_SIZE):
+    """Time the serial and sharded paths on a synthetic JSONL export and check they agree"""
+    import filecmp
+    import tempfile
+
+    from fake_clickup_server import generate_workspace
+    from organize_tasks import get_task_statistics, save_organized_tasks, save_task_statistics
+
+    now_ms = int(time.time() * 1000)
+    print(f"🏗️ Generating {num_tasks} tasks...")
+    workspace = generate_workspace(num_tasks, num_members=50, now_ms=now_ms)
+    with tempfile.TemporaryDirectory() as directory:
+        export = os.path.join(directory, "tasks.jsonl")
+        with open(export, "w", encoding="utf-8") as f:
+            for task in workspace["tasks"].values():
+                f.write(json.dumps(task) + "\n")
+        del workspace
+
+        started = time.perf_counter()
+        with open(export, "rb") as f:
+            records, _ = decode_task_page(b"{\"tasks\":[" + b",".join(f.read().splitlines()) + b"]}")
+        organized = organize_tasks_by_employee(records)
+        save_organized_tasks(organized, os.path.join(directory, "serial.json"))
+        save_task_statistics(get_task_statistics(organized, now_ms), os.path.join(directory, "serial_stats.json"))
+        serial = time.perf_counter() - started
+        del records, organized
+
+        started = time.perf_counter()
+        shard_tasks_to_files(iter_jsonl_shards(export, shard_size), os.path.join(directory, "sharded.json"),
+                             os.path.join(directory, "sharded_stats.json"), workers=workers, now_ms=now_ms)
+        sharded = time.perf_counter() - started
+
+        same = (filecmp.cmp(os.path.join(directory, "serial.json"), os.path.join(directory, "sharded.json"), shallow=False)
+                and filecmp.cmp(os.path.join(directory, "serial_stats.json"),
+                                os.path.join(directory, "sharded_stats.json"), shallow=False))
+
+    print(f"\n⏱️ Shard benchmark ({num_tasks} tasks, {workers or os.cpu_count()} workers)")
+    print(f"  Serial:  {serial:.2f}s")
+    print(f"  Sharded: {sharded:.2f}s ({serial / max(sharded, 1e-9):.1f}x)")
+    print(f"  Output identical: {'✅' if same else '❌'}")
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Organize a ClickUp JSONL task export on a process pool")
+    parser.add_argument("export", nargs="?", help="JSONL file with one raw ClickUp task per line")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE, help="tasks per shard")
+    parser.add_argument("--bench", type=int, metavar="TASKS", help="benchmark serial vs sharded and exit")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_shard_benchmark(args.bench, args.workers, args.shard_size)
+    elif args.export:
+        stats = shard_tasks_to_files(iter_jsonl_shards(args.export, args.shard_size),
+                                     timing_filename="clickup_timing.json", workers=args.workers,
+                                     aggregates_filename="clickup_aggregates.json")
+        print(f"✅ Organized {stats['total_tasks']} tasks for {stats['total_employees']} employees")
+        print("✅ Organized tasks saved to summary_clickup.json")
+        print("✅ Task statistics saved to clickup_statistics.json")
+        print("✅ Aggregate tables saved to clickup_aggregates.json")
+    else:
+        parser.print_help()
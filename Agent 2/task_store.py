@@ -0,0 +1,162 @@
+"""
+Local ClickUp task store
+========================
+
+Keeps the organized tasks in memory keyed by task id so single-task changes
+(webhook events, optimistic edits) can be applied without refetching the
+workspace. Per-employee statistics are adjusted incrementally as tasks are
+inserted, changed or removed, and the store writes the same
+summary_clickup.json / clickup_statistics.json / clickup_aggregates.json
+files Agent 2 produces.
+"""
+
+import json
+import os
+import threading
+
+from due_index import DueDateIndex
+from organize_tasks import save_organized_tasks, save_task_statistics
+from stats_accumulator import StatsAccumulator
+from task_aggregates import TaskAggregates
+from task_graph import TaskGraph
+from task_index import TaskIndex
+
+
+class TaskStore:
+    """
+    In-memory task store with incrementally maintained per-employee statistics
+
+    Tasks are stored as the task info dicts produced by normalize_task, each
+    filed under one employee, mirroring summary_clickup.json. A TaskIndex over
+    all assignees, statuses, priorities, tags and creators is kept alongside
+    for lookups (``store.index.query(...)``), a DueDateIndex of open tasks
+    for overdue / due-soon queries and deadline alerts, and a TaskGraph of
+    subtasks and dependencies (``store.graph.blockers(task_id)``). The
+    dashboard's aggregate tables are kept in ``store.aggregates``.
+
+    If ``changelog`` is set to a ChangeLog, every change is also appended to
+    it as an insert, update or delete.
+    """
+
+    def __init__(self):
+        self.tasks = {}        # task id -> task info
+        self.employees = {}    # task id -> employee name
+        self.stats = StatsAccumulator()
+        self.index = TaskIndex()
+        self.due_index = DueDateIndex()
+        self.graph = TaskGraph()
+        self.aggregates = TaskAggregates()
+        self.changelog = None
+        self.lock = threading.RLock()
+
+    @classmethod
+    def from_employee_tasks(cls, employee_tasks, now_ms=None):
+        """Build a store from an organized tasks dict (employee -> list of tasks)"""
+        store = cls()
+        with store.graph.batch():
+            for employee, tasks in employee_tasks.items():
+                for task_info in tasks:
+                    store.upsert(employee, task_info, now_ms)
+        return store
+
+    @classmethod
+    def load(cls, filename="summary_clickup.json"):
+        """Load a store from a saved summary_clickup.json, or an empty store if it is missing"""
+        if not os.path.exists(filename):
+            return cls()
+        with open(filename, "r", encoding="utf-8") as f:
+            return cls.from_employee_tasks(json.load(f))
+
+    def get(self, task_id):
+        with self.lock:
+            return self.tasks.get(task_id)
+
+    def employee_of(self, task_id):
+        with self.lock:
+            return self.employees.get(task_id)
+
+    def upsert(self, employee, task_info, now_ms=None):
+        """
+        Insert or replace a task and adjust the statistics by the difference
+
+        Args:
+            employee (str): Employee the task is filed under
+            task_info (dict): Task record as produced by normalize_task
+            now_ms (int): Reference time for overdue/due-soon; defaults to now
+        """
+        task_id = task_info["id"]
+        with self.lock:
+            self.stats.update(task_id, employee, task_info, now_ms)
+            self.index.add(task_info, employee)
+            self.due_index.track(task_info)
+            self.graph.update(task_info, employee)
+            if task_id in self.tasks:
+                self.aggregates.remove(self.employees[task_id], self.tasks[task_id])
+            self.aggregates.add(employee, task_info)
+            if self.changelog is not None:
+                self.changelog.record(employee, task_info, now_ms)
+            self.tasks[task_id] = task_info
+            self.employees[task_id] = employee
+
+    def patch(self, task_id, changes, employee=None, now_ms=None):
+        """
+        Update some fields of a stored task, optionally moving it to another employee
+
+        Returns:
+            dict: The updated task info, or None if the task is unknown
+        """
+        with self.lock:
+            task_info = self.tasks.get(task_id)
+            if task_info is None:
+                return None
+            updated = dict(task_info, **changes)
+            self.upsert(employee or self.employees[task_id], updated, now_ms)
+            return updated
+
+    def remove(self, task_id):
+        """Remove a task; returns the removed task info or None"""
+        with self.lock:
+            task_info = self.tasks.get(task_id)
+            if task_info is None:
+                return None
+            self.stats.delete(task_id)
+            self.index.remove(task_id)
+            self.due_index.remove(task_id)
+            self.graph.remove(task_id)
+            self.aggregates.remove(self.employees[task_id], task_info)
+            if self.changelog is not None:
+                self.changelog.record_delete(task_id)
+            del self.tasks[task_id]
+            del self.employees[task_id]
+            return task_info
+
+    def apply_deadline_alert(self, kind, task_id, now_ms=None):
+        """Move a task into the due soon / overdue bucket when a DeadlineScheduler says it crossed"""
+        with self.lock:
+            self.stats.reclassify(task_id, overdue=kind == "overdue", due_soon=kind == "due_soon", now_ms=now_ms)
+
+    def employee_tasks(self):
+        """Tasks grouped by employee, in the shape organize_tasks_by_employee returns"""
+        with self.lock:
+            organized = {}
+            for task_id, task_info in self.tasks.items():
+                organized.setdefault(self.employees[task_id], []).append(task_info)
+            return organized
+
+    def statistics(self):
+        """Statistics in the shape get_task_statistics returns"""
+        with self.lock:
+            return self.stats.statistics()
+
+    def save(self, tasks_filename="summary_clickup.json", stats_filename="clickup_statistics.json",
+             checkpoint_filename=None, aggregates_filename=None):
+        """Write the organized tasks and statistics files, plus a statistics checkpoint and aggregates if asked"""
+        with self.lock:
+            employee_tasks = self.employee_tasks()
+            stats = self.statistics()
+            if checkpoint_filename:
+                self.stats.checkpoint(checkpoint_filename)
+            if aggregates_filename:
+                self.aggregates.save(aggregates_filename)
+        save_organized_tasks(employee_tasks, tasks_filename)
+        save_task_statistics(stats, stats_filename)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Task Timing Analytics
+=====================
+
+Lead time (created -> closed), cycle time (started -> closed) and estimate
+accuracy (time spent / time estimate) of closed tasks, per employee, per tag
+and per priority.
+
+Percentiles come from QuantileSketch, a DDSketch-style histogram with
+logarithmic buckets. Every quantile is within 1% relative error, memory is
+bounded by the number of buckets rather than the number of tasks, and two
+sketches merge by adding bucket counts. Analytics from separate pages,
+shards or runs therefore combine exactly as if they had seen all the tasks.
+
+Usage:
+    python task_timing.py   # analyze summary_clickup.json into clickup_timing.json
+"""
+
+import json
+import math
+import sys
+
+from organize_tasks import parse_clickup_timestamp
+
+HOUR_MS = 60 * 60 * 1000
+
+METRICS = ("lead_time", "cycle_time", "estimate_accuracy")
+DIMENSIONS = ("employee", "tag", "priority")
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy guarantees (DDSketch)
+
+    Positive values are counted in buckets whose bounds grow by a factor of
+    gamma = (1 + alpha) / (1 - alpha), so any quantile is returned within
+    ``relative_accuracy`` of the true value. Values below ``min_value``
+    (including zero and negatives) are counted as zero. If more than
+    ``max_buckets`` buckets are ever needed, the lowest ones are folded
+    together, which only affects the accuracy of the smallest quantiles.
+
+    Args:
+        relative_accuracy (float): alpha, e.g. 0.01 for 1%
+        max_buckets (int): Upper bound on the number of buckets kept
+    """
+
+    __slots__ = ("relative_accuracy", "max_buckets", "gamma", "log_gamma", "min_value",
+                 "buckets", "zero_count", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048, min_value=1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.buckets = {}  # bucket key -> count
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self):
+        return self.count
+
+    def add(self, value, weight=1):
+        """Count ``value`` ``weight`` times"""
+        if value < self.min_value:
+            self.zero_count += weight
+        else:
+            key = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + weight
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        self.count += weight
+        self.sum += value * weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self):
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        if excess <= 0:
+            return
+        folded = sum(self.buckets.pop(key) for key in keys[:excess])
+        self.buckets[keys[excess]] += folded
+
+    def merge(self, other):
+        """Add another sketch's counts to this one (both must use the same accuracy)"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Estimated ``q`` quantile (0 <= q <= 1), or None if the sketch is empty"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return max(self.min, 0)
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "buckets": {str(key): count for key, count in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch.buckets = {int(key): count for key, count in data["buckets"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+
+def task_timings(task_info):
+    """
+    Timing metrics of one task
+
+    Only closed tasks have a lead or cycle time; estimate accuracy needs both
+    a time estimate and tracked time.
+
+    Returns:
+        dict: metric -> value (ms for times, ratio for estimate accuracy);
+            empty for open tasks
+    """
+    closed = parse_clickup_timestamp(task_info.get("date_closed"))
+    if closed is None:
+        return {}
+    timings = {}
+    created = parse_clickup_timestamp(task_info.get("date_created"))
+    if created is not None:
+        timings["lead_time"] = closed - created
+    started = parse_clickup_timestamp(task_info.get("start_date"))
+    if started is not None:
+        timings["cycle_time"] = closed - started
+    estimate = task_info.get("time_estimate")
+    spent = task_info.get("time_spent")
+    if estimate and spent:
+        timings["estimate_accuracy"] = int(spent) / int(estimate)
+    return timings
+
+
+class TimingAnalytics:
+    """
+    QuantileSketches of every timing metric per employee, tag and priority
+
+    Example:
+        analytics = TimingAnalytics.from_employee_tasks(organized_tasks)
+        analytics.summary()["priority"]["urgent"]["lead_time_hours"]["p90"]
+    """
+
+    def __init__(self):
+        # dimension -> value -> metric -> QuantileSketch
+        self.sketches = {dimension: {} for dimension in DIMENSIONS}
+
+    @classmethod
+    def from_employee_tasks(cls, employee_tasks):
+        """Analyze an organized tasks dict (employee -> list of tasks)"""
+        analytics = cls()
+        analytics.add_page(employee_tasks)
+        return analytics
+
+    def add_page(self, employee_tasks):
+        for employee, tasks in employee_tasks.items():
+            for task_info in tasks:
+                self.add_task(task_info, employee)
+
+    def add_task(self, task_info, employee):
+        timings = task_timings(task_info)
+        if not timings:
+            return
+        groups = [("employee", employee), ("priority", task_info.get("priority") or "Normal")]
+        groups.extend(("tag", tag) for tag in task_info.get("tags") or ())
+        for dimension, value in groups:
+            metrics = self.sketches[dimension].get(value)
+            if metrics is None:
+                metrics = self.sketches[dimension][value] = {}
+            for metric, measurement in timings.items():
+                sketch = metrics.get(metric)
+                if sketch is None:
+                    sketch = metrics[metric] = QuantileSketch()
+                sketch.add(measurement)
+
+    def merge(self, other):
+        """Fold another TimingAnalytics (e.g. from another shard) into this one"""
+        for dimension, values in other.sketches.items():
+            for value, metrics in values.items():
+                mine = self.sketches[dimension].setdefault(value, {})
+                for metric, sketch in metrics.items():
+                    if metric in mine:
+                        mine[metric].merge(sketch)
+                    else:
+                        mine[metric] = QuantileSketch.from_dict(sketch.to_dict())
+        return self
+
+    def summary(self):
+        """
+        Percentiles per dimension and value
+
+        Returns:
+            dict: dimension -> value -> {lead_time_hours, cycle_time_hours,
+                estimate_accuracy} -> {count, mean, p50, p90, p99}
+        """
+        summary = {}
+        for dimension, values in self.sketches.items():
+            summary[dimension] = {}
+            for value, metrics in values.items():
+                summary[dimension][value] = {
+                    _metric_label(metric): _describe(sketch, HOUR_MS if metric != "estimate_accuracy" else 1)
+                    for metric, sketch in metrics.items()
+                }
+        return summary
+
+    def to_dict(self):
+        return {
+            dimension: {
+                value: {metric: sketch.to_dict() for metric, sketch in metrics.items()}
+                for value, metrics in values.items()
+            }
+            for dimension, values in self.sketches.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        analytics = cls()
+        for dimension, values in data.items():
+            analytics.sketches[dimension] = {
+                value: {metric: QuantileSketch.from_dict(sketch) for metric, sketch in metrics.items()}
+                for value, metrics in values.items()
+            }
+        return analytics
+
+
+def _metric_label(metric):
+    return f"{metric}_hours" if metric != "estimate_accuracy" else metric
+
+
+def _describe(sketch, unit):
+    description = {"count": sketch.count, "mean": round(sketch.mean / unit, 2)}
+    for label, q in QUANTILES.items():
+        description[label] = round(sketch.quantile(q) / unit, 2)
+    return description
+
+
+def get_timing_statistics(employee_tasks):
+    """Lead time, cycle time and estimate accuracy percentiles for organized tasks"""
+    return TimingAnalytics.from_employee_tasks(employee_tasks).summary()
+
+
+def save_timing_statistics(timing_stats, filename="clickup_timing.json"):
+    """
+    Save timing statistics to JSON file
+
+    Args:
+        timing_stats (dict): Summary from get_timing_statistics / TimingAnalytics.summary
+        filename (str): Output filename
+    """
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(timing_stats, f, indent=2, ensure_ascii=False)
+    print(f"✅ Timing statistics saved to {filename}")
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    tasks_file = sys.argv[1] if len(sys.argv) > 1 else "summary_clickup.json"
+    with open(tasks_file, "r", encoding="utf-8") as f:
+        employee_tasks = json.load(f)
+
+    timing_stats = get_timing_statistics(employee_tasks)
+    for employee, metrics in timing_stats["employee"].items():
+        lead = metrics.get("lead_time_hours")
+        if lead:
+            print(f"  👤 {employee}: lead time p50 {lead['p50']}h, p90 {lead['p90']}h ({lead['count']} closed tasks)")
+    save_timing_statistics(timing_stats)
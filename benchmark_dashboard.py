@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Dashboard Benchmark
+===================
+
+Drives dashboard.py headlessly with Streamlit's AppTest on synthetic agent
+outputs and records, for every workspace size and interaction:
+
+    latency_ms    median wall time of the rerun
+    peak_rss_mb   peak growth of the process RSS during the rerun
+    elements      number of elements the rerun rendered
+    payload_kb    serialized size of those elements (what goes to the browser)
+
+Interactions: cold initial load (caches cleared), warm initial load (a new
+session on cached data), plain rerun, filter change and status update. The
+status update goes through the fake ClickUp API (Agent 2/fake_clickup_server.py),
+so no real workspace is touched.
+
+Synthetic Agent 1, 2 and 3 outputs are generated once per size from fixed
+seeds and a fixed reference date, and kept in the data directory, so every
+commit is measured on identical inputs. Results are appended to a JSON lines
+file together with the commit they were measured at.
+
+Usage:
+    python benchmark_dashboard.py                          # 1k, 10k and 100k tasks
+    python benchmark_dashboard.py --sizes 1000 1000000     # up to 1M (needs several GB of RAM)
+    python benchmark_dashboard.py --compare HEAD~1         # compare with results recorded at another commit
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENT2_DIR = os.path.join(REPO_DIR, 'Agent 2')
+# Agent 2 modules ahead of the older copies in the repo root, as in dashboard.py
+sys.path.insert(0, AGENT2_DIR)
+sys.path.insert(1, REPO_DIR)
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import fetch_clickup
+from fake_clickup_server import FakeClickUpServer, generate_workspace
+from task_pipeline import stream_tasks_to_files
+
+SIZES = (1_000, 10_000, 100_000)
+DATA_DIR = os.path.join(tempfile.gettempdir(), "dashboard_benchmark")
+DATA_VERSION = 1
+
+# Generated dates are relative to this time (2025-01-01 UTC), not to now
+REFERENCE_MS = 1_735_689_600_000
+
+NUM_MEMBERS = 20
+PAGE_SIZE = 100
+# Tasks generated at a time, to bound the generator's memory
+GENERATE_CHUNK = 50_000
+
+INTERACTIONS = ("initial load (cold)", "initial load (warm)", "rerun", "filter change", "status update")
+
+API_TOKEN = "pk_benchmark"
+RUN_TIMEOUT = 600
+
+
+# ---------------- Synthetic agent outputs ----------------
+
+def _clickup_pages(num_tasks):
+    for first_task in range(0, num_tasks, GENERATE_CHUNK):
+        workspace = generate_workspace(min(GENERATE_CHUNK, num_tasks - first_task), NUM_MEMBERS,
+                                       seed=first_task, now_ms=REFERENCE_MS, first_task=first_task)
+        tasks = list(workspace["tasks"].values())
+        for start in range(0, len(tasks), PAGE_SIZE):
+            yield tasks[start:start + PAGE_SIZE]
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def generate_outputs(directory, num_tasks):
+    """
+    Write Agent 1, 2 and 3 outputs for ``num_tasks`` ClickUp tasks under ``directory``
+
+    Agent 1 gets one Discord task per ClickUp task and a message for every
+    ten; Agent 3 gets one sentence per hundred tasks.
+    """
+    for agent in ("Agent 1", "Agent 2", "Agent 3"):
+        os.makedirs(os.path.join(directory, agent), exist_ok=True)
+
+    agent2 = os.path.join(directory, "Agent 2")
+    stream_tasks_to_files(
+        _clickup_pages(num_tasks),
+        os.path.join(agent2, "summary_clickup.json"),
+        os.path.join(agent2, "clickup_statistics.json"),
+        now_ms=REFERENCE_MS,
+        timing_filename=os.path.join(agent2, "clickup_timing.json"),
+        aggregates_filename=os.path.join(agent2, "clickup_aggregates.json")
+    )
+
+    day = pd.Timestamp(REFERENCE_MS, unit="ms")
+    discord_tasks = []
+    for i in range(num_tasks):
+        deadline = day - pd.Timedelta(days=i % 180)
+        completed = i % 3 != 0
+        discord_tasks.append({
+            "description": f"Discord task {i + 1}",
+            "status": "completed" if completed else "not completed",
+            "deadline": f"{deadline:%Y-%m-%d}",
+            "completed_date": f"{deadline - pd.Timedelta(days=i % 2):%Y-%m-%d}" if completed else ""
+        })
+    _write_json(os.path.join(directory, "Agent 1", "summary.json"), discord_tasks)
+    _write_json(os.path.join(directory, "Agent 1", "discord_messages.json"), [
+        {
+            "username": f"member_{i % NUM_MEMBERS:03d}",
+            "content": f"Update on Discord task {i * 10 + 1}",
+            "timestamp": (day - pd.Timedelta(minutes=i)).isoformat()
+        }
+        for i in range(max(1, num_tasks // 10))
+    ])
+
+    sentences = max(1, num_tasks // 100)
+    _write_json(os.path.join(directory, "Agent 3", "summary.json"), {
+        "Work completed": [f"Discord task {i + 1} was completed." for i in range(sentences // 2)],
+        "Work not completed": [f"Discord task {i + 1} is not completed." for i in range(sentences // 4)],
+        "Tasks completed on time": [f"Discord task {i + 1} was on time." for i in range(sentences // 8)],
+        "Missed deadlines": [f"Discord task {i + 1} missed its deadline." for i in range(sentences // 8)]
+    })
+
+
+def prepare_outputs(data_dir, num_tasks):
+    """Directory with the synthetic outputs for ``num_tasks`` tasks, generated on first use"""
+    directory = os.path.join(data_dir, f"tasks_{num_tasks}")
+    marker = os.path.join(directory, "benchmark.json")
+    if os.path.exists(marker):
+        with open(marker, "r", encoding="utf-8") as f:
+            if json.load(f).get("version") == DATA_VERSION:
+                return directory
+    shutil.rmtree(directory, ignore_errors=True)
+    print(f"🏗️ Generating outputs for {num_tasks:,} tasks in {directory}...")
+    started = time.perf_counter()
+    generate_outputs(directory, num_tasks)
+    _write_json(marker, {"version": DATA_VERSION, "tasks": num_tasks})
+    print(f"  done in {time.perf_counter() - started:.1f}s")
+    return directory
+
+
+# ---------------- Measuring ----------------
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class PeakMemory:
+    """Samples the process RSS in a background thread; ``peak`` is the growth over the start"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+        self.stopping = threading.Event()
+
+    def _sample(self):
+        while not self.stopping.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes() - self.start)
+
+    def __enter__(self):
+        self.start = _rss_bytes()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopping.set()
+        self.thread.join()
+        self.peak = max(self.peak, _rss_bytes() - self.start)
+
+
+def rendered_elements(app):
+    """(element count, serialized size in bytes) of what the last run rendered"""
+    count = size = 0
+    stack = [app._tree]
+    while stack:
+        node = stack.pop()
+        children = getattr(node, "children", None)
+        if children is not None:
+            stack.extend(children.values())
+            continue
+        count += 1
+        proto = getattr(node, "proto", None)
+        if proto is not None:
+            size += proto.ByteSize()
+    return count, size
+
+
+def measure(action):
+    """Run ``action`` (which returns the AppTest it ran) and measure it"""
+    with PeakMemory() as memory:
+        started = time.perf_counter()
+        app = action()
+        latency = time.perf_counter() - started
+    elements, payload = rendered_elements(app)
+    return {
+        "latency_ms": latency * 1000,
+        "peak_rss_mb": memory.peak / 2**20,
+        "elements": elements,
+        "payload_kb": payload / 1024,
+        "errors": len(app.exception),
+    }, app
+
+
+def _widget(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No widget labelled {label!r}; the dashboard layout changed")
+
+
+def _task_table_key(app):
+    """Widget key of the ClickUp task table as currently rendered"""
+    for key in app.session_state.keys():
+        if key.startswith("clickup_task_table"):
+            return key
+    raise LookupError("No ClickUp task table; the dashboard layout changed")
+
+
+def _touch(directory):
+    """Mark the Agent 2 files as just written, so the dashboard does not revalidate them"""
+    for name in os.listdir(directory):
+        os.utime(os.path.join(directory, name))
+
+
+def benchmark_size(data_dir, num_tasks, repeat):
+    """Measure every interaction on ``num_tasks`` tasks; returns one result dict per interaction"""
+    source = prepare_outputs(data_dir, num_tasks)
+    workdir = tempfile.mkdtemp(prefix="dashboard_benchmark_run_")
+    # The status update writes to the files, so each run works on a copy
+    for agent in ("Agent 1", "Agent 2", "Agent 3"):
+        shutil.copytree(os.path.join(source, agent), os.path.join(workdir, agent))
+    agent2 = os.path.join(workdir, "Agent 2")
+
+    # Only the first tasks are served: the status update changes the first listed task
+    server = FakeClickUpServer(generate_workspace(min(PAGE_SIZE, num_tasks), NUM_MEMBERS, seed=0,
+                                                  now_ms=REFERENCE_MS)).start()
+    fetch_clickup.CLICKUP_API_BASE = server.base_url
+    config = {"api_token": API_TOKEN, "team_id": server.workspace["team"]["id"],
+              "space_id": server.workspace["space"]["id"], "list_id": server.workspace["lists"][0]["id"]}
+
+    script = os.path.join(REPO_DIR, "dashboard.py")
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    samples = {interaction: [] for interaction in INTERACTIONS}
+    try:
+        for _ in range(repeat):
+            st.cache_resource.clear()
+            st.cache_data.clear()
+            _touch(agent2)
+            result, app = measure(lambda: AppTest.from_file(script, default_timeout=RUN_TIMEOUT).run())
+            samples["initial load (cold)"].append(result)
+
+            result, app = measure(lambda: AppTest.from_file(script, default_timeout=RUN_TIMEOUT).run())
+            samples["initial load (warm)"].append(result)
+
+            result, app = measure(lambda: app.run())
+            samples["rerun"].append(result)
+
+            status_filter = _widget(app.selectbox, "Filter by Status")
+            status_filter.select(status_filter.options[1 % len(status_filter.options)])
+            result, app = measure(lambda: app.run())
+            samples["filter change"].append(result)
+
+            # The config is only present for the update, so loads never start a background refresh
+            with open(os.path.join(agent2, "config.json"), "w", encoding="utf-8") as f:
+                json.dump(config, f)
+            _touch(agent2)
+            try:
+                # Select the first task of the unfiltered table, then update it
+                _widget(app.selectbox, "Filter by Status").select("All")
+                app.run()
+                app.session_state[_task_table_key(app)] = {"selection": {"rows": [0], "columns": []}}
+                app.run()
+                _widget(app.selectbox, "New Status").select("complete")
+                _widget(app.button, "📝 Update Status").click()
+                result, app = measure(lambda: app.run())
+                samples["status update"].append(result)
+            finally:
+                os.remove(os.path.join(agent2, "config.json"))
+                _cancel_reconcile()
+    finally:
+        os.chdir(previous_dir)
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return [_summarize(num_tasks, interaction, runs) for interaction, runs in samples.items()]
+
+
+def _cancel_reconcile():
+    """Cancel the reconcile refresh a status update schedules, so it does not run into the next measurement"""
+    from dashboard_data import get_clickup_refresher
+    refresher = get_clickup_refresher()
+    if refresher.timer is not None:
+        refresher.timer.cancel()
+    if refresher.thread is not None:
+        refresher.thread.join()
+
+
+def _summarize(num_tasks, interaction, runs):
+    latencies = [run["latency_ms"] for run in runs]
+    return {
+        "tasks": num_tasks,
+        "interaction": interaction,
+        "latency_ms": round(statistics.median(latencies), 1),
+        "latency_ms_runs": [round(latency, 1) for latency in latencies],
+        "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+        "elements": runs[-1]["elements"],
+        "payload_kb": round(runs[-1]["payload_kb"], 1),
+        "errors": max(run["errors"] for run in runs),
+    }
+
+
+# ---------------- Results ----------------
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=REPO_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def current_commit():
+    """Short hash of HEAD, with "-dirty" if the working tree has changes to tracked files"""
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    if _git("status", "--porcelain", "--untracked-files=no"):
+        commit += "-dirty"
+    return commit
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "streamlit": st.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_results(filename):
+    if not os.path.exists(filename):
+        return []
+    with open(filename, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline_for(results, revision, exclude_recorded_at=None):
+    """Latest recorded result per (tasks, interaction) measured at ``revision``, other than the current run"""
+    commit = _git("rev-parse", "--short", revision) or revision
+    baseline = {}
+    for result in results:
+        if result["commit"].split("-")[0] == commit and result.get("recorded_at_ms") != exclude_recorded_at:
+            baseline[(result["tasks"], result["interaction"])] = result
+    return commit, baseline
+
+
+def print_results(results, baseline=None):
+    header = f"{'tasks':>9}  {'interaction':<20} {'latency ms':>11} {'peak MB':>9} {'elements':>9} {'payload KB':>11}"
+    if baseline is not None:
+        header += f"  {'vs baseline':>12}"
+    print(header)
+    for result in results:
+        line = (f"{result['tasks']:>9,}  {result['interaction']:<20} {result['latency_ms']:>11,.1f} "
+                f"{result['peak_rss_mb']:>9,.1f} {result['elements']:>9,} {result['payload_kb']:>11,.1f}")
+        if baseline is not None:
+            before = baseline.get((result["tasks"], result["interaction"]))
+            if before and before["latency_ms"]:
+                line += f"  {(result['latency_ms'] / before['latency_ms'] - 1) * 100:>+11.0f}%"
+            else:
+                line += f"  {'-':>12}"
+        if result["errors"]:
+            line += f"  ⚠️ {result['errors']} exception(s)"
+        print(line)
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dashboard.py reruns on synthetic agent outputs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="numbers of ClickUp tasks")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per interaction (the median is reported)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="where synthetic outputs are kept between runs")
+    parser.add_argument("--results", default=None, help="results file (default: results.jsonl in the data dir)")
+    parser.add_argument("--compare", metavar="REVISION", help="show latency changes against this commit's results")
+    args = parser.parse_args()
+
+    results_filename = args.results or os.path.join(args.data_dir, "results.jsonl")
+    os.makedirs(args.data_dir, exist_ok=True)
+    commit = current_commit()
+    print(f"⏱️ Benchmarking dashboard.py at {commit}, sizes {', '.join(f'{size:,}' for size in args.sizes)}")
+
+    recorded_at = int(time.time() * 1000)
+    results = []
+    for size in args.sizes:
+        size_results = benchmark_size(args.data_dir, size, args.repeat)
+        results.extend(size_results)
+        with open(results_filename, "a", encoding="utf-8") as f:
+            for result in size_results:
+                f.write(json.dumps(dict(result, commit=commit, recorded_at_ms=recorded_at,
+                                        environment=environment()), ensure_ascii=False) + "\n")
+
+    baseline = None
+    if args.compare:
+        baseline_commit, baseline = baseline_for(load_results(results_filename), args.compare, recorded_at)
+        if not baseline:
+            print(f"⚠️ No results recorded for {baseline_commit}; run the benchmark there first")
+    print()
+    print_results(results, baseline)
+    print(f"\n📁 Results appended to {results_filename}")
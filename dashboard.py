@@ -6,17 +6,38 @@ import plotly.express as px
 import plotly.graph_objects as go
 import sys
 import os
-
-# Add Agent 2 directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), 'Agent 2'))
+import time
+
+# Add Agent 2 directory to path for imports (ahead of the older copies in the repo root)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'Agent 2'))
+
+from dashboard_data import (
+    AGENT1_TASKS_FILE,
+    CLICKUP_HISTORY_FILE,
+    ClickUpData,
+    clickup_signature,
+    file_signature,
+    get_clickup_refresher,
+    load_clickup_aggregates,
+    load_clickup_data,
+    load_discord_query,
+    load_discord_tasks,
+    load_search_index,
+    load_text_summary
+)
+from dashboard_queries import timeline_buckets
+from organize_tasks import COMPLETED_STATUSES
+from search_index import MESSAGE, TASK
+from stats_history import DAY_MS, HOUR_MS, TEAM, StatsHistory
+from task_aggregates import TaskAggregates
 
 # Import ClickUp functions
 try:
     from fetch_clickup import (
-        fetch_tasks_from_clickup, 
         create_task_in_clickup, 
         update_task_in_clickup, 
         delete_task_in_clickup,
+        bulk_mutate_tasks,
         get_team_members,
         get_team_info,
         get_spaces_from_team,
@@ -29,54 +50,43 @@ except ImportError as e:
     CLICKUP_AVAILABLE = False
 
 # --- Load and parse data ---
+# Parsed files are cached by (path, mtime, size); see dashboard_data.py
 try:
-    with open("Agent 1/summary.json") as f1:
-        raw_tasks = json.load(f1)
-    summary_df = pd.DataFrame(raw_tasks)
+    summary_df = load_discord_tasks()
+    discord_version = file_signature(AGENT1_TASKS_FILE)
     st.success(f"✅ Agent 1: Loaded {len(summary_df)} tasks")
 except FileNotFoundError:
     st.warning("⚠️ Agent 1 data not found. Using sample data.")
     summary_df = pd.DataFrame([])
+    discord_version = None
 except Exception as e:
     st.error(f"❌ Agent 1 error: {str(e)}")
     summary_df = pd.DataFrame([])
+    discord_version = None
 
 try:
-    with open("Agent 2/summary_clickup.json") as f2:
-        clickup_tasks = json.load(f2)
-    
-    with open("Agent 2/clickup_statistics.json") as f2_stats:
-        clickup_stats = json.load(f2_stats)
-    
-    # Convert ClickUp data to DataFrame
-    clickup_data = []
-    for employee, tasks in clickup_tasks.items():
-        for task in tasks:
-            task['employee'] = employee
-            clickup_data.append(task)
-    
-    clickup_df = pd.DataFrame(clickup_data)
-    
-    # Convert ClickUp dates
-    if not clickup_df.empty:
-        clickup_df["date_created"] = pd.to_datetime(clickup_df["date_created"], unit='ms', errors="coerce")
-        clickup_df["date_updated"] = pd.to_datetime(clickup_df["date_updated"], unit='ms', errors="coerce")
-        clickup_df["due_date"] = pd.to_datetime(clickup_df["due_date"], errors="coerce")
-        clickup_df["date_closed"] = pd.to_datetime(clickup_df["date_closed"], unit='ms', errors="coerce")
-    
-    st.success(f"✅ Agent 2: Loaded {len(clickup_df)} ClickUp tasks")
+    clickup_data = load_clickup_data()
+    st.success(f"✅ Agent 2: Loaded {len(clickup_data.df)} ClickUp tasks")
 except FileNotFoundError:
     st.warning("⚠️ Agent 2 ClickUp data not found. Using sample data.")
-    clickup_df = pd.DataFrame([])
-    clickup_stats = {"total_employees": 0, "total_tasks": 0, "employee_stats": {}}
+    clickup_data = ClickUpData.empty()
 except Exception as e:
     st.error(f"❌ Agent 2 error: {str(e)}")
-    clickup_df = pd.DataFrame([])
-    clickup_stats = {"total_employees": 0, "total_tasks": 0, "employee_stats": {}}
+    clickup_data = ClickUpData.empty()
+
+clickup_df = clickup_data.df
+clickup_stats = clickup_data.stats
+clickup_index = clickup_data.index
 
+# Headline metrics and summary charts are read from Agent 2's aggregate tables
 try:
-    with open("Agent 3/summary.json") as f3:  
-        text_summary = json.load(f3)
+    clickup_aggregates = load_clickup_aggregates()
+except (FileNotFoundError, ValueError):
+    clickup_aggregates = TaskAggregates()
+clickup_total = clickup_aggregates.total_tasks()
+
+try:
+    text_summary = load_text_summary()
     st.success(f"✅ Agent 3: Loaded analysis data with {len(text_summary)} categories")
 except FileNotFoundError:
     st.warning("⚠️ Agent 3 data not found. Using sample data.")
@@ -85,11 +95,14 @@ except Exception as e:
     st.error(f"❌ Agent 3 error: {str(e)}")
     text_summary = {"Work completed": [], "Work not completed": [], "Tasks completed on time": [], "Missed deadlines": []}
 
-
-# Convert dates
-if not summary_df.empty:
-    summary_df["deadline"] = pd.to_datetime(summary_df["deadline"], errors="coerce")
-    summary_df["completed_date"] = pd.to_datetime(summary_df["completed_date"], errors="coerce")
+TASK_PAGE_SIZES = [25, 50, 100, 250]
+# How often each session checks whether a background refresh has finished
+REFRESH_POLL_SECONDS = 5
+# Timelines with more tasks than this are drawn as active tasks per time bucket
+TIMELINE_TASK_LIMIT = 500
+TIMELINE_MAX_BUCKETS = 200
+# Versions of each view's charts and frames kept (current one plus the previous)
+MAX_CACHED_VIEWS = 2
 
 # --- ClickUp Task Management Functions ---
 def load_clickup_config():
@@ -105,57 +118,38 @@ def load_clickup_config():
         print(f"❌ Error loading ClickUp config: {e}")
         return None
 
-@st.cache_data(ttl=60)  # Cache for 60 seconds
-def refresh_clickup_data():
-    """Refresh ClickUp data by fetching from API"""
+def request_clickup_refresh(force=False):
+    """
+    Revalidate the ClickUp snapshot in the background
+    
+    Only one refresh runs at a time across all sessions; the dashboard keeps
+    showing the current snapshot until the new files are written. Without
+    ``force`` nothing happens unless the snapshot is stale.
+    
+    Returns:
+        bool: True if a refresh was started
+    """
     if not CLICKUP_AVAILABLE:
-        return None, None
+        return False
     
     config = load_clickup_config()
     if not config or not config.get("list_id"):
-        return None, None
+        return False
     
-    try:
-        # Fetch fresh data from ClickUp
-        tasks = fetch_tasks_from_clickup(
-            api_token=config["api_token"],
-            list_id=config["list_id"]
-        )
-        
-        if not tasks:
-            return None, None
-        
-        # Organize tasks by employee
-        from organize_tasks import organize_tasks_by_employee, get_task_statistics, save_organized_tasks, save_task_statistics
-        
-        organized_tasks = organize_tasks_by_employee(tasks)
-        stats = get_task_statistics(organized_tasks)
-        
-        # Save updated data
-        save_organized_tasks(organized_tasks, "Agent 2/summary_clickup.json")
-        save_task_statistics(stats, "Agent 2/clickup_statistics.json")
-        
-        # Convert to DataFrame
-        clickup_data = []
-        for employee, emp_tasks in organized_tasks.items():
-            for task in emp_tasks:
-                task['employee'] = employee
-                clickup_data.append(task)
-        
-        clickup_df = pd.DataFrame(clickup_data)
-        
-        # Convert dates
-        if not clickup_df.empty:
-            clickup_df["date_created"] = pd.to_datetime(clickup_df["date_created"], unit='ms', errors="coerce")
-            clickup_df["date_updated"] = pd.to_datetime(clickup_df["date_updated"], unit='ms', errors="coerce")
-            clickup_df["due_date"] = pd.to_datetime(clickup_df["due_date"], errors="coerce")
-            clickup_df["date_closed"] = pd.to_datetime(clickup_df["date_closed"], unit='ms', errors="coerce")
-        
-        return clickup_df, stats
-        
-    except Exception as e:
-        st.error(f"❌ Error refreshing ClickUp data: {e}")
-        return None, None
+    return get_clickup_refresher().request(config, force=force)
+
+def apply_task_changes(raw_tasks, config):
+    """
+    Patch tasks returned by the ClickUp API into the loaded snapshot
+    
+    Every session sees the change on its next rerun without a refetch. One
+    background refresh, debounced across consecutive edits, reconciles the
+    snapshot with ClickUp afterwards.
+    """
+    for raw_task in raw_tasks:
+        if isinstance(raw_task, dict) and raw_task.get("id"):
+            clickup_data.apply_task(raw_task, aggregates=clickup_aggregates)
+    get_clickup_refresher().schedule(config)
 
 def create_new_task(task_name, description, assignee, priority, due_date, status):
     """Create a new task in ClickUp"""
@@ -216,8 +210,7 @@ def create_new_task(task_name, description, assignee, priority, due_date, status
         
         if result:
             st.success(f"✅ Task '{task_name}' created successfully!")
-            # Clear cache to force refresh
-            refresh_clickup_data.clear()
+            apply_task_changes([result], config)
             return True
         else:
             st.error("❌ Failed to create task. Check your ClickUp API token and permissions.")
@@ -254,13 +247,174 @@ def update_task_status(task_id, new_status):
             task_data=task_data
         )
         if result is not None:
-            # Clear cache to force refresh
-            refresh_clickup_data.clear()
+            apply_task_changes([result], config)
         return result is not None
     except Exception as e:
         st.error(f"❌ Error updating task: {e}")
         return False
 
+def update_task_statuses(task_ids, new_status):
+    """Update the status of several ClickUp tasks in one batch"""
+    if not CLICKUP_AVAILABLE:
+        return []
+    
+    config = load_clickup_config()
+    if not config:
+        return []
+    
+    operations = [
+        {"action": "update", "task_id": task_id, "task_data": {"status": new_status}}
+        for task_id in task_ids
+    ]
+    
+    try:
+        results = bulk_mutate_tasks(api_token=config["api_token"], operations=operations)
+        if any(result["ok"] for result in results):
+            apply_task_changes([result["task"] for result in results if result["ok"]], config)
+        return results
+    except Exception as e:
+        st.error(f"❌ Error updating tasks: {e}")
+        return []
+
+
+
+# --- Cached view builders ---
+# Each view's charts and frames are built once per version of its data and
+# shared by every session; arguments starting with "_" are not hashed, the
+# version argument identifies the data instead. Cached figures are only read
+# (st.plotly_chart serializes a copy).
+
+@st.cache_resource(max_entries=MAX_CACHED_VIEWS, show_spinner=False)
+def clickup_overview(aggregates_version, _aggregates):
+    """ClickUp tab charts: (status pie, employee bar, status x priority table or None)"""
+    status_fig = px.pie(pd.DataFrame(_aggregates.rows('status_counts')), names='status', values='count',
+                        title="Task Status Distribution")
+    emp_fig = px.bar(pd.DataFrame(_aggregates.rows('employee_counts')), 
+                     x='employee', y='count', 
+                     title="Tasks by Employee")
+    status_counts = pd.DataFrame(_aggregates.rows('status_priority_counts'))
+    status_table = None
+    if not status_counts.empty:
+        status_table = status_counts.pivot_table(index='status', columns='priority', values='count',
+                                                 aggfunc='sum', fill_value=0, margins=True,
+                                                 margins_name='Total')
+    return status_fig, emp_fig, status_table
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VIEWS, show_spinner=False)
+def created_per_day_chart(aggregates_version, _aggregates):
+    """Tasks created per day by status, or None before any task has a creation date"""
+    created_days = pd.DataFrame(_aggregates.rows('created_days'))
+    if created_days.empty:
+        return None
+    created_days["day"] = pd.to_datetime(created_days["day_ms"], unit="ms")
+    return px.bar(created_days.sort_values("day"), x="day", y="count", color="status",
+                  title="Tasks Created per Day")
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VIEWS, show_spinner=False)
+def discord_overview(discord_version, _summary_df):
+    """Discord tab: (status pie or None, completed tasks, incomplete tasks)"""
+    status_fig = None
+    if 'status' in _summary_df.columns:
+        status_fig = px.pie(load_discord_query().value_counts('status'), names='status', values='count',
+                            title="Discord Task Status Distribution")
+    completed_tasks = _summary_df[_summary_df.status == "completed"]
+    incomplete_tasks = _summary_df[_summary_df.status == "not completed"]
+    return status_fig, completed_tasks, incomplete_tasks
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VIEWS, show_spinner=False)
+def clickup_timeline_frame(data_version, _clickup_df):
+    """Task, Start, End, status and employee of the ClickUp tasks with a creation date"""
+    return pd.DataFrame({
+        "Task": _clickup_df["name"],
+        "Start": _clickup_df["date_created"],
+        "End": _clickup_df["due_date"].fillna(_clickup_df["date_updated"]),
+        "status": _clickup_df["status"],
+        "employee": _clickup_df["employee"],
+    }).dropna(subset=['Start'])
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VIEWS, show_spinner=False)
+def discord_timeline_frame(discord_version, _summary_df):
+    """Task, Start, End and status of the Discord tasks"""
+    return pd.DataFrame({
+        "Task": _summary_df["description"],
+        "Start": _summary_df["completed_date"].fillna(_summary_df["deadline"]),
+        "End": _summary_df["deadline"],
+        "status": _summary_df["status"],
+    })
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VIEWS * 3, show_spinner=False)
+def task_timeline_chart(key, version, title, _timeline_df):
+    """One bar per task"""
+    fig = px.timeline(_timeline_df, x_start="Start", x_end="End", y="Task", color="status", title=title)
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VIEWS * 3, show_spinner=False)
+def bucketed_timeline_chart(key, version, title, lane, _timeline_df):
+    """Active tasks per time bucket, one WebGL line per swimlane"""
+    buckets, bucket_size = timeline_buckets(_timeline_df["Start"], _timeline_df["End"], _timeline_df[lane],
+                                            TIMELINE_MAX_BUCKETS)
+    fig = go.Figure([
+        go.Scattergl(x=lane_buckets["bucket"], y=lane_buckets["tasks"], mode="lines", name=str(lane_name))
+        for lane_name, lane_buckets in buckets.groupby("lane", sort=False)
+    ])
+    fig.update_layout(title=f"{title} ({len(_timeline_df)} tasks, active per {bucket_size} by {lane})",
+                      xaxis_title="Time", yaxis_title="Active tasks")
+    return fig
+
+
+def draw_task_timeline(timeline_df, title, key, version, lanes=("status",)):
+    """
+    Timeline of tasks (Task, Start, End and lane columns)
+    
+    Up to TIMELINE_TASK_LIMIT tasks get one bar each. Larger timelines show
+    the number of active tasks per time bucket and swimlane as WebGL lines,
+    plus a drill-down to the individual tasks of a chosen date range, so the
+    figure stays the same size however many tasks there are. ``version``
+    identifies the data behind ``timeline_df`` for the cached charts.
+    """
+    if len(timeline_df) <= TIMELINE_TASK_LIMIT:
+        st.plotly_chart(task_timeline_chart(key, version, title, timeline_df), use_container_width=True)
+        return
+    
+    timeline_df = timeline_df.dropna(subset=["Start"])
+    if timeline_df.empty:
+        return
+    lane = st.selectbox("Swimlanes", list(lanes), key=f"{key}_lanes") if len(lanes) > 1 else lanes[0]
+    st.plotly_chart(bucketed_timeline_chart(key, version, title, lane, timeline_df), use_container_width=True)
+    
+    # Drill down to the tasks active in a range
+    earliest = timeline_df["Start"].min().to_pydatetime()
+    latest = timeline_df["End"].fillna(timeline_df["Start"]).max().to_pydatetime()
+    if latest <= earliest:
+        latest = earliest + timedelta(days=1)
+    range_start, range_end = st.slider(
+        "Show tasks active between",
+        min_value=earliest,
+        max_value=latest,
+        value=(max(earliest, latest - timedelta(days=7)), latest),
+        key=f"{key}_range"
+    )
+    ends = timeline_df["End"].fillna(timeline_df["Start"])
+    in_range = timeline_df[(timeline_df["Start"] <= range_end) & (ends >= range_start)]
+    if in_range.empty:
+        st.info("No tasks active in this range.")
+        return
+    if len(in_range) > TIMELINE_TASK_LIMIT:
+        st.caption(f"Showing the {TIMELINE_TASK_LIMIT} latest-starting of {len(in_range)} tasks in this range; "
+                   f"narrow the range to see the rest.")
+        in_range = in_range.nlargest(TIMELINE_TASK_LIMIT, "Start")
+    fig = px.timeline(in_range, x_start="Start", x_end="End", y="Task", color="status",
+                      title=f"{title}: {range_start:%Y-%m-%d} to {range_end:%Y-%m-%d}")
+    fig.update_yaxes(autorange="reversed")
+    st.plotly_chart(fig, use_container_width=True)
+
 
 # --- Streamlit Layout ---
 st.set_page_config(page_title="Multi-Agent Task Dashboard", layout="wide")
@@ -276,47 +430,80 @@ agent1_status = "✅ Active" if not summary_df.empty else "⚠️ No Data"
 col1.metric("Agent 1 (Discord)", agent1_status, len(summary_df))
 
 # Agent 2 Status  
-agent2_status = "✅ Active" if not clickup_df.empty else "⚠️ No Data"
-col2.metric("Agent 2 (ClickUp)", agent2_status, len(clickup_df))
+agent2_status = "✅ Active" if clickup_total else "⚠️ No Data"
+col2.metric("Agent 2 (ClickUp)", agent2_status, clickup_total)
 
 # Agent 3 Status
 agent3_status = "✅ Active" if text_summary else "⚠️ No Data"
 col3.metric("Agent 3 (Analysis)", agent3_status, "Ready")
 
 # Overall Status
-total_tasks = len(summary_df) + len(clickup_df)
+total_tasks = len(summary_df) + clickup_total
 col4.metric("Total Tasks", total_tasks, "Across All Agents")
 
+
+def current_clickup_signature():
+    try:
+        return clickup_signature()
+    except FileNotFoundError:
+        return None
+
+
+@st.fragment(run_every=REFRESH_POLL_SECONDS)
+def clickup_sync_status():
+    """Report the background refresh and rerun the page once new ClickUp files are written"""
+    refresher = get_clickup_refresher()
+    if current_clickup_signature() != st.session_state.clickup_rendered_signature and not refresher.running:
+        st.rerun(scope="app")
+    
+    if refresher.running:
+        st.caption("🔄 Refreshing from ClickUp in the background...")
+    elif refresher.error:
+        st.caption(f"⚠️ Last refresh from ClickUp failed: {refresher.error}")
+    else:
+        age = refresher.snapshot_age()
+        if age is not None:
+            st.caption(f"🕒 ClickUp data updated {int(age // 60)} min ago")
+
+
+# Serve the current snapshot now and revalidate it in the background if it is stale
+request_clickup_refresh()
+st.session_state.clickup_rendered_signature = clickup_data.signature or current_clickup_signature()
+clickup_sync_status()
+
 st.markdown("---")
 
 # --- ClickUp Metrics ---
-if not clickup_df.empty:
+if clickup_total:
     st.markdown("## 📊 ClickUp Task Analytics")
     
     # ClickUp specific metrics
-    col1, col2, col3, col4 = st.columns(4)
+    col1, col2, col3, col4, col5, col6 = st.columns(6)
     
-    # Task status breakdown
-    status_counts = clickup_df['status'].value_counts()
-    completed_clickup = len(clickup_df[clickup_df['status'].isin(['complete', 'done', 'closed'])])
-    in_progress_clickup = len(clickup_df[clickup_df['status'] == 'in progress'])
-    todo_clickup = len(clickup_df[clickup_df['status'] == 'to do'])
+    # Task status breakdown (from the aggregate tables, counting every assignee)
+    completed_clickup = clickup_aggregates.status_total(COMPLETED_STATUSES)
+    in_progress_clickup = clickup_aggregates.status_total(['in progress'])
+    todo_clickup = clickup_aggregates.status_total(['to do'])
+    overdue_clickup, due_soon_clickup = clickup_aggregates.due_counts(int(datetime.now().timestamp() * 1000))
+    assignee_totals = clickup_aggregates.assignee_totals()
     
     col1.metric("✅ Completed", completed_clickup)
     col2.metric("🔄 In Progress", in_progress_clickup)
     col3.metric("📋 To Do", todo_clickup)
-    col4.metric("👥 Employees", clickup_stats.get('total_employees', 0))
+    col4.metric("⚠️ Overdue", overdue_clickup)
+    col5.metric("🔔 Due in 7 Days", due_soon_clickup)
+    col6.metric("👥 Employees", len(assignee_totals))
     
     # Employee performance
-    if clickup_stats.get('employee_stats'):
+    if assignee_totals:
         st.markdown("### 👥 Employee Performance")
-        emp_cols = st.columns(len(clickup_stats['employee_stats']))
-        for i, (emp, stats) in enumerate(clickup_stats['employee_stats'].items()):
+        emp_cols = st.columns(len(assignee_totals))
+        for i, (emp, (emp_total, emp_completed)) in enumerate(sorted(assignee_totals.items())):
             with emp_cols[i]:
                 st.metric(
                     f"👤 {emp}",
-                    f"{stats['completed_tasks']}/{stats['total_tasks']}",
-                    f"{stats['completion_rate']}%"
+                    f"{emp_completed}/{emp_total}",
+                    f"{round(emp_completed / emp_total * 100, 2)}%"
                 )
     
     st.markdown("---")
@@ -372,15 +559,12 @@ if CLICKUP_AVAILABLE:
         
         # Refresh data button
         if st.button("🔄 Refresh from ClickUp", type="secondary"):
-            with st.spinner("Refreshing data from ClickUp..."):
-                new_clickup_df, new_clickup_stats = refresh_clickup_data()
-                if new_clickup_df is not None:
-                    clickup_df = new_clickup_df
-                    clickup_stats = new_clickup_stats
-                    st.success("✅ Data refreshed successfully!")
-                    st.rerun()
-                else:
-                    st.error("❌ Failed to refresh data")
+            if request_clickup_refresh(force=True):
+                st.info("🔄 Refreshing in the background; the dashboard updates when new data arrives.")
+            elif get_clickup_refresher().running:
+                st.info("🔄 A refresh is already running.")
+            else:
+                st.error("❌ ClickUp configuration not found")
         
         # Test API connection button
         if st.button("🧪 Test API Connection", type="secondary"):
@@ -399,151 +583,232 @@ if CLICKUP_AVAILABLE:
             else:
                 st.error("❌ No ClickUp configuration found")
         
-        # Quick status update
+        # Status updates act on the rows selected in the task table, so only one page of tasks is sent
         if not clickup_df.empty:
-            st.markdown("#### 📝 Quick Status Update")
-            
-            # Get tasks for status update
-            task_options = clickup_df[['id', 'name', 'status']].copy()
-            task_options['display'] = task_options['name'] + " (" + task_options['status'] + ")"
-            
-            selected_task = st.selectbox(
-                "Select Task", 
-                options=task_options.index,
-                format_func=lambda x: task_options.loc[x, 'display']
-            )
-            
-            current_status = task_options.loc[selected_task, 'status']
-            status_options = ["to do", "in progress", "complete", "closed"]
-            try:
-                current_index = status_options.index(current_status)
-            except ValueError:
-                current_index = 0
-            
-            new_status = st.selectbox(
-                "New Status",
-                status_options,
-                index=current_index
-            )
-            
-            if st.button("📝 Update Status"):
-                task_id = task_options.loc[selected_task, 'id']
-                if update_task_status(task_id, new_status):
-                    st.success("✅ Status updated successfully!")
-                    # Force refresh the data
-                    st.cache_data.clear()
-                    st.rerun()
-                else:
-                    st.error("❌ Failed to update status")
+            st.caption("📝 To update task statuses, select them in the task table under 📊 ClickUp Tasks.")
+
+st.markdown("---")
+
+# --- Search ---
+st.markdown("## 🔎 Search")
+search_text = st.text_input("Search tasks and Discord messages", placeholder="e.g. login bug",
+                            label_visibility="collapsed")
+if search_text.strip():
+    search_col1, search_col2 = st.columns([1, 4])
+    search_kind = search_col1.selectbox("Show", ["All", "Tasks", "Messages"], key="search_kind")
+    search_started = time.perf_counter()
+    search_results = load_search_index().search(
+        search_text, kind={"Tasks": TASK, "Messages": MESSAGE}.get(search_kind), limit=20
+    )
+    search_col2.caption(f"{len(search_results)} result(s) in {(time.perf_counter() - search_started) * 1000:.1f} ms")
+    
+    for result in search_results:
+        if result["kind"] == TASK:
+            title = f"[{result['title']}]({result['url']})" if result["url"] else result["title"]
+            st.markdown(f"📝 **{title}** · {result['status']} · 👤 {result['employee']}")
+        else:
+            st.markdown(f"💬 **{result['username']}** · {result['timestamp']}")
+        if result["snippet"]:
+            st.caption(result["snippet"])
+    if not search_results:
+        st.info("No matching tasks or messages")
 
 st.markdown("---")
 
-# --- Tabs for detailed views ---
-tab1, tab2, tab3 = st.tabs(["📊 ClickUp Tasks", "🧾 Discord Tasks", "📄 Text Summary"])
+# --- Detailed views ---
+# Only the open tab is computed: switching tabs reruns the app, and each view
+# is a fragment, so its own widgets rerun just that view. Charts and frames
+# are cached per data version (see the cached view builders above).
+view_clickup, view_discord, view_text, view_timeline = st.tabs(
+    ["📊 ClickUp Tasks", "🧾 Discord Tasks", "📄 Text Summary", "📅 Timeline"],
+    key="dashboard_view",
+    on_change="rerun"
+)
+
 
-with tab1:
+@st.fragment
+def clickup_tasks_view():
     if not clickup_df.empty:
         st.subheader("📋 ClickUp Task Overview")
-        
+
+        # Charts are drawn from the aggregate tables, not from the task rows
+        clickup_query = clickup_data.query()
+        status_fig, emp_fig, status_table = clickup_overview(clickup_aggregates.version, clickup_aggregates)
+
         # Task status distribution
-        if 'status' in clickup_df.columns:
-            status_fig = px.pie(clickup_df, names='status', title="Task Status Distribution")
-            st.plotly_chart(status_fig, use_container_width=True)
-        
+        st.plotly_chart(status_fig, use_container_width=True)
+
         # Employee task breakdown
-        if 'employee' in clickup_df.columns:
-            emp_fig = px.bar(clickup_df['employee'].value_counts().reset_index(), 
-                           x='employee', y='count', 
-                           title="Tasks by Employee")
-            st.plotly_chart(emp_fig, use_container_width=True)
-        
+        st.plotly_chart(emp_fig, use_container_width=True)
+
+        # Trends from the statistics history
+        if os.path.exists(CLICKUP_HISTORY_FILE):
+            st.subheader("📈 Trends")
+            with StatsHistory(CLICKUP_HISTORY_FILE) as history:
+                trend_col1, trend_col2 = st.columns(2)
+                with trend_col1:
+                    trend_employee = st.selectbox("Trend for", [TEAM] + history.employees(),
+                                                  format_func=lambda name: "Whole team" if name == TEAM else name)
+                with trend_col2:
+                    trend_days = st.selectbox("Range", [1, 7, 30, 90, 365], index=1,
+                                              format_func=lambda days: f"Last {days} day{'s' if days > 1 else ''}")
+                now_ms = int(datetime.now().timestamp() * 1000)
+                trend_points = history.series(trend_employee, now_ms - trend_days * DAY_MS,
+                                              step_ms=HOUR_MS if trend_days <= 30 else DAY_MS)
+            if trend_points:
+                trend_df = pd.DataFrame(trend_points)
+                trend_df["time"] = pd.to_datetime(trend_df["time_ms"], unit="ms")
+                backlog_fig = px.line(trend_df, x="time", y=["pending_tasks", "overdue_tasks", "due_soon_tasks"],
+                                      title="Backlog")
+                st.plotly_chart(backlog_fig, use_container_width=True)
+                rate_fig = px.line(trend_df, x="time", y="completion_rate", title="Completion Rate (%)")
+                st.plotly_chart(rate_fig, use_container_width=True)
+            else:
+                st.info("No statistics recorded in this range yet.")
+
         # Interactive task management
         st.subheader("📋 All ClickUp Tasks")
-        
+
         # Add filters
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
-            status_filter = st.selectbox("Filter by Status", ["All"] + list(clickup_df['status'].unique()))
+            status_filter = st.selectbox("Filter by Status", ["All"] + clickup_index.values('status'))
         with col2:
-            priority_filter = st.selectbox("Filter by Priority", ["All"] + list(clickup_df['priority'].unique()))
+            priority_filter = st.selectbox("Filter by Priority", ["All"] + clickup_index.values('priority'))
         with col3:
-            employee_filter = st.selectbox("Filter by Employee", ["All"] + list(clickup_df['employee'].unique()))
-        
-        # Apply filters
-        filtered_df = clickup_df.copy()
-        if status_filter != "All":
-            filtered_df = filtered_df[filtered_df['status'] == status_filter]
-        if priority_filter != "All":
-            filtered_df = filtered_df[filtered_df['priority'] == priority_filter]
-        if employee_filter != "All":
-            filtered_df = filtered_df[filtered_df['employee'] == employee_filter]
-        
-        # Display filtered tasks
+            employee_filter = st.selectbox("Filter by Employee", ["All"] + clickup_index.values('assignee'))
+        with col4:
+            tag_filter = st.selectbox("Filter by Tag", ["All"] + clickup_index.values('tag'))
+
+        # Filters are pushed down to the query engine; matches any assignee of a task
+        task_filters = dict(
+            status=status_filter,
+            priority=priority_filter,
+            assignee=employee_filter,
+            tag=tag_filter
+        )
+        matching_count = clickup_query.count(**task_filters)
+
+        # Display filtered tasks one page at a time; only that page is fetched and sent to the browser
         display_cols = ['name', 'status', 'priority', 'employee', 'creator', 'date_created', 'url']
-        available_cols = [col for col in display_cols if col in filtered_df.columns]
-        
-        # Add action buttons for each task
-        if not filtered_df.empty:
-            for idx, task in filtered_df.iterrows():
-                with st.expander(f"📝 {task.get('name', 'Untitled')} - {task.get('status', 'Unknown')}"):
-                    col1, col2, col3 = st.columns([2, 1, 1])
-                    
-                    with col1:
-                        st.write(f"**Description:** {task.get('description', 'No description')}")
-                        st.write(f"**Priority:** {task.get('priority', 'Normal')}")
-                        st.write(f"**Assignee:** {task.get('employee', 'Unassigned')}")
-                        if task.get('due_date'):
-                            st.write(f"**Due Date:** {task.get('due_date')}")
-                        if task.get('url'):
-                            st.write(f"**ClickUp Link:** [Open in ClickUp]({task.get('url')})")
-                    
-                    with col2:
-                        if st.button(f"✅ Complete", key=f"complete_{task.get('id', idx)}"):
-                            if update_task_status(task.get('id'), 'complete'):
-                                st.success("Task completed!")
-                                # Force refresh the data
-                                st.cache_data.clear()
-                                st.rerun()
-                    
-                    with col3:
-                        if st.button(f"🔄 In Progress", key=f"progress_{task.get('id', idx)}"):
-                            if update_task_status(task.get('id'), 'in progress'):
-                                st.success("Status updated!")
-                                # Force refresh the data
-                                st.cache_data.clear()
-                                st.rerun()
-        
-        # Summary table
+        available_cols = [col for col in display_cols if col in clickup_df.columns]
+        detail_cols = available_cols + ['id', 'description', 'due_date']
+
         st.subheader("📊 Task Summary")
-        st.dataframe(filtered_df[available_cols], use_container_width=True)
-        
-        # Task details by status
-        for status in clickup_df['status'].unique():
-            if pd.notna(status):
-                st.subheader(f"📋 {status.title()} Tasks")
-                status_tasks = clickup_df[clickup_df['status'] == status]
-                st.dataframe(status_tasks[available_cols], use_container_width=True)
+        page_col1, page_col2, page_col3 = st.columns([1, 1, 2])
+        with page_col1:
+            page_size = st.selectbox("Tasks per page", TASK_PAGE_SIZES, index=1)
+        page_count = max(1, -(-matching_count // page_size))
+        if st.session_state.get("clickup_task_page", 1) > page_count:
+            st.session_state["clickup_task_page"] = page_count
+        with page_col2:
+            page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="clickup_task_page")
+        page_start = (page_number - 1) * page_size
+        page_df = clickup_query.page(detail_cols, offset=page_start, limit=page_size, **task_filters)
+        with page_col3:
+            st.caption(f"Showing {page_start + 1 if len(page_df) else 0}–{page_start + len(page_df)} "
+                       f"of {matching_count} matching tasks ({len(clickup_df)} total)")
+
+        task_table = st.dataframe(
+            page_df[available_cols],
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="multi-row",
+            # A selection only holds row positions, so it is reset whenever the rows can change:
+            # on another page or filter, and when a refresh or an update replaces the snapshot
+            key=f"clickup_task_table_{clickup_data.version}_{page_number}_{page_size}_"
+                + "_".join(map(str, task_filters.values()))
+        )
+
+        # Details and actions only for the selected tasks
+        selected_rows = [row for row in (task_table.selection.rows if task_table else []) if row < len(page_df)]
+        selected_tasks = page_df.iloc[selected_rows]
+        if len(selected_tasks) == 1:
+            task = selected_tasks.iloc[0]
+            st.markdown(f"#### 📝 {task.get('name', 'Untitled')} - {task.get('status', 'Unknown')}")
+            col1, col2, col3 = st.columns([2, 1, 1])
+
+            with col1:
+                st.write(f"**Description:** {task.get('description') or 'No description'}")
+                st.write(f"**Priority:** {task.get('priority', 'Normal')}")
+                st.write(f"**Assignee:** {task.get('employee', 'Unassigned')}")
+                if pd.notna(task.get('due_date')):
+                    st.write(f"**Due Date:** {task.get('due_date')}")
+                if task.get('url'):
+                    st.write(f"**ClickUp Link:** [Open in ClickUp]({task.get('url')})")
+
+            with col2:
+                if st.button(f"✅ Complete", key=f"complete_{task.get('id')}"):
+                    if update_task_status(task.get('id'), 'complete'):
+                        st.success("Task completed!")
+                        st.rerun()
+
+            with col3:
+                if st.button(f"🔄 In Progress", key=f"progress_{task.get('id')}"):
+                    if update_task_status(task.get('id'), 'in progress'):
+                        st.success("Status updated!")
+                        st.rerun()
+
+        if not selected_tasks.empty:
+            # Status update for the selected tasks (one, or a bulk update of several)
+            st.markdown(f"#### 📦 Update {len(selected_tasks)} Selected Task{'s' if len(selected_tasks) > 1 else ''}")
+            # Updates go by task id; names are only shown so the selection can be checked
+            selected_names = dict(zip(selected_tasks['id'], selected_tasks['name']))
+            if len(selected_names) > 1:
+                st.caption(", ".join(str(name) for name in selected_names.values()))
+            status_options = ["to do", "in progress", "complete", "closed"]
+            try:
+                current_index = status_options.index(selected_tasks['status'].iloc[0]) if len(selected_tasks) == 1 else 0
+            except ValueError:
+                current_index = 0
+            new_status = st.selectbox("New Status", status_options, index=current_index)
+
+            if st.button("📝 Update Status"):
+                task_ids = list(selected_names)
+                if len(task_ids) == 1:
+                    if update_task_status(task_ids[0], new_status):
+                        st.success("✅ Status updated successfully!")
+                        st.rerun()
+                    else:
+                        st.error("❌ Failed to update status")
+                else:
+                    results = update_task_statuses(task_ids, new_status)
+                    failed = [r for r in results if not r["ok"]]
+                    if results and not failed:
+                        st.success(f"✅ Updated {len(results)} tasks!")
+                        st.rerun()
+                    else:
+                        st.error(f"❌ {len(failed) if results else len(task_ids)} of {len(task_ids)} updates failed")
+        elif not page_df.empty:
+            st.caption("Select rows to see their details and update their status.")
+
+        # Task counts by status and priority in a single table
+        st.subheader("📋 Tasks by Status")
+        if status_table is not None:
+            st.dataframe(status_table, use_container_width=True)
     else:
         st.info("No ClickUp data available. Run Agent 2 to fetch tasks.")
 
-with tab2:
+
+@st.fragment
+def discord_tasks_view():
     if not summary_df.empty:
         st.subheader("📋 Discord Task Overview")
-        
+
+        discord_status_fig, completed_tasks, incomplete_tasks = discord_overview(discord_version, summary_df)
+
         # Task status distribution for Discord tasks
-        if 'status' in summary_df.columns:
-            discord_status_fig = px.pie(summary_df, names='status', title="Discord Task Status Distribution")
+        if discord_status_fig is not None:
             st.plotly_chart(discord_status_fig, use_container_width=True)
-        
+
         st.subheader("✅ Completed Tasks")
-        completed_tasks = summary_df[summary_df.status == "completed"]
         if not completed_tasks.empty:
             st.dataframe(completed_tasks, use_container_width=True)
         else:
             st.info("No completed tasks found.")
 
         st.subheader("❌ Incomplete Tasks")
-        incomplete_tasks = summary_df[summary_df.status == "not completed"]
         if not incomplete_tasks.empty:
             st.dataframe(incomplete_tasks, use_container_width=True)
         else:
@@ -551,7 +816,8 @@ with tab2:
     else:
         st.info("No Discord task data available. Run Agent 1 to fetch Discord messages.")
 
-with tab3:
+
+def text_summary_view():
     st.subheader("📘 Work Completed")
     for item in text_summary["Work completed"]:
         st.success(f"✔️ {item}")
@@ -568,41 +834,48 @@ with tab3:
     else:
         st.info("✅ No missed deadlines!")
 
-# --- Timeline and Charts ---
-st.markdown("## 📊 Task Analytics & Timeline")
-
-# Real-time refresh button
-if st.button("🔄 Refresh Data", type="primary"):
-    st.rerun()
-
-# ClickUp timeline if available
-if not clickup_df.empty and 'date_created' in clickup_df.columns:
-    st.markdown("### 📅 ClickUp Task Timeline")
-    clickup_timeline = clickup_df.copy()
-    clickup_timeline["Task"] = clickup_timeline["name"]
-    clickup_timeline["Start"] = clickup_timeline["date_created"]
-    clickup_timeline["End"] = clickup_timeline["due_date"].fillna(clickup_timeline["date_updated"])
-    
-    # Filter out invalid dates
-    clickup_timeline = clickup_timeline.dropna(subset=['Start'])
-    
-    if not clickup_timeline.empty:
-        fig_clickup = px.timeline(clickup_timeline, x_start="Start", x_end="End", y="Task", 
-                                color="status", title="ClickUp Task Timeline")
-        fig_clickup.update_yaxes(autorange="reversed")
-        st.plotly_chart(fig_clickup, use_container_width=True)
-
-# Discord timeline
-if not summary_df.empty:
-    st.markdown("### 📅 Discord Task Timeline")
-    timeline_df = summary_df.copy()
-    timeline_df["Task"] = timeline_df["description"]
-    timeline_df["Start"] = timeline_df["completed_date"].fillna(timeline_df["deadline"])
-    timeline_df["End"] = timeline_df["deadline"]
-
-    fig = px.timeline(timeline_df, x_start="Start", x_end="End", y="Task", color="status", title="Discord Task Timeline")
-    fig.update_yaxes(autorange="reversed")
-    st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def timeline_view():
+    """Tasks created per day, then the ClickUp and Discord timelines"""
+    # Real-time refresh button
+    if st.button("🔄 Refresh Data", type="primary"):
+        st.rerun()
+
+    # Tasks created per day, from the aggregate tables
+    created_fig = created_per_day_chart(clickup_aggregates.version, clickup_aggregates)
+    if created_fig is not None:
+        st.markdown("### 📆 ClickUp Tasks Created per Day")
+        st.plotly_chart(created_fig, use_container_width=True)
+
+    # ClickUp timeline if available
+    if not clickup_df.empty and 'date_created' in clickup_df.columns:
+        clickup_timeline = clickup_timeline_frame(clickup_data.version, clickup_df)
+        if not clickup_timeline.empty:
+            st.markdown("### 📅 ClickUp Task Timeline")
+            draw_task_timeline(clickup_timeline, "ClickUp Task Timeline", "clickup_timeline", clickup_data.version,
+                               lanes=("status", "employee"))
+
+    # Discord timeline
+    if not summary_df.empty:
+        st.markdown("### 📅 Discord Task Timeline")
+        draw_task_timeline(discord_timeline_frame(discord_version, summary_df), "Discord Task Timeline",
+                           "discord_timeline", discord_version)
+
+
+if view_clickup.open:
+    with view_clickup:
+        clickup_tasks_view()
+if view_discord.open:
+    with view_discord:
+        discord_tasks_view()
+if view_text.open:
+    with view_text:
+        text_summary_view()
+if view_timeline.open:
+    with view_timeline:
+        st.markdown("## 📊 Task Analytics & Timeline")
+        timeline_view()
 
 # Agent execution status
 st.markdown("## 🤖 Agent Execution Status")
@@ -618,9 +891,9 @@ with col1:
 
 with col2:
     st.markdown("### Agent 2 (ClickUp)")
-    if not clickup_df.empty:
+    if clickup_total:
         st.success("✅ Data Available")
-        st.write(f"Tasks: {len(clickup_df)}")
+        st.write(f"Tasks: {clickup_total}")
         st.write(f"Employees: {clickup_stats.get('total_employees', 0)}")
     else:
         st.warning("⚠️ No Data")
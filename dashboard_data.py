@@ -0,0 +1,560 @@
+"""
+Dashboard Data Loading
+======================
+
+Loads the agents' output files for dashboard.py and keeps the parsed result
+between Streamlit reruns. Every cache entry is keyed by the file's
+(path, mtime, size), so a rerun only costs a few os.stat calls; a file is
+reparsed, and its DataFrame rebuilt, only after an agent rewrites it.
+
+Refreshing from ClickUp is stale-while-revalidate: sessions keep rendering
+the last snapshot while one ClickUpRefresher thread, shared by every
+session, fetches and rewrites the Agent 2 files. The new files are picked
+up through their changed signatures.
+
+Headline metrics and summary charts come from the aggregate tables Agent 2
+writes to clickup_aggregates.json (TaskAggregates), not from the task rows.
+
+Task mutations made from the dashboard are patched into the loaded snapshot
+straight from the API response (ClickUpData.apply_task) and reconciled with
+ClickUp by one debounced background refresh.
+
+The full-text search index (search_index.py) is brought up to date with
+the change log and Discord messages whenever either file changes.
+
+Cached objects are shared by all sessions and must be treated as
+read-only. Copy a DataFrame before changing it.
+"""
+
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from dashboard_queries import TaskQuery
+from due_index import DueDateIndex
+from organize_tasks import normalize_task
+from search_index import SearchIndex
+from stats_accumulator import StatsAccumulator
+from task_aggregates import TaskAggregates
+from task_index import TaskIndex
+
+AGENT1_TASKS_FILE = "Agent 1/summary.json"
+CLICKUP_TASKS_FILE = "Agent 2/summary_clickup.json"
+CLICKUP_STATS_FILE = "Agent 2/clickup_statistics.json"
+CLICKUP_TIMING_FILE = "Agent 2/clickup_timing.json"
+CLICKUP_CHANGELOG_FILE = "Agent 2/clickup_changes.jsonl"
+CLICKUP_HISTORY_FILE = "Agent 2/clickup_stats_history.db"
+CLICKUP_AGGREGATES_FILE = "Agent 2/clickup_aggregates.json"
+TEXT_SUMMARY_FILE = "Agent 3/summary.json"
+DISCORD_MESSAGES_FILE = "Agent 1/discord_messages.json"
+SEARCH_INDEX_FILE = "search_index.db"
+
+# Column types of the dashboard frames, applied once when a file is loaded.
+# Low-cardinality strings become categoricals (one small code per row) and
+# lists become Arrow list columns instead of a Python list object per row;
+# other strings are already Arrow-backed in pandas.
+CLICKUP_DATE_COLUMNS = ("date_created", "date_updated", "due_date", "date_closed", "start_date")
+CLICKUP_CATEGORY_COLUMNS = ("status", "priority", "employee", "creator")
+CLICKUP_LIST_COLUMNS = ("tags", "assignees", "waiting_on", "blocking")
+DISCORD_DATE_COLUMNS = ("deadline", "completed_date")
+DISCORD_CATEGORY_COLUMNS = ("status",)
+
+STRING_LIST = pd.ArrowDtype(pa.list_(pa.string()))
+
+EMPTY_CLICKUP_STATS = {"total_employees": 0, "total_tasks": 0, "employee_stats": {}}
+
+# A snapshot older than this is revalidated against ClickUp in the background
+REVALIDATE_AFTER_SECONDS = 60
+
+# Optimistic edits are reconciled by a refresh this long after the last edit
+RECONCILE_DELAY_SECONDS = 10
+
+# Each file is cached at most once per signature, plus the previous version
+# while sessions that started on it finish their rerun
+MAX_CACHED_VERSIONS = 2
+
+
+def file_signature(path):
+    """
+    Cache key for a file: (absolute path, mtime in ns, size)
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def _read_json(signature):
+    with open(signature[0], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def parse_timestamps(values):
+    """
+    Convert a column of ClickUp/ISO timestamps to datetime64
+
+    Millisecond epochs (as numbers or strings) are converted in one
+    vectorized step; only the remaining values are parsed as ISO 8601.
+    Unparseable values become NaT.
+    """
+    epoch_ms = pd.to_numeric(values, errors="coerce")
+    parsed = pd.to_datetime(epoch_ms, unit="ms")
+    iso = epoch_ms.isna() & values.notna() & (values != "")
+    if iso.any():
+        parsed[iso] = pd.to_datetime(values[iso], errors="coerce", utc=True).dt.tz_localize(None)
+    return parsed
+
+
+# ClickUpData.version values, unique within the process
+_snapshot_versions = itertools.count()
+
+
+class ClickUpData:
+    """
+    Agent 2 output prepared for the dashboard
+
+    Attributes:
+        tasks (dict): Organized tasks (employee -> list of task dicts)
+        stats (dict): Statistics from clickup_statistics.json
+        df (DataFrame): One row per task with an ``employee`` column and the
+            date columns as datetime64
+        index (TaskIndex): Status/priority/assignee/tag index
+        due_index (DueDateIndex): Due-date index
+        signature: clickup_signature() of the files it was loaded from
+        version (int): Changes whenever the snapshot does (loaded or patched),
+            for caching results derived from it
+
+    apply_task() patches a single task in place; every other attribute is
+    read-only. The DataFrame is replaced rather than modified, so a rerun
+    that already holds ``df`` keeps a consistent frame.
+    """
+
+    __slots__ = ("tasks", "stats", "df", "index", "due_index", "signature", "version",
+                 "lock", "_accumulator", "_rows", "_locations", "_query")
+
+    def __init__(self, tasks, stats, signature=None):
+        self.signature = signature
+        self.version = next(_snapshot_versions)
+        self.tasks = tasks
+        self.stats = stats
+        self.df = build_clickup_frame(tasks)
+        self.index = TaskIndex.from_employee_tasks(tasks)
+        self.due_index = DueDateIndex.from_employee_tasks(tasks)
+        self.lock = threading.Lock()
+        # Built on the first apply_task, so loading never pays for them
+        self._accumulator = None
+        self._rows = None       # task id -> df row label
+        self._locations = None  # task id -> (employee, position in tasks[employee])
+        self._query = None
+
+    @classmethod
+    def empty(cls):
+        return cls({}, dict(EMPTY_CLICKUP_STATS))
+
+    def query(self):
+        """TaskQuery over the current DataFrame (rebuilt after apply_task replaces it)"""
+        with self.lock:
+            query = self._query
+            if query is None or query.frame is not self.df:
+                if query is not None:
+                    query.close()
+                query = self._query = TaskQuery(self.df)
+            return query
+
+    def apply_task(self, raw_task, now_ms=None, aggregates=None):
+        """
+        Patch a task from a ClickUp API response into this snapshot
+
+        Inserts the task or replaces its previous version in the tasks dict,
+        the DataFrame, both indexes and the statistics, without touching any
+        other task.
+
+        Args:
+            raw_task (dict): Task as returned by the create/update endpoints
+            now_ms (int): Reference time for overdue/due soon; defaults to now
+            aggregates (TaskAggregates): Aggregate tables to patch as well
+
+        Returns:
+            tuple: (employee, task info)
+        """
+        employee, task_info = normalize_task(raw_task)
+        task_id = task_info["id"]
+        with self.lock:
+            if self._accumulator is None:
+                self._accumulator = StatsAccumulator.from_employee_tasks(self.tasks, now_ms)
+                self._rows = {task: row for row, task in zip(self.df.index, self.df["id"])} if "id" in self.df else {}
+                self._locations = {
+                    task["id"]: (emp, position)
+                    for emp, emp_tasks in self.tasks.items()
+                    for position, task in enumerate(emp_tasks)
+                }
+
+            if aggregates is not None:
+                location = self._locations.get(task_id)
+                if location is not None:
+                    aggregates.remove(location[0], self.tasks[location[0]][location[1]])
+                aggregates.add(employee, task_info)
+            self._place_task(employee, task_info)
+            self._accumulator.update(task_id, employee, task_info, now_ms)
+            self.stats = self._accumulator.statistics()
+            self.index.add(task_info, employee)
+            self.due_index.track(task_info)
+            self.df = self._patched_frame(task_id, build_clickup_frame({employee: [task_info]}))
+            self.version = next(_snapshot_versions)
+        return employee, task_info
+
+    def _place_task(self, employee, task_info):
+        task_id = task_info["id"]
+        location = self._locations.get(task_id)
+        if location is not None and location[0] == employee:
+            self.tasks[employee][location[1]] = task_info
+            return
+        if location is not None:
+            previous, position = location
+            del self.tasks[previous][position]
+            for later, task in enumerate(self.tasks[previous][position:], start=position):
+                self._locations[task["id"]] = (previous, later)
+            if not self.tasks[previous]:
+                del self.tasks[previous]
+        emp_tasks = self.tasks.setdefault(employee, [])
+        self._locations[task_id] = (employee, len(emp_tasks))
+        emp_tasks.append(task_info)
+
+    def _patched_frame(self, task_id, row_df):
+        row = self._rows.get(task_id)
+        # Shallow copy: under pandas 3 copy-on-write only the columns written
+        # below are copied, so readers of the old frame never see the patch
+        clickup_df = self.df.copy(deep=False)
+        _align_row(clickup_df, row_df)
+        if row is None:
+            clickup_df = pd.concat([clickup_df, row_df], ignore_index=True)
+            self._rows[task_id] = clickup_df.index[-1]
+            return clickup_df
+        for column in row_df.columns:
+            if column not in clickup_df.columns:
+                clickup_df[column] = pd.Series(None, index=clickup_df.index, dtype=row_df[column].dtype)
+            if isinstance(clickup_df[column].dtype, pd.ArrowDtype):
+                # Arrow list cells cannot be assigned in place; splice the new value in
+                values = clickup_df[column]
+                spliced = pd.concat([values.iloc[:row], row_df[column], values.iloc[row + 1:]], ignore_index=True)
+                clickup_df[column] = spliced.set_axis(clickup_df.index)
+            else:
+                clickup_df.at[row, column] = row_df.at[0, column]
+        return clickup_df
+
+
+def build_clickup_frame(employee_tasks):
+    """
+    DataFrame of organized ClickUp tasks, one row per task
+
+    Dates are datetime64, status/priority/employee/creator are categoricals
+    and tags/assignees/dependencies are Arrow lists of strings.
+    """
+    rows = [
+        dict(task, employee=employee)
+        for employee, tasks in employee_tasks.items()
+        for task in tasks
+    ]
+    clickup_df = pd.DataFrame(rows)
+    if not clickup_df.empty:
+        for column in CLICKUP_DATE_COLUMNS:
+            if column in clickup_df.columns:
+                clickup_df[column] = parse_timestamps(clickup_df[column])
+        for column in CLICKUP_CATEGORY_COLUMNS:
+            if column in clickup_df.columns:
+                clickup_df[column] = clickup_df[column].astype("category")
+        for column in CLICKUP_LIST_COLUMNS:
+            if column in clickup_df.columns:
+                clickup_df[column] = clickup_df[column].astype(STRING_LIST)
+    return clickup_df
+
+
+def _align_row(clickup_df, row_df):
+    """
+    Cast a one-task frame to the dtypes of the task frame, in place
+
+    Categorical columns of ``clickup_df`` gain any new categories first, so
+    patching or appending the row never falls back to object columns.
+    """
+    for column in row_df.columns:
+        if column not in clickup_df.columns:
+            continue
+        dtype = clickup_df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            added = row_df[column].dropna().unique()
+            missing = [value for value in added if value not in dtype.categories]
+            if missing:
+                clickup_df[column] = clickup_df[column].cat.add_categories(missing)
+                dtype = clickup_df[column].dtype
+        if row_df[column].dtype != dtype:
+            try:
+                row_df[column] = row_df[column].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VERSIONS, show_spinner=False)
+def _cached_clickup_data(tasks_signature, stats_signature):
+    return ClickUpData(_read_json(tasks_signature), _read_json(stats_signature),
+                       (tasks_signature, stats_signature))
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VERSIONS, show_spinner=False)
+def _cached_discord_tasks(signature):
+    summary_df = pd.DataFrame(_read_json(signature))
+    if not summary_df.empty:
+        for column in DISCORD_DATE_COLUMNS:
+            if column in summary_df.columns:
+                summary_df[column] = pd.to_datetime(summary_df[column], errors="coerce")
+        for column in DISCORD_CATEGORY_COLUMNS:
+            if column in summary_df.columns:
+                summary_df[column] = summary_df[column].astype("category")
+    return summary_df
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VERSIONS, show_spinner=False)
+def _cached_discord_query(signature):
+    return TaskQuery(_cached_discord_tasks(signature))
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VERSIONS, show_spinner=False)
+def _cached_text_summary(signature):
+    return _read_json(signature)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VERSIONS, show_spinner=False)
+def _cached_clickup_aggregates(signature):
+    return TaskAggregates.load(signature[0])
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VERSIONS, show_spinner=False)
+def _derived_clickup_aggregates(tasks_signature, stats_signature):
+    return TaskAggregates.from_employee_tasks(_cached_clickup_data(tasks_signature, stats_signature).tasks)
+
+
+def load_clickup_aggregates(filename=CLICKUP_AGGREGATES_FILE, tasks_filename=CLICKUP_TASKS_FILE,
+                            stats_filename=CLICKUP_STATS_FILE):
+    """
+    Agent 2 aggregate tables (shared; only ClickUpData.apply_task patches them)
+
+    Task files written before Agent 2 kept aggregates have none; they are
+    then counted once from the loaded tasks.
+
+    Raises:
+        FileNotFoundError: If neither the aggregates nor the task files exist
+    """
+    try:
+        return _cached_clickup_aggregates(file_signature(filename))
+    except FileNotFoundError:
+        return _derived_clickup_aggregates(*clickup_signature(tasks_filename, stats_filename))
+
+
+def load_clickup_data(tasks_filename=CLICKUP_TASKS_FILE, stats_filename=CLICKUP_STATS_FILE):
+    """
+    Agent 2 tasks and statistics, reparsed only when either file changed
+
+    Returns:
+        ClickUpData: Shared, read-only
+
+    Raises:
+        FileNotFoundError: If either file is missing
+    """
+    return _cached_clickup_data(*clickup_signature(tasks_filename, stats_filename))
+
+
+def clickup_signature(tasks_filename=CLICKUP_TASKS_FILE, stats_filename=CLICKUP_STATS_FILE):
+    """Signatures of the Agent 2 task and statistics files (raises FileNotFoundError if missing)"""
+    return file_signature(tasks_filename), file_signature(stats_filename)
+
+
+def load_discord_tasks(filename=AGENT1_TASKS_FILE):
+    """Agent 1 tasks as a DataFrame with deadline/completed_date as datetime64 (shared, read-only)"""
+    return _cached_discord_tasks(file_signature(filename))
+
+
+def load_discord_query(filename=AGENT1_TASKS_FILE):
+    """TaskQuery over load_discord_tasks()"""
+    return _cached_discord_query(file_signature(filename))
+
+
+def load_text_summary(filename=TEXT_SUMMARY_FILE):
+    """Agent 3 analysis: category -> list of sentences (shared, read-only)"""
+    return _cached_text_summary(file_signature(filename))
+
+
+def _optional_signature(path):
+    try:
+        return file_signature(path)
+    except FileNotFoundError:
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def _search_index(filename):
+    return SearchIndex(filename)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _synced_search_index(filename, tasks_filename, changelog_filename,
+                         changelog_signature, tasks_signature, messages_signature):
+    # The task and log signatures only key the cache; sync_task_sources checks the files itself
+    index = _search_index(filename)
+    index.sync_task_sources(tasks_filename, changelog_filename)
+    if messages_signature is not None:
+        index.sync_messages(_read_json(messages_signature))
+    return index
+
+
+def load_search_index(filename=SEARCH_INDEX_FILE, changelog_filename=CLICKUP_CHANGELOG_FILE,
+                      tasks_filename=CLICKUP_TASKS_FILE, messages_filename=DISCORD_MESSAGES_FILE):
+    """
+    SearchIndex over ClickUp tasks and Discord messages, synced once per new version of the files
+
+    Task changes are taken from the change log; the task file is compared
+    with the index instead when the log cannot account for it (see
+    SearchIndex.sync_task_sources).
+    """
+    return _synced_search_index(filename, tasks_filename, changelog_filename,
+                                _optional_signature(changelog_filename),
+                                _optional_signature(tasks_filename), _optional_signature(messages_filename))
+
+
+class ClickUpRefresher:
+    """
+    Background refresh of the Agent 2 files from ClickUp
+
+    One instance is shared by all sessions (see get_clickup_refresher), and
+    at most one refresh runs at a time: a session that asks while a refresh
+    is in flight just waits for its result. The files are written the way
+    agent2_main.py writes them, streamed page by page and replaced
+    atomically, so readers never see a half-written task file.
+
+    Args:
+        tasks_filename (str): Organized tasks output
+        stats_filename (str): Statistics output
+        timing_filename (str): Timing percentiles output
+        changelog_filename (str): Task change log
+        history_filename (str): Statistics history database
+        aggregates_filename (str): Aggregate tables output
+    """
+
+    def __init__(self, tasks_filename=CLICKUP_TASKS_FILE, stats_filename=CLICKUP_STATS_FILE,
+                 timing_filename=CLICKUP_TIMING_FILE, changelog_filename=CLICKUP_CHANGELOG_FILE,
+                 history_filename=CLICKUP_HISTORY_FILE, aggregates_filename=CLICKUP_AGGREGATES_FILE):
+        self.tasks_filename = tasks_filename
+        self.stats_filename = stats_filename
+        self.timing_filename = timing_filename
+        self.changelog_filename = changelog_filename
+        self.history_filename = history_filename
+        self.aggregates_filename = aggregates_filename
+        self.lock = threading.Lock()
+        self.thread = None
+        self.timer = None
+        self.pending_config = None  # forced request made while a refresh was running
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def snapshot_age(self):
+        """Seconds since the task file was last written, or None if there is none"""
+        try:
+            return time.time() - os.path.getmtime(self.tasks_filename)
+        except OSError:
+            return None
+
+    def is_stale(self, max_age=REVALIDATE_AFTER_SECONDS):
+        age = self.snapshot_age()
+        return age is None or age > max_age
+
+    def request(self, config, force=False, max_age=REVALIDATE_AFTER_SECONDS):
+        """
+        Start a refresh unless one is running
+
+        Without ``force``, a refresh only starts if the snapshot is older than
+        ``max_age`` and no refresh was started within ``max_age`` either, so
+        a failing API is not retried on every rerun. A forced request made
+        while a refresh is running starts another one when it finishes,
+        since the running one may have fetched the tasks too early.
+
+        Args:
+            config (dict): ClickUp config with api_token and list_id
+
+        Returns:
+            bool: True if this call started a refresh
+        """
+        with self.lock:
+            if self.running:
+                if force:
+                    self.pending_config = config
+                return False
+            if not force:
+                if not self.is_stale(max_age):
+                    return False
+                if self.started_at is not None and time.time() - self.started_at < max_age:
+                    return False
+            self._start(config)
+            return True
+
+    def schedule(self, config, delay=RECONCILE_DELAY_SECONDS):
+        """
+        Force a refresh ``delay`` seconds after the last call
+
+        Used after optimistic edits: a burst of edits is reconciled with
+        ClickUp by a single refresh.
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(delay, self.request, args=(config,), kwargs={"force": True})
+            self.timer.daemon = True
+            self.timer.start()
+
+    def _start(self, config):
+        self.started_at = time.time()
+        self.thread = threading.Thread(target=self._run, args=(config,), daemon=True,
+                                       name="clickup-refresh")
+        self.thread.start()
+
+    def _run(self, config):
+        try:
+            from fetch_clickup import iter_task_pages
+            from stats_history import record_statistics_snapshot
+            from task_changelog import ChangeLog
+            from task_pipeline import stream_tasks_to_files
+
+            pages = iter_task_pages(api_token=config["api_token"], list_id=config["list_id"], as_records=True)
+            with ChangeLog(self.changelog_filename) as changelog:
+                stats = stream_tasks_to_files(pages, self.tasks_filename, self.stats_filename,
+                                              timing_filename=self.timing_filename, changelog=changelog,
+                                              aggregates_filename=self.aggregates_filename)
+            if stats["total_tasks"]:
+                record_statistics_snapshot(stats, self.history_filename)
+            self.error = None
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+            with self.lock:
+                config, self.pending_config = self.pending_config, None
+                if config is not None:
+                    self._start(config)
+
+
+@st.cache_resource(show_spinner=False)
+def get_clickup_refresher():
+    """The ClickUpRefresher shared by every session of this server"""
+    return ClickUpRefresher()
@@ -0,0 +1,294 @@
+"""
+Dashboard Queries
+=================
+
+Filters, counts and pages over the dashboard's task frames, so a rerun only
+moves small result sets into Streamlit instead of copying and masking the
+whole frame.
+
+DuckDB is used when it is installed: the DataFrame is registered as a view
+without copying, and every filter, group-by and page is pushed down as SQL
+and runs on its vectorized columnar engine. Otherwise the same queries run
+on pandas with boolean masks.
+
+timeline_buckets() reduces task date ranges to counts per time bucket and
+swimlane, so a timeline's size depends on the number of buckets rather than
+the number of tasks.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Filter name -> (column, whether the column holds a list of values)
+FILTER_COLUMNS = {
+    "status": ("status", False),
+    "priority": ("priority", False),
+    "creator": ("creator", False),
+    "employee": ("employee", False),
+    "tag": ("tags", True),
+    "assignee": ("assignees", True),
+}
+
+# Keeps the frame's row order in query results
+ROW_COLUMN = "row_number"
+
+# Timeline bucket sizes (name, pandas period frequency), finest first
+TIMELINE_BUCKETS = (
+    ("hour", "h"),
+    ("day", "D"),
+    ("week", "W"),
+    ("month", "M"),
+    ("quarter", "Q"),
+    ("year", "Y"),
+)
+
+
+def _wanted_values(wanted):
+    """Filter value -> list of accepted values, or None for no filter"""
+    if wanted is None or wanted == "All":
+        return None
+    if isinstance(wanted, (list, tuple, set, frozenset)):
+        return list(wanted)
+    return [wanted]
+
+
+class TaskQuery:
+    """
+    Query helper over one task DataFrame
+
+    Filters follow TaskIndex.query: a value, or a list meaning "any of
+    these", with None or "All" leaving the field unfiltered. ``tag`` and
+    ``assignee`` match any element of the task's tags/assignees; tasks
+    without assignees match on the employee they are filed under.
+
+    Example:
+        query = TaskQuery(clickup_df)
+        query.count(status="to do", assignee="alice_dev")
+        query.value_counts("status")
+        query.page(["name", "status"], offset=50, limit=50, priority="high")
+
+    Args:
+        frame (DataFrame): Tasks, one row per task; not modified
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.columns = set(frame.columns)
+        self.lock = threading.Lock()
+        self.connection = None
+        if duckdb is not None and not frame.empty:
+            self.connection = duckdb.connect()
+            self.connection.register("tasks", frame.assign(**{ROW_COLUMN: range(len(frame))}))
+
+    @property
+    def backend(self):
+        return "duckdb" if self.connection is not None else "pandas"
+
+    def count(self, **filters):
+        """Number of tasks matching the filters"""
+        if self.connection is not None:
+            where, params = self._where(filters)
+            counts = self._sql(f"SELECT count(*) AS count FROM tasks{where}", params)
+            if counts is not None:
+                return int(counts["count"].iat[0])
+        return int(self._mask(filters).sum()) if not self.frame.empty else 0
+
+    def value_counts(self, columns, **filters):
+        """
+        Tasks per value (or combination of values) of ``columns``
+
+        Returns:
+            DataFrame: The grouped columns plus ``count``, most frequent first
+        """
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        if self.frame.empty or not set(columns) <= self.columns:
+            return pd.DataFrame(columns=columns + ["count"])
+        if self.connection is not None:
+            selected = ", ".join(_quote(column) for column in columns)
+            where, params = self._where(filters)
+            counts = self._sql(
+                f"SELECT {selected}, count(*) AS count FROM tasks{where} "
+                f"GROUP BY ALL ORDER BY count DESC, {selected}",
+                params
+            )
+            if counts is not None:
+                return counts
+        counts = self.frame[self._mask(filters)].groupby(columns, dropna=False, sort=False, observed=True).size()
+        counts = counts.reset_index(name="count")
+        return counts.sort_values(["count"] + columns, ascending=[False] + [True] * len(columns),
+                                  ignore_index=True)
+
+    def page(self, columns, offset=0, limit=50, **filters):
+        """Rows ``offset`` to ``offset + limit`` of the matching tasks, in frame order"""
+        columns = [column for column in columns if column in self.columns]
+        if self.frame.empty:
+            return pd.DataFrame(columns=columns)
+        if self.connection is not None:
+            where, params = self._where(filters)
+            selected = ", ".join(_quote(column) for column in columns)
+            rows = self._sql(
+                f"SELECT {selected} FROM tasks{where} ORDER BY {ROW_COLUMN} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            )
+            if rows is not None:
+                return rows
+        matching = self.frame[self._mask(filters)]
+        return matching.iloc[offset:offset + limit][columns].reset_index(drop=True)
+
+    def close(self):
+        """
+        Close the DuckDB connection
+
+        Queries still running finish first; later calls fall back to pandas,
+        so a session holding on to a replaced query keeps working.
+        """
+        with self.lock:
+            connection, self.connection = self.connection, None
+        if connection is not None:
+            connection.close()
+
+    def _sql(self, sql, params):
+        """Result of ``sql`` as a DataFrame, or None once the connection is closed"""
+        with self.lock:
+            if self.connection is None:
+                return None
+            return self.connection.execute(sql, params).df()
+
+    def _conditions(self, filters):
+        """(filter column, is list column, accepted values) for every active filter"""
+        for name, wanted in filters.items():
+            if name not in FILTER_COLUMNS:
+                raise ValueError(f"Unknown filter: {name}")
+            values = _wanted_values(wanted)
+            if values is not None:
+                column, is_list = FILTER_COLUMNS[name]
+                yield name, column, is_list, values
+
+    def _where(self, filters):
+        clauses, params = [], []
+        for name, column, is_list, values in self._conditions(filters):
+            if column not in self.columns:
+                if name != "assignee":
+                    clauses.append("false")
+                    continue
+                column, is_list = "employee", False
+            placeholders = ", ".join("?" for _ in values)
+            if not is_list:
+                clauses.append(f"{_quote(column)} IN ({placeholders})")
+            else:
+                clause = f"list_has_any({_quote(column)}, [{placeholders}])"
+                if name == "assignee":
+                    clause = (f"({clause} OR (coalesce(len({_quote(column)}), 0) = 0 "
+                              f"AND employee IN ({placeholders})))")
+                    params.extend(values)
+                clauses.append(clause)
+            params.extend(values)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _mask(self, filters):
+        mask = pd.Series(True, index=self.frame.index)
+        for name, column, is_list, values in self._conditions(filters):
+            if column not in self.columns:
+                if name != "assignee":
+                    return pd.Series(False, index=self.frame.index)
+                column, is_list = "employee", False
+            if not is_list:
+                mask &= self.frame[column].isin(values)
+                continue
+            matches, empty = _list_matches(self.frame[column], values)
+            if name == "assignee":
+                matches |= empty & self.frame["employee"].isin(values).to_numpy()
+            mask &= matches
+        return mask
+
+
+def _list_matches(lists, values):
+    """
+    For a column of lists: (rows containing any of ``values``, rows with no items)
+
+    Arrow list columns are matched on the flattened values in one pass;
+    anything else falls back to checking each row's list.
+    """
+    if isinstance(lists.dtype, pd.ArrowDtype) and pa.types.is_list(lists.dtype.pyarrow_dtype):
+        array = pa.array(lists)
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        hits = pc.is_in(pc.list_flatten(array), value_set=pa.array(values, type=array.type.value_type))
+        rows = pc.filter(pc.list_parent_indices(array), hits).to_numpy()
+        matches = np.zeros(len(lists), dtype=bool)
+        matches[rows] = True
+        empty = pc.fill_null(pc.list_value_length(array), 0).to_numpy(zero_copy_only=False) == 0
+        return matches, empty
+    wanted = set(values)
+    present = lists.map(lambda items: items is not None and not isinstance(items, float))
+    matches = [bool(has and wanted.intersection(items)) for has, items in zip(present, lists)]
+    empty = [not (has and len(items)) for has, items in zip(present, lists)]
+    return np.array(matches, dtype=bool), np.array(empty, dtype=bool)
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def timeline_buckets(starts, ends, lanes, max_buckets=200):
+    """
+    Tasks active in each time bucket, per swimlane
+
+    A task is active in every bucket from the one containing its start to
+    the one containing its end (its start if the end is missing or earlier).
+    The finest bucket size from TIMELINE_BUCKETS that keeps the range within
+    ``max_buckets`` buckets is used. Runs in one vectorized pass: each task
+    adds +1 at its first bucket and -1 after its last, and a cumulative sum
+    per lane gives the active counts.
+
+    Args:
+        starts (Series): Start datetimes; rows without one are skipped
+        ends (Series): End datetimes, aligned with ``starts``
+        lanes (Series): Swimlane of each task (e.g. status)
+        max_buckets (int): Upper bound on buckets per lane
+
+    Returns:
+        tuple: (DataFrame with bucket (start time), lane and tasks columns,
+            bucket size name such as "week")
+    """
+    rows = np.flatnonzero(starts.notna().to_numpy())
+    if not len(rows):
+        return pd.DataFrame(columns=["bucket", "lane", "tasks"]), TIMELINE_BUCKETS[0][0]
+    starts = starts.iloc[rows].reset_index(drop=True)
+    ends = ends.iloc[rows].reset_index(drop=True).fillna(starts)
+    ends = ends.where(ends >= starts, starts)
+    lane_codes, lane_names = pd.factorize(lanes.iloc[rows], sort=True)
+    lane_names = list(lane_names)
+    if (lane_codes < 0).any():
+        lane_codes[lane_codes < 0] = len(lane_names)
+        lane_names.append("Unknown")
+
+    earliest, latest = starts.min(), ends.max()
+    for name, freq in TIMELINE_BUCKETS:
+        origin = earliest.to_period(freq).ordinal
+        bucket_count = latest.to_period(freq).ordinal - origin + 1
+        if bucket_count <= max_buckets:
+            break
+    first = starts.dt.to_period(freq).array.asi8
+    last = ends.dt.to_period(freq).array.asi8
+
+    active = np.zeros((len(lane_names), bucket_count + 1), dtype=np.int64)
+    np.add.at(active, (lane_codes, first - origin), 1)
+    np.add.at(active, (lane_codes, last - origin + 1), -1)
+    active = active.cumsum(axis=1)[:, :-1]
+
+    bucket_starts = pd.period_range(pd.Period(ordinal=int(origin), freq=freq), periods=bucket_count).to_timestamp()
+    return pd.DataFrame({
+        "bucket": np.tile(bucket_starts, len(lane_names)),
+        "lane": np.repeat(np.array(lane_names, dtype=object), bucket_count),
+        "tasks": active.ravel(),
+    }), name
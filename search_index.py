@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Search Index
+============
+
+Full-text search over ClickUp tasks (name, description, tags) and Discord
+messages, backed by an SQLite FTS5 inverted index in search_index.db.
+
+The index is updated incrementally. Task changes are read from Agent 2's
+change log (clickup_changes.jsonl) starting at the last position applied,
+and Discord messages are added only if they have not been indexed yet.
+Every document keeps a fingerprint, so rewriting an unchanged document is
+skipped. Queries are ranked with BM25, with name matches weighted above
+tag and description matches.
+
+Usage:
+    python search_index.py "login error"          # sync, then search
+    python search_index.py "deploy" --kind task
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from task_changelog import read_changes
+
+SEARCH_INDEX_FILENAME = "search_index.db"
+
+TASK = "task"
+MESSAGE = "message"
+
+# BM25 weights of the title, body and tags columns
+RANK_WEIGHTS = (5.0, 1.0, 2.0)
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    title, body, tags,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+CREATE TABLE IF NOT EXISTS documents (
+    kind TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    doc_id INTEGER NOT NULL UNIQUE,
+    fingerprint TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    PRIMARY KEY (kind, ref)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync_state (
+    source TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _fingerprint(*parts):
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def match_expression(text):
+    """
+    FTS5 query for free text typed by a user
+
+    Every word must match, and the last one also matches as a prefix so
+    results appear while typing. Quoting each word keeps FTS5 operators and
+    punctuation in the input from being interpreted.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def message_ref(message):
+    """Stable id of a Discord message: its timestamp and author"""
+    return f"{message.get('timestamp', '')}|{message.get('username', '')}"
+
+
+class SearchIndex:
+    """
+    FTS5 index of tasks and messages
+
+    Example:
+        with SearchIndex() as index:
+            index.sync_task_changes("Agent 2/clickup_changes.jsonl")
+            index.sync_messages(messages)
+            results = index.search("login error")
+
+    Args:
+        filename (str): SQLite database file (created if missing)
+    """
+
+    def __init__(self, filename=SEARCH_INDEX_FILENAME):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT count(*) FROM documents").fetchone()[0]
+
+    # ---------------- Writing ----------------
+
+    def _upsert(self, kind, ref, title, body, tags, meta):
+        fingerprint = _fingerprint(title, body, tags, meta)
+        row = self.connection.execute(
+            "SELECT doc_id, fingerprint FROM documents WHERE kind = ? AND ref = ?", (kind, ref)
+        ).fetchone()
+        if row is not None and row[1] == fingerprint:
+            return False
+        if row is None:
+            doc_id = self.connection.execute(
+                "INSERT INTO search (title, body, tags) VALUES (?, ?, ?)", (title, body, tags)
+            ).lastrowid
+        else:
+            doc_id = row[0]
+            self.connection.execute(
+                "UPDATE search SET title = ?, body = ?, tags = ? WHERE rowid = ?", (title, body, tags, doc_id)
+            )
+        self.connection.execute(
+            "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?)",
+            (kind, ref, doc_id, fingerprint, json.dumps(meta, ensure_ascii=False))
+        )
+        return True
+
+    def _delete(self, kind, ref):
+        row = self.connection.execute(
+            "SELECT doc_id FROM documents WHERE kind = ? AND ref = ?", (kind, ref)
+        ).fetchone()
+        if row is None:
+            return False
+        self.connection.execute("DELETE FROM search WHERE rowid = ?", row)
+        self.connection.execute("DELETE FROM documents WHERE kind = ? AND ref = ?", (kind, ref))
+        return True
+
+    def _upsert_task(self, employee, task_info):
+        tags = list(task_info.get("tags") or ())
+        meta = {
+            "name": task_info.get("name") or "Untitled",
+            "status": task_info.get("status"),
+            "employee": employee,
+            "url": task_info.get("url") or "",
+        }
+        return self._upsert(TASK, task_info["id"], meta["name"], task_info.get("description") or "",
+                            " ".join(tags), meta)
+
+    def _state(self, source, default=0):
+        row = self.connection.execute("SELECT value FROM sync_state WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else default
+
+    @staticmethod
+    def _changelog_source(changelog_filename):
+        return f"changelog:{os.path.abspath(changelog_filename)}"
+
+    def _set_state(self, source, value):
+        self.connection.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (source, value))
+
+    def sync_task_changes(self, changelog_filename):
+        """
+        Apply task changes logged since the last sync
+
+        The log position is stored in the same transaction as the changes,
+        so an interrupted sync resumes exactly where it stopped.
+
+        Returns:
+            int: Documents inserted, updated or deleted
+        """
+        source = self._changelog_source(changelog_filename)
+        changed = 0
+        with self.lock, self.connection:
+            position = self._state(source)
+            if os.path.exists(changelog_filename) and os.path.getsize(changelog_filename) < position:
+                position = 0  # the log was recreated; replaying it is harmless
+            for change, position in read_changes(changelog_filename, position):
+                if change["op"] == "delete":
+                    changed += self._delete(TASK, change["task_id"])
+                else:
+                    changed += self._upsert_task(change["employee"], change["task"])
+            self._set_state(source, position)
+        return changed
+
+    def changelog_position(self, changelog_filename):
+        """Log position applied by sync_task_changes(), or None if the log was never synced"""
+        with self.lock:
+            return self._state(self._changelog_source(changelog_filename), None)
+
+    def needs_seed(self, changelog_filename):
+        """
+        Whether the tasks must be synced from the task file before applying the log
+
+        A change log only holds what happened while a producer was attached
+        (the webhook receiver, for one, loads its tasks before it starts
+        logging), so the first time a log is synced, or after it was
+        recreated, the index is seeded with sync_tasks() first.
+        """
+        position = self.changelog_position(changelog_filename)
+        if position is None:
+            return True
+        return os.path.exists(changelog_filename) and os.path.getsize(changelog_filename) < position
+
+    def sync_task_sources(self, tasks_filename, changelog_filename):
+        """
+        Bring the indexed tasks up to date with Agent 2's task file and change log
+
+        The change log is applied incrementally. The whole task file is
+        compared with the index only when the log cannot account for it:
+        without a log, the first time a log is used, and when the task file
+        was rewritten while the log did not advance (task_shards.py and
+        organize_tasks.py write the file without logging).
+
+        Returns:
+            int: Documents inserted, updated or deleted
+        """
+        tasks_mtime = os.stat(tasks_filename).st_mtime_ns if os.path.exists(tasks_filename) else None
+        tasks_source = f"tasks:{os.path.abspath(tasks_filename)}"
+        with self.lock:
+            synced_mtime = self._state(tasks_source, None)
+        use_changelog = os.path.exists(changelog_filename) and os.path.getsize(changelog_filename) > 0
+
+        changed = 0
+        full_sync = tasks_mtime is not None and (not use_changelog or self.needs_seed(changelog_filename))
+        if full_sync:
+            changed += self._sync_task_file(tasks_filename)
+        if use_changelog:
+            position = self.changelog_position(changelog_filename)
+            changed += self.sync_task_changes(changelog_filename)
+            advanced = self.changelog_position(changelog_filename) != position
+            if not full_sync and not advanced and tasks_mtime is not None and tasks_mtime != synced_mtime:
+                changed += self._sync_task_file(tasks_filename)
+        if tasks_mtime is not None:
+            with self.lock, self.connection:
+                self._set_state(tasks_source, tasks_mtime)
+        return changed
+
+    def _sync_task_file(self, tasks_filename):
+        with open(tasks_filename, "r", encoding="utf-8") as f:
+            return self.sync_tasks(json.load(f))
+
+    def sync_tasks(self, employee_tasks):
+        """
+        Make the indexed tasks match an organized tasks dict (employee -> tasks)
+
+        For task files without a change log, and to seed the index before a
+        change log is first applied: every task is compared by fingerprint,
+        and tasks that are gone are removed.
+
+        Returns:
+            int: Documents inserted, updated or deleted
+        """
+        changed = 0
+        with self.lock, self.connection:
+            seen = set()
+            for employee, tasks in employee_tasks.items():
+                for task_info in tasks:
+                    seen.add(task_info["id"])
+                    changed += self._upsert_task(employee, task_info)
+            indexed = self.connection.execute("SELECT ref FROM documents WHERE kind = ?", (TASK,)).fetchall()
+            for (ref,) in indexed:
+                if ref not in seen:
+                    changed += self._delete(TASK, ref)
+        return changed
+
+    def sync_messages(self, messages):
+        """
+        Index Discord messages (dicts with username, content, timestamp)
+
+        Returns:
+            int: Documents inserted or updated
+        """
+        changed = 0
+        with self.lock, self.connection:
+            for message in messages:
+                meta = {"username": message.get("username", ""), "timestamp": message.get("timestamp", "")}
+                changed += self._upsert(MESSAGE, message_ref(message), meta["username"],
+                                        message.get("content") or "", "", meta)
+        return changed
+
+    # ---------------- Reading ----------------
+
+    def search(self, text, kind=None, limit=20):
+        """
+        Best matches for free text
+
+        Args:
+            text (str): What the user typed
+            kind (str): Only TASK or only MESSAGE results; both if None
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Dicts with kind, ref, title, snippet (matches wrapped in
+                ** for Markdown), score (lower is better) and the document's
+                meta (task url/status/employee or message username/timestamp)
+        """
+        expression = match_expression(text)
+        if expression is None:
+            return []
+        sql = f"""
+            SELECT documents.kind, documents.ref, search.title,
+                   snippet(search, 1, '**', '**', '…', 16), bm25(search, ?, ?, ?) AS score, documents.meta
+            FROM search JOIN documents ON documents.doc_id = search.rowid
+            WHERE search MATCH ? {"AND documents.kind = ?" if kind else ""}
+            ORDER BY score
+            LIMIT ?
+        """
+        params = [*RANK_WEIGHTS, expression] + ([kind] if kind else []) + [limit]
+        with self.lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        return [
+            {"kind": kind, "ref": ref, "title": title, "snippet": snippet, "score": score, **json.loads(meta)}
+            for kind, ref, title, snippet, score, meta in rows
+        ]
+
+
+# ---------------- Main ----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search ClickUp tasks and Discord messages")
+    parser.add_argument("query")
+    parser.add_argument("--kind", choices=[TASK, MESSAGE], default=None)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--file", default=SEARCH_INDEX_FILENAME)
+    parser.add_argument("--changelog", default="Agent 2/clickup_changes.jsonl")
+    parser.add_argument("--tasks", default="Agent 2/summary_clickup.json",
+                        help="task file to index when there is no change log")
+    parser.add_argument("--messages", default="Agent 1/discord_messages.json")
+    args = parser.parse_args()
+
+    with SearchIndex(args.file) as index:
+        index.sync_task_sources(args.tasks, args.changelog)
+        if os.path.exists(args.messages):
+            with open(args.messages, "r", encoding="utf-8") as f:
+                index.sync_messages(json.load(f))
+
+        started = time.perf_counter()
+        results = index.search(args.query, kind=args.kind, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(f"🔎 {len(results)} result(s) for '{args.query}' in {elapsed_ms:.1f} ms")
+    for result in results:
+        if result["kind"] == TASK:
+            print(f"  📝 {result['title']} [{result['status']}] ({result['employee']}) {result['url']}")
+        else:
+            print(f"  💬 {result['username']} at {result['timestamp']}")
+        print(f"     {result['snippet']}")
@@ -0,0 +1,183 @@
+import hashlib
+import hmac
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from clickup_webhook import ClickUpWebhookServer, apply_webhook_event, verify_signature
+from fake_clickup_server import generate_workspace
+from organize_tasks import get_task_statistics, normalize_task, organize_tasks_by_employee
+from task_store import TaskStore
+
+NOW_MS = 1_700_000_000_000
+EVENT_DATE = str(NOW_MS + 60_000)
+SECRET = "webhook-secret"
+
+
+@pytest.fixture
+def workspace():
+    return generate_workspace(20, num_members=3, seed=0, now_ms=NOW_MS)
+
+
+@pytest.fixture
+def store(workspace):
+    return TaskStore.from_employee_tasks(organize_tasks_by_employee(list(workspace["tasks"].values())))
+
+
+def _task_with_status(workspace, statuses, assigned=None):
+    for task in workspace["tasks"].values():
+        if task["status"]["status"] in statuses and (assigned is None or bool(task["assignees"]) == assigned):
+            return task
+    raise AssertionError(f"no generated task with status in {statuses}")
+
+
+def _status_event(task_id, before, after):
+    return {
+        "event": "taskStatusUpdated",
+        "task_id": task_id,
+        "history_items": [
+            {"field": "status", "date": EVENT_DATE, "before": {"status": before}, "after": {"status": after}}
+        ],
+    }
+
+
+def _assert_consistent(store):
+    assert store.statistics() == get_task_statistics(store.employee_tasks())
+
+
+def _sign(body):
+    return hmac.new(SECRET.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def test_verify_signature():
+    body = b'{"event": "taskCreated"}'
+    assert verify_signature(body, _sign(body), SECRET)
+    assert not verify_signature(body + b" ", _sign(body), SECRET)
+    assert not verify_signature(body, _sign(body), "other-secret")
+    assert not verify_signature(body, None, SECRET)
+    assert not verify_signature(body, _sign(body), None)
+
+
+def test_status_update_closes_and_reopens(workspace, store):
+    task = _task_with_status(workspace, ("to do", "in progress"))
+
+    assert apply_webhook_event(store, _status_event(task["id"], task["status"]["status"], "complete")) == \
+        f"status of {task['id']} -> complete"
+    closed = store.get(task["id"])
+    assert closed["status"] == "complete"
+    assert closed["date_updated"] == EVENT_DATE
+    assert closed["date_closed"] == EVENT_DATE
+    _assert_consistent(store)
+
+    apply_webhook_event(store, _status_event(task["id"], "complete", "in progress"))
+    reopened = store.get(task["id"])
+    assert reopened["status"] == "in progress"
+    assert reopened["date_closed"] is None
+    _assert_consistent(store)
+
+
+def test_assignee_update_moves_the_task(workspace, store):
+    task = _task_with_status(workspace, ("to do", "in progress", "complete"), assigned=True)
+    before = task["assignees"][0]["username"]
+    after = next(m["username"] for m in workspace["members"] if m["username"] != before)
+    event = {
+        "event": "taskAssigneeUpdated",
+        "task_id": task["id"],
+        "history_items": [
+            {"field": "assignee_rem", "date": EVENT_DATE, "before": {"username": before}},
+            {"field": "assignee_add", "date": EVENT_DATE, "after": {"username": after}},
+        ],
+    }
+    remaining = [a["username"] for a in task["assignees"][1:]]
+
+    apply_webhook_event(store, event)
+
+    assert store.get(task["id"])["assignees"] == remaining + [after]
+    assert store.employee_of(task["id"]) == (remaining + [after])[0]
+    _assert_consistent(store)
+
+
+def test_created_and_updated_tasks_are_fetched(workspace, store):
+    new_task = dict(_task_with_status(workspace, ("to do",)), id="new0001", name="Created by webhook")
+    changed = dict(_task_with_status(workspace, ("in progress",)), name="Renamed")
+    remote = {new_task["id"]: new_task, changed["id"]: changed}
+    fetched = []
+
+    def fetch_task(task_id):
+        fetched.append(task_id)
+        return remote.get(task_id)
+
+    apply_webhook_event(store, {"event": "taskCreated", "task_id": new_task["id"]}, fetch_task)
+    apply_webhook_event(store, {"event": "taskUpdated", "task_id": changed["id"]}, fetch_task)
+
+    assert fetched == [new_task["id"], changed["id"]]
+    assert store.get(new_task["id"]) == normalize_task(new_task)[1]
+    assert store.get(changed["id"])["name"] == "Renamed"
+    _assert_consistent(store)
+
+    # Without a way to fetch, or when the fetch fails, the store is left alone
+    assert "no way to fetch" in apply_webhook_event(store, {"event": "taskUpdated", "task_id": "missing"})
+    assert "could not be fetched" in apply_webhook_event(
+        store, {"event": "taskUpdated", "task_id": "missing"}, fetch_task)
+    assert store.get("missing") is None
+
+
+def test_status_update_for_unknown_task_is_fetched(workspace, store):
+    task = dict(_task_with_status(workspace, ("to do",)), id="new0002")
+    event = _status_event(task["id"], "to do", "in progress")
+
+    apply_webhook_event(store, event, lambda task_id: task)
+
+    assert store.get(task["id"]) == normalize_task(task)[1]
+
+
+def test_deleted_task_is_removed(workspace, store):
+    task_id = next(iter(workspace["tasks"]))
+
+    assert apply_webhook_event(store, {"event": "taskDeleted", "task_id": task_id}) == f"deleted {task_id}"
+    assert store.get(task_id) is None
+    assert task_id not in {task["id"] for tasks in store.employee_tasks().values() for task in tasks}
+    _assert_consistent(store)
+    assert apply_webhook_event(store, {"event": "taskDeleted", "task_id": task_id}).startswith("ignored")
+
+
+def test_events_without_task_or_unknown_names_are_ignored(store):
+    before = store.employee_tasks()
+    assert apply_webhook_event(store, {"event": "taskCreated"}).startswith("ignored")
+    assert apply_webhook_event(store, {"event": "listCreated", "task_id": "x"}, lambda task_id: None) == \
+        "ignored listCreated"
+    assert store.employee_tasks() == before
+
+
+def test_handle_event_status_codes(workspace, store, tmp_path):
+    receiver = ClickUpWebhookServer(
+        store, SECRET, port=0, history_filename=None,
+        tasks_filename=str(tmp_path / "summary_clickup.json"),
+        stats_filename=str(tmp_path / "clickup_statistics.json"),
+        checkpoint_filename=str(tmp_path / "clickup_stats_checkpoint.json"),
+        aggregates_filename=str(tmp_path / "clickup_aggregates.json"),
+    )
+    try:
+        task_id = next(iter(workspace["tasks"]))
+        body = json.dumps({"event": "taskDeleted", "task_id": task_id}).encode("utf-8")
+
+        assert receiver.handle_event(body, "bad signature") == 401
+        assert receiver.handle_event(body, None) == 401
+        assert store.get(task_id) is not None
+        assert receiver.handle_event(b"{not json", _sign(b"{not json")) == 400
+        assert receiver.handle_event(b"[1, 2]", _sign(b"[1, 2]")) == 400
+        assert not receiver.dirty.is_set()
+
+        assert receiver.handle_event(body, _sign(body)) == 200
+        assert store.get(task_id) is None
+        assert receiver.dirty.is_set()
+
+        receiver.flush()
+        with open(tmp_path / "summary_clickup.json", encoding="utf-8") as f:
+            assert json.load(f) == store.employee_tasks()
+    finally:
+        receiver.httpd.server_close()
@@ -0,0 +1,102 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from dashboard_data import ClickUpData, build_clickup_frame
+from fake_clickup_server import generate_workspace
+from organize_tasks import get_task_statistics, organize_tasks_by_employee
+from task_aggregates import TaskAggregates
+from task_index import TaskIndex
+
+NOW_MS = 1_700_000_000_000
+
+
+@pytest.fixture
+def workspace():
+    return generate_workspace(60, num_members=4, seed=5, now_ms=NOW_MS)
+
+
+@pytest.fixture
+def data(workspace):
+    employee_tasks = organize_tasks_by_employee(list(workspace["tasks"].values()))
+    return ClickUpData(employee_tasks, get_task_statistics(employee_tasks, NOW_MS))
+
+
+def _by_id(clickup_df):
+    return clickup_df.sort_values("id").reset_index(drop=True)
+
+
+def _assert_matches_rebuild(data):
+    rebuilt = build_clickup_frame(data.tasks)
+    assert list(data.df.columns) == list(rebuilt.columns)
+    # Patched categoricals keep categories that are no longer used, so compare values
+    pd.testing.assert_frame_equal(_by_id(data.df), _by_id(rebuilt), check_categorical=False)
+    assert data.stats == get_task_statistics(data.tasks, NOW_MS)
+
+    index = TaskIndex.from_employee_tasks(data.tasks)
+    for field in ("status", "priority", "assignee", "tag"):
+        for value in index.values(field):
+            assert data.index.ids(field, value) == index.ids(field, value), (field, value)
+
+
+def _changed(task, **changes):
+    return dict(task, **changes)
+
+
+def test_apply_task_matches_rebuild(workspace, data):
+    tasks = list(workspace["tasks"].values())
+    aggregates = TaskAggregates.from_employee_tasks(data.tasks)
+    members = workspace["members"]
+    new_task = _changed(tasks[0], id="new0001", name="Brand new", assignees=[members[0]], tags=[{"name": "urgent"}])
+
+    changes = [
+        _changed(tasks[1], status={"status": "complete", "type": "closed"}, date_closed=str(NOW_MS)),
+        _changed(tasks[2], name="Renamed", priority={"priority": "urgent"}, due_date=None),
+        # Moves to another employee, then back
+        _changed(tasks[3], assignees=[members[3], members[1]]),
+        _changed(tasks[4], assignees=[]),
+        new_task,
+        _changed(tasks[3], assignees=[members[2]]),
+        _changed(new_task, status={"status": "in progress", "type": "custom"}),
+    ]
+    for raw_task in changes:
+        data.apply_task(raw_task, NOW_MS, aggregates=aggregates)
+        _assert_matches_rebuild(data)
+
+    assert sum(len(emp_tasks) for emp_tasks in data.tasks.values()) == len(tasks) + 1
+    assert aggregates.to_dict()["tables"] == TaskAggregates.from_employee_tasks(data.tasks).to_dict()["tables"]
+    assert data.query().count() == len(tasks) + 1
+
+
+def test_apply_task_leaves_previous_frame_alone(workspace, data):
+    tasks = list(workspace["tasks"].values())
+    previous_df = data.df
+    previous_copy = previous_df.copy(deep=True)
+    previous_version = data.version
+
+    data.apply_task(_changed(tasks[5], name="Renamed", tags=[{"name": "new-tag"}]), NOW_MS)
+    data.apply_task(_changed(tasks[0], id="new0002"), NOW_MS)
+
+    assert data.df is not previous_df
+    assert data.version != previous_version
+    pd.testing.assert_frame_equal(previous_df, previous_copy)
+    assert len(data.df) == len(previous_df) + 1
+
+
+def test_query_follows_the_patched_frame(workspace, data):
+    task = list(workspace["tasks"].values())[6]
+    before = data.query()
+    assert before.count(status="blocked") == 0
+
+    data.apply_task(_changed(task, status={"status": "blocked", "type": "custom"}), NOW_MS)
+
+    after = data.query()
+    assert after is not before
+    assert after.frame is data.df
+    assert after.count(status="blocked") == 1
+    # A session still holding the replaced query keeps getting answers
+    assert before.count(status="blocked") == 0
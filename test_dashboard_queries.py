@@ -0,0 +1,87 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from dashboard_data import build_clickup_frame
+from dashboard_queries import TaskQuery
+
+duckdb = pytest.importorskip("duckdb")
+
+STATUSES = ["to do", "in progress", "complete"]
+PRIORITIES = ["low", "normal", "high", None]
+PEOPLE = ["alice_dev", "bob_dev", "carol_dev"]
+TAGS = ["bug", "frontend", "backend"]
+
+FILTERS = [
+    {},
+    {"status": "to do"},
+    {"status": "All", "priority": "high"},
+    {"status": ["to do", "complete"], "priority": "low"},
+    {"tag": "bug"},
+    {"tag": ["frontend", "backend"], "status": "in progress"},
+    {"assignee": "alice_dev"},
+    {"assignee": ["bob_dev", "carol_dev"], "tag": "frontend"},
+    {"employee": "carol_dev", "creator": "bob_dev"},
+    {"status": "missing"},
+]
+
+
+def _employee_tasks(count=300, seed=7):
+    rng = random.Random(seed)
+    employee_tasks = {}
+    for number in range(count):
+        employee = rng.choice(PEOPLE)
+        employee_tasks.setdefault(employee, []).append({
+            "id": f"t{number}",
+            "name": f"Task {number}",
+            "status": rng.choice(STATUSES),
+            "priority": rng.choice(PRIORITIES),
+            "creator": rng.choice(PEOPLE),
+            "date_created": str(1_700_000_000_000 + number * 3_600_000),
+            "tags": rng.sample(TAGS, rng.randint(0, 2)),
+            "assignees": rng.sample(PEOPLE, rng.randint(0, 2)),
+        })
+    return employee_tasks
+
+
+def _rows(counts):
+    """Result rows as comparable tuples, with every kind of missing value as None"""
+    counts = counts.astype(object).where(counts.notna(), None)
+    return sorted(map(repr, counts.itertuples(index=False)))
+
+
+@pytest.fixture(scope="module")
+def backends():
+    frame = build_clickup_frame(_employee_tasks())
+    sql, pandas = TaskQuery(frame), TaskQuery(frame)
+    pandas.connection = None
+    assert (sql.backend, pandas.backend) == ("duckdb", "pandas")
+    return sql, pandas
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_count_matches_pandas(backends, filters):
+    sql, pandas = backends
+    assert sql.count(**filters) == pandas.count(**filters)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_value_counts_match_pandas(backends, filters):
+    sql, pandas = backends
+    for columns in ("status", ["status", "priority"]):
+        expected = pandas.value_counts(columns, **filters)
+        actual = sql.value_counts(columns, **filters)
+        assert _rows(actual) == _rows(expected)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_page_matches_pandas(backends, filters):
+    sql, pandas = backends
+    for offset in (0, 40):
+        expected = pandas.page(["id", "name", "status"], offset=offset, limit=25, **filters)
+        actual = sql.page(["id", "name", "status"], offset=offset, limit=25, **filters)
+        assert list(actual["id"]) == list(expected["id"])
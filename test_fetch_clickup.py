@@ -0,0 +1,118 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+import fetch_clickup
+from fake_clickup_server import FakeClickUpServer, generate_workspace
+from fetch_clickup import _coalesce_operations, bulk_mutate_tasks
+
+NOW_MS = 1_700_000_000_000
+
+
+@pytest.fixture
+def server(monkeypatch):
+    workspace = generate_workspace(20, num_members=3, seed=0, now_ms=NOW_MS)
+    with FakeClickUpServer(workspace) as server:
+        monkeypatch.setattr(fetch_clickup, "CLICKUP_API_BASE", server.base_url)
+        yield server
+
+
+def _task_ids(server, count):
+    return sorted(server.workspace["tasks"])[:count]
+
+
+def test_coalesce_merges_updates_in_order():
+    operations = [
+        {"action": "update", "task_id": "a", "task_data": {"status": "in progress", "name": "A"}},
+        {"action": "update", "task_id": "b", "task_data": {"status": "complete"}},
+        {"action": "update", "task_id": "a", "task_data": {"status": "complete"}},
+    ]
+    to_send, owners, errors = _coalesce_operations(operations)
+
+    assert to_send == [
+        {"action": "update", "task_id": "a", "task_data": {"status": "complete", "name": "A"}},
+        {"action": "update", "task_id": "b", "task_data": {"status": "complete"}},
+    ]
+    assert owners == {0: 0, 1: 1, 2: 0}
+    assert errors == {}
+    # The caller's task_data is not modified by the merge
+    assert operations[0]["task_data"] == {"status": "in progress", "name": "A"}
+
+
+def test_coalesce_rejects_invalid_operations():
+    operations = [
+        {"action": "create", "task_data": {"name": "no list"}},
+        {"action": "update", "task_data": {"status": "complete"}},
+        {"action": "archive", "task_id": "a"},
+    ]
+    to_send, owners, errors = _coalesce_operations(operations)
+
+    assert to_send == []
+    assert owners == {}
+    assert set(errors) == {0, 1, 2}
+
+
+def test_bulk_updates_are_coalesced(server):
+    first, second = _task_ids(server, 2)
+    operations = [
+        {"action": "update", "task_id": first, "task_data": {"name": "Renamed"}},
+        {"action": "update", "task_id": second, "task_data": {"status": "in progress"}},
+        {"action": "update", "task_id": first, "task_data": {"status": "complete"}},
+    ]
+    results = bulk_mutate_tasks("token", operations, requests_per_minute=0)
+
+    assert server.request_count == 2
+    assert [result["ok"] for result in results] == [True, True, True]
+    assert [result["task_id"] for result in results] == [first, second, first]
+    task = server.workspace["tasks"][first]
+    assert task["name"] == "Renamed"
+    assert task["status"]["status"] == "complete"
+    assert results[0]["task"]["status"]["status"] == "complete"
+    assert server.workspace["tasks"][second]["status"]["status"] == "in progress"
+
+
+def test_bulk_delete_supersedes_updates(server):
+    deleted, kept = _task_ids(server, 2)
+    operations = [
+        {"action": "update", "task_id": deleted, "task_data": {"name": "Renamed"}},
+        {"action": "delete", "task_id": deleted},
+        {"action": "update", "task_id": deleted, "task_data": {"status": "complete"}},
+        {"action": "update", "task_id": kept, "task_data": {"status": "complete"}},
+    ]
+    results = bulk_mutate_tasks("token", operations, requests_per_minute=0)
+
+    # One DELETE for the deleted task, one PUT for the other
+    assert server.request_count == 2
+    assert deleted not in server.workspace["tasks"]
+    assert server.workspace["tasks"][kept]["status"]["status"] == "complete"
+    assert [result["ok"] for result in results] == [True, True, False, True]
+    assert results[2]["error"] == "task is deleted earlier in the batch"
+
+
+def test_bulk_creates_report_new_task_ids(server):
+    list_id = server.workspace["lists"][0]["id"]
+    operations = [
+        {"action": "create", "list_id": list_id, "task_data": {"name": "One"}},
+        {"action": "create", "list_id": list_id, "task_data": {"name": "Two"}},
+    ]
+    results = bulk_mutate_tasks("token", operations, requests_per_minute=0)
+
+    assert server.request_count == 2
+    assert all(result["ok"] for result in results)
+    assert [server.workspace["tasks"][result["task_id"]]["name"] for result in results] == ["One", "Two"]
+
+
+def test_bulk_failures_are_reported_per_operation(server):
+    existing = _task_ids(server, 1)[0]
+    operations = [
+        {"action": "update", "task_id": "missing", "task_data": {"status": "complete"}},
+        {"action": "update", "task_id": existing, "task_data": {"status": "complete"}},
+    ]
+    results = bulk_mutate_tasks("token", operations, requests_per_minute=0)
+
+    assert not results[0]["ok"]
+    assert results[0]["error"].startswith("404")
+    assert results[1]["ok"]
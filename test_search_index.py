@@ -0,0 +1,136 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from search_index import MESSAGE, TASK, SearchIndex
+from task_changelog import ChangeLog
+
+TASK_NAMES = {"a": "Fix login error", "b": "Write release notes", "c": "Migrate billing database"}
+
+
+def _task(task_id, status="to do", name=None, tags=()):
+    return {"id": task_id, "name": name or TASK_NAMES[task_id], "status": status,
+            "description": f"Details for {task_id}", "tags": list(tags), "url": f"https://app.clickup.com/t/{task_id}"}
+
+
+def _indexed(index):
+    """task id -> (name, status, employee) of every indexed task"""
+    return {
+        result["ref"]: (result["name"], result["status"], result["employee"])
+        for result in index.search("details", kind=TASK, limit=100)
+    }
+
+
+def _write_tasks(filename, employee_tasks, mtime_ns):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(employee_tasks, f)
+    os.utime(filename, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def index(tmp_path):
+    with SearchIndex(str(tmp_path / "search_index.db")) as index:
+        yield index
+
+
+def test_sync_tasks_updates_and_deletes(index):
+    assert index.sync_tasks({"alice_dev": [_task("a"), _task("b")]}) == 2
+    assert index.sync_tasks({"alice_dev": [_task("a"), _task("b")]}) == 0
+    assert index.search("login", kind=TASK)[0]["ref"] == "a"
+
+    assert index.sync_tasks({"bob_dev": [_task("a", status="complete")]}) == 2
+    assert _indexed(index) == {"a": ("Fix login error", "complete", "bob_dev")}
+    assert index.search("release") == []
+
+
+def test_sync_task_changes_applies_the_log_incrementally(index, tmp_path):
+    changelog_filename = str(tmp_path / "clickup_changes.jsonl")
+    with ChangeLog(changelog_filename) as changelog:
+        changelog.record("alice_dev", _task("a"))
+        changelog.record("alice_dev", _task("b"))
+        assert index.sync_task_changes(changelog_filename) == 2
+        assert index.sync_task_changes(changelog_filename) == 0
+
+        changelog.record("bob_dev", _task("b", status="in progress"))
+        changelog.record_delete("a")
+        changelog.record("alice_dev", _task("c"))
+        assert index.sync_task_changes(changelog_filename) == 3
+
+    assert _indexed(index) == {
+        "b": ("Write release notes", "in progress", "bob_dev"),
+        "c": ("Migrate billing database", "to do", "alice_dev"),
+    }
+    assert index.changelog_position(changelog_filename) == os.path.getsize(changelog_filename)
+
+
+def test_recreated_log_is_replayed(index, tmp_path):
+    changelog_filename = str(tmp_path / "clickup_changes.jsonl")
+    with ChangeLog(changelog_filename) as changelog:
+        for task_id in "abc":
+            changelog.record("alice_dev", _task(task_id))
+    index.sync_task_changes(changelog_filename)
+    assert not index.needs_seed(changelog_filename)
+
+    os.remove(changelog_filename)
+    with ChangeLog(changelog_filename) as changelog:
+        changelog.record("alice_dev", _task("a", status="complete"))
+    assert index.needs_seed(changelog_filename)
+    index.sync_task_changes(changelog_filename)
+    assert _indexed(index)["a"] == ("Fix login error", "complete", "alice_dev")
+
+
+def test_sync_task_sources_seeds_then_follows_the_log(index, tmp_path):
+    tasks_filename = str(tmp_path / "summary_clickup.json")
+    changelog_filename = str(tmp_path / "clickup_changes.jsonl")
+    _write_tasks(tasks_filename, {"alice_dev": [_task("a"), _task("b")]}, 1_000_000_000)
+
+    # Without a log the task file is the source
+    assert index.sync_task_sources(tasks_filename, changelog_filename) == 2
+    assert index.sync_task_sources(tasks_filename, changelog_filename) == 0
+
+    # A log that started after the file was written: seeded from the file, then applied
+    with ChangeLog(changelog_filename) as changelog:
+        changelog.record("alice_dev", _task("c"))
+        assert index.sync_task_sources(tasks_filename, changelog_filename) == 1
+        assert set(_indexed(index)) == {"a", "b", "c"}
+
+        # The file is rewritten along with the log: only the log is applied
+        changelog.record("alice_dev", _task("a", status="complete"))
+        _write_tasks(tasks_filename, {"alice_dev": [_task("a", status="complete"), _task("b"), _task("c")]},
+                     2_000_000_000)
+        assert index.sync_task_sources(tasks_filename, changelog_filename) == 1
+
+    assert _indexed(index)["a"] == ("Fix login error", "complete", "alice_dev")
+
+
+def test_task_file_rewritten_outside_the_log_is_resynced(index, tmp_path):
+    tasks_filename = str(tmp_path / "summary_clickup.json")
+    changelog_filename = str(tmp_path / "clickup_changes.jsonl")
+    _write_tasks(tasks_filename, {"alice_dev": [_task("a"), _task("b")]}, 1_000_000_000)
+    with ChangeLog(changelog_filename) as changelog:
+        changelog.record("alice_dev", _task("a"))
+    index.sync_task_sources(tasks_filename, changelog_filename)
+
+    # e.g. organize_tasks.py or task_shards.py rewriting the file without logging
+    _write_tasks(tasks_filename, {"carol_dev": [_task("b", status="complete"), _task("c")]}, 2_000_000_000)
+    assert index.sync_task_sources(tasks_filename, changelog_filename) == 3
+    assert _indexed(index) == {
+        "b": ("Write release notes", "complete", "carol_dev"),
+        "c": ("Migrate billing database", "to do", "carol_dev"),
+    }
+    assert index.sync_task_sources(tasks_filename, changelog_filename) == 0
+
+
+def test_messages_are_searchable_separately(index):
+    message = {"username": "alice_dev", "content": "The login error is back", "timestamp": "2024-01-01T10:00:00"}
+    index.sync_tasks({"alice_dev": [_task("a")]})
+    assert index.sync_messages([message]) == 1
+    assert index.sync_messages([message]) == 0
+
+    assert {result["kind"] for result in index.search("login")} == {TASK, MESSAGE}
+    assert [result["username"] for result in index.search("login", kind=MESSAGE)] == ["alice_dev"]
+    assert len(index) == 2
@@ -0,0 +1,32 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from due_index import DeadlineScheduler
+from organize_tasks import DAY_MS, DUE_SOON_DAYS
+from task_store import TaskStore
+
+START_MS = 1_700_000_000_000
+HOUR_MS = 60 * 60 * 1000
+
+
+def test_verify_after_deadline_alert():
+    store = TaskStore()
+    store.upsert("alice_dev", {"id": "a", "name": "Ship it", "status": "to do", "due_date": START_MS + HOUR_MS},
+                 now_ms=START_MS)
+    store.upsert("alice_dev", {"id": "b", "name": "Later", "status": "to do",
+                               "due_date": START_MS + DUE_SOON_DAYS * DAY_MS + HOUR_MS}, now_ms=START_MS)
+    # Driven through collect() instead of the scheduler thread
+    scheduler = DeadlineScheduler(store.due_index, on_alert=None)
+    scheduler.overdue_cursor = START_MS
+    scheduler.due_soon_cursor = START_MS + scheduler.window_ms
+
+    now_ms = START_MS + 2 * HOUR_MS
+    alerts = scheduler.collect(now_ms)
+    assert sorted(kind for kind, _, _ in alerts) == ["due_soon", "overdue"]
+    for kind, task_id, _ in alerts:
+        store.apply_deadline_alert(kind, task_id, now_ms)
+
+    assert store.stats.as_of_ms == now_ms
+    assert store.stats.verify(store.employee_tasks()) == []
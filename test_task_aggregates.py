@@ -0,0 +1,126 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from fake_clickup_server import generate_workspace
+from organize_tasks import COMPLETED_STATUSES, get_task_statistics, normalize_task, organize_tasks_by_employee
+from task_aggregates import HOUR_MS, TaskAggregates
+
+NOW_MS = 1_700_000_000_000
+
+
+@pytest.fixture
+def workspace():
+    return generate_workspace(200, num_members=5, seed=11, now_ms=NOW_MS)
+
+
+def _tables(aggregates):
+    return aggregates.to_dict()["tables"]
+
+
+def _employee_tasks(tasks):
+    employee_tasks = {}
+    for employee, task_info in tasks.values():
+        employee_tasks.setdefault(employee, []).append(task_info)
+    return employee_tasks
+
+
+def test_incremental_changes_match_rebuild(workspace):
+    rng = random.Random(0)
+    raw_tasks = list(workspace["tasks"].values())
+    tasks = {task["id"]: normalize_task(task) for task in raw_tasks[:150]}
+    aggregates = TaskAggregates.from_employee_tasks(_employee_tasks(tasks))
+    members = workspace["members"]
+
+    for step in range(300):
+        task_id = rng.choice(raw_tasks)["id"]
+        previous = tasks.get(task_id)
+        if previous is not None and rng.random() < 0.25:
+            aggregates.remove(*tasks.pop(task_id))
+        else:
+            raw_task = dict(workspace["tasks"][task_id],
+                            status={"status": rng.choice(["to do", "in progress", "complete"])},
+                            assignees=rng.sample(members, k=rng.choice([0, 1, 2])))
+            if previous is not None:
+                aggregates.remove(*previous)
+            tasks[task_id] = normalize_task(raw_task)
+            aggregates.add(*tasks[task_id])
+        if step % 50 == 49:
+            assert _tables(aggregates) == _tables(TaskAggregates.from_employee_tasks(_employee_tasks(tasks)))
+
+    employee_tasks = _employee_tasks(tasks)
+    stats = get_task_statistics(employee_tasks, NOW_MS)
+    assert aggregates.total_tasks() == stats["total_tasks"] == len(tasks)
+    assert aggregates.status_total(COMPLETED_STATUSES) == sum(
+        entry["completed_tasks"] for entry in stats["employee_stats"].values())
+
+
+def test_removing_every_task_empties_the_tables(workspace):
+    employee_tasks = organize_tasks_by_employee(list(workspace["tasks"].values()))
+    aggregates = TaskAggregates.from_employee_tasks(employee_tasks)
+    for employee, tasks in employee_tasks.items():
+        for task_info in tasks:
+            aggregates.remove(employee, task_info)
+
+    assert _tables(aggregates) == _tables(TaskAggregates())
+    assert aggregates.total_tasks() == 0
+
+
+def test_merged_shards_match_whole(workspace):
+    raw_tasks = list(workspace["tasks"].values())
+    merged = TaskAggregates()
+    for start in range(0, len(raw_tasks), 64):
+        merged.merge(TaskAggregates.from_employee_tasks(organize_tasks_by_employee(raw_tasks[start:start + 64])))
+
+    whole = TaskAggregates.from_employee_tasks(organize_tasks_by_employee(raw_tasks))
+    assert _tables(merged) == _tables(whole)
+    assert merged.due_counts(NOW_MS) == whole.due_counts(NOW_MS)
+    assert merged.assignee_totals() == whole.assignee_totals()
+
+
+def test_version_changes_on_every_change(workspace):
+    task = next(iter(workspace["tasks"].values()))
+    employee, task_info = normalize_task(task)
+    aggregates = TaskAggregates()
+    versions = [aggregates.version]
+    aggregates.add(employee, task_info)
+    versions.append(aggregates.version)
+    aggregates.merge(TaskAggregates())
+    versions.append(aggregates.version)
+    aggregates.remove(employee, task_info)
+    versions.append(aggregates.version)
+
+    assert len(set(versions)) == len(versions)
+
+
+def test_due_counts_are_read_to_the_hour():
+    now_ms = NOW_MS // HOUR_MS * HOUR_MS + HOUR_MS // 2
+    aggregates = TaskAggregates()
+    for task_id, due_ms, status in [
+        ("overdue", now_ms - 2 * HOUR_MS, "to do"),
+        ("earlier this hour", now_ms - 60_000, "to do"),
+        ("tomorrow", now_ms + 24 * HOUR_MS, "in progress"),
+        ("next month", now_ms + 30 * 24 * HOUR_MS, "to do"),
+        ("done late", now_ms - 2 * HOUR_MS, "complete"),
+    ]:
+        aggregates.add("alice_dev", {"id": task_id, "status": status, "due_date": str(due_ms)})
+
+    assert aggregates.due_counts(now_ms) == (1, 2)
+
+
+def test_save_and_load_round_trip(workspace, tmp_path):
+    aggregates = TaskAggregates.from_employee_tasks(organize_tasks_by_employee(list(workspace["tasks"].values())))
+    filename = str(tmp_path / "clickup_aggregates.json")
+    aggregates.save(filename)
+
+    loaded = TaskAggregates.load(filename)
+    assert loaded.to_dict() == aggregates.to_dict()
+    assert loaded.due_counts(NOW_MS) == aggregates.due_counts(NOW_MS)
+    assert TaskAggregates.from_dict(aggregates.to_dict()).tables == aggregates.tables
+
+    with pytest.raises(ValueError):
+        TaskAggregates.from_dict(dict(aggregates.to_dict(), version=0))
@@ -0,0 +1,40 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from task_changelog import ChangeLog, read_changes
+
+
+def _task(task_id, status="to do"):
+    return {"id": task_id, "name": f"Task {task_id}", "status": status}
+
+
+def test_two_producers_share_sequence_numbers(tmp_path):
+    filename = str(tmp_path / "changes.jsonl")
+    first, second = ChangeLog(filename), ChangeLog(filename)
+    first.record("alice_dev", _task("a"))
+    second.record("bob_dev", _task("b"))
+    first.record("alice_dev", _task("c"))
+    second.record("bob_dev", _task("a", status="complete"))
+    first.record_delete("b")
+    first.close()
+    second.close()
+
+    changes = [change for change, _ in read_changes(filename)]
+    seqs = [change["seq"] for change in changes]
+    assert seqs == sorted(set(seqs)) == list(range(1, len(changes) + 1))
+    assert [change["op"] for change in changes] == ["insert", "insert", "insert", "update", "delete"]
+
+
+def test_unchanged_task_from_another_producer_is_not_logged(tmp_path):
+    filename = str(tmp_path / "changes.jsonl")
+    first, second = ChangeLog(filename), ChangeLog(filename)
+    assert first.record("alice_dev", _task("a")) is not None
+    assert second.record("alice_dev", _task("a")) is None
+    first.close()
+    second.close()
+
+    reopened = ChangeLog(filename)
+    assert reopened.seq == 1 and reopened.task_ids() == {"a"}
+    reopened.close()
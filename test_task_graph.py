@@ -0,0 +1,130 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from task_graph import DEFAULT_ESTIMATE_MS, HOUR_MS, TaskGraph
+
+PEOPLE = ["alice_dev", "bob_dev", "carol_dev"]
+
+
+def _task(task_id, status="to do", hours=None, waiting_on=(), blocking=(), parent=None):
+    return {
+        "id": task_id,
+        "status": status,
+        "time_estimate": hours * HOUR_MS if hours else None,
+        "time_spent": None,
+        "waiting_on": list(waiting_on),
+        "blocking": list(blocking),
+        "parent": parent,
+    }
+
+
+def _random_task(rng, task_id, task_ids):
+    others = [other for other in task_ids if other != task_id] + ["ghost"]
+    return _task(
+        task_id,
+        status=rng.choice(["to do", "in progress", "complete"]),
+        hours=rng.choice([None, 1, 2, 5]),
+        waiting_on=rng.sample(others, k=rng.choice([0, 0, 1, 2])),
+        blocking=rng.sample(others, k=rng.choice([0, 0, 0, 1])),
+        parent=rng.choice(others) if rng.random() < 0.1 else None,
+    )
+
+
+def _assert_matches_rebuild(graph, tasks, employees):
+    employee_tasks = {}
+    for task_id, task_info in tasks.items():
+        employee_tasks.setdefault(employees[task_id], []).append(task_info)
+    rebuilt = TaskGraph.from_employee_tasks(employee_tasks)
+
+    assert graph.finish == rebuilt.finish
+    assert graph.depth == rebuilt.depth
+    assert graph.cycles() == rebuilt.cycles()
+    assert graph.topological_order() == rebuilt.topological_order()
+    assert graph.employee_summary() == rebuilt.employee_summary()
+    for task_id in tasks:
+        assert graph.blockers(task_id) == rebuilt.blockers(task_id)
+        path = graph.critical_path(task_id)
+        if path:
+            assert sum(graph.work[step] for step in path) == graph.finish[task_id]
+
+
+def test_chain_and_completion():
+    graph = TaskGraph()
+    graph.update(_task("a", hours=2), "alice_dev")
+    graph.update(_task("b", hours=3, waiting_on=["a"]), "bob_dev")
+    graph.update(_task("c", waiting_on=["b"]), "carol_dev")
+
+    assert graph.critical_path("c") == ["a", "b", "c"]
+    assert graph.critical_path_ms("c") == 5 * HOUR_MS + DEFAULT_ESTIMATE_MS
+    assert graph.blocked_chain_length("c") == 2
+    assert graph.blockers("c") == {"alice_dev": ["a"], "bob_dev": ["b"]}
+
+    # Completing the middle task breaks the chain
+    graph.update(_task("b", status="complete", hours=3, waiting_on=["a"]), "bob_dev")
+    assert graph.critical_path("c") == ["c"]
+    assert graph.blocked_chain_length("c") == 0
+    assert graph.blockers("c") == {}
+
+
+def test_edges_stated_by_both_tasks_are_reference_counted():
+    graph = TaskGraph()
+    graph.update(_task("a", blocking=["b"]))
+    graph.update(_task("b", waiting_on=["a"]))
+    assert graph.blocked_chain_length("b") == 1
+
+    graph.update(_task("a"))
+    assert graph.blocked_chain_length("b") == 1
+    graph.update(_task("b"))
+    assert graph.blocked_chain_length("b") == 0
+
+
+def test_cycle_is_reported_until_broken():
+    graph = TaskGraph()
+    graph.update(_task("a", waiting_on=["b"]))
+    graph.update(_task("b", waiting_on=["a"]))
+    graph.update(_task("c", waiting_on=["b"]))
+
+    assert graph.cycles() == [["a", "b"]]
+    assert graph.critical_path_ms("c") is None
+    assert graph.critical_path("c") == []
+
+    graph.remove("a")
+    assert graph.cycles() == []
+    assert graph.critical_path("c") == ["b", "c"]
+
+
+def test_edges_to_unknown_tasks_apply_once_they_are_added():
+    graph = TaskGraph()
+    graph.update(_task("b", waiting_on=["a"]))
+    assert graph.blocked_chain_length("b") == 0
+
+    graph.update(_task("a", hours=4))
+    assert graph.critical_path("b") == ["a", "b"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_updates_match_rebuild(seed):
+    rng = random.Random(seed)
+    task_ids = [f"t{number}" for number in range(25)]
+    tasks, employees = {}, {}
+    graph = TaskGraph()
+
+    for step in range(200):
+        task_id = rng.choice(task_ids)
+        if task_id in tasks and rng.random() < 0.2:
+            assert graph.remove(task_id)
+            del tasks[task_id], employees[task_id]
+        else:
+            tasks[task_id] = _random_task(rng, task_id, task_ids)
+            employees[task_id] = rng.choice(PEOPLE)
+            graph.update(tasks[task_id], employees[task_id])
+        if step % 10 == 9:
+            _assert_matches_rebuild(graph, tasks, employees)
+
+    _assert_matches_rebuild(graph, tasks, employees)
+    assert not graph.remove("missing")
@@ -0,0 +1,91 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from clickup_models import TaskRecord
+from fake_clickup_server import generate_workspace
+from organize_tasks import get_task_statistics, organize_tasks_by_employee, save_organized_tasks, save_task_statistics
+from task_aggregates import TaskAggregates
+from task_changelog import ChangeLog, read_changes
+from task_pipeline import stream_tasks_to_files
+from task_timing import get_timing_statistics
+
+NOW_MS = 1_700_000_000_000
+
+
+def _pages(tasks, page_size):
+    return [tasks[start:start + page_size] for start in range(0, len(tasks), page_size)]
+
+
+def _raw_tasks(num_tasks, seed=0):
+    return list(generate_workspace(num_tasks, num_members=5, seed=seed, now_ms=NOW_MS)["tasks"].values())
+
+
+def _read(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("as_records", [False, True])
+def test_streamed_files_match_batch_output(tmp_path, as_records):
+    raw_tasks = _raw_tasks(250)
+    tasks = [TaskRecord.from_raw(task) for task in raw_tasks] if as_records else raw_tasks
+    employee_tasks = organize_tasks_by_employee(raw_tasks)
+    save_organized_tasks(employee_tasks, str(tmp_path / "batch_tasks.json"))
+    save_task_statistics(get_task_statistics(employee_tasks, NOW_MS), str(tmp_path / "batch_stats.json"))
+
+    stats = stream_tasks_to_files(_pages(tasks, 40), str(tmp_path / "tasks.json"), str(tmp_path / "stats.json"),
+                                  NOW_MS, timing_filename=str(tmp_path / "timing.json"),
+                                  aggregates_filename=str(tmp_path / "aggregates.json"))
+
+    assert stats == get_task_statistics(employee_tasks, NOW_MS)
+    assert _read(tmp_path / "tasks.json") == _read(tmp_path / "batch_tasks.json")
+    assert _read(tmp_path / "stats.json") == _read(tmp_path / "batch_stats.json")
+    with open(tmp_path / "timing.json", encoding="utf-8") as f:
+        assert json.load(f) == json.loads(json.dumps(get_timing_statistics(employee_tasks)))
+    streamed = TaskAggregates.load(str(tmp_path / "aggregates.json")).to_dict()
+    batch = TaskAggregates.from_employee_tasks(employee_tasks).to_dict()
+    assert streamed["tables"] == batch["tables"]
+
+
+def test_empty_sync_writes_nothing(tmp_path):
+    tasks_filename = tmp_path / "tasks.json"
+    stats_filename = tmp_path / "stats.json"
+
+    stream_tasks_to_files([], str(tasks_filename), str(stats_filename), NOW_MS)
+
+    assert not tasks_filename.exists()
+    assert not stats_filename.exists()
+
+
+def test_failed_sync_logs_nothing(tmp_path):
+    tasks_filename = str(tmp_path / "summary_clickup.json")
+    stats_filename = str(tmp_path / "clickup_statistics.json")
+    changelog_filename = str(tmp_path / "clickup_changes.jsonl")
+
+    with ChangeLog(changelog_filename) as changelog:
+        stream_tasks_to_files(_pages(_raw_tasks(30), 10), tasks_filename, stats_filename, NOW_MS,
+                              changelog=changelog)
+    with open(tasks_filename, "rb") as f:
+        synced = f.read()
+    logged = list(read_changes(changelog_filename))
+
+    def failing_pages():
+        yield from _pages(_raw_tasks(30, seed=1), 10)[:2]
+        raise ConnectionError("connection reset")
+
+    with ChangeLog(changelog_filename) as changelog:
+        with pytest.raises(ConnectionError):
+            stream_tasks_to_files(failing_pages(), tasks_filename, stats_filename, NOW_MS, changelog=changelog)
+        assert changelog.seq == len(logged)
+
+    with open(tasks_filename, "rb") as f:
+        assert f.read() == synced
+    assert list(read_changes(changelog_filename)) == logged
+    with ChangeLog(changelog_filename) as reopened:
+        assert reopened.seq == len(logged)
+        assert reopened.task_ids() == {change["task_id"] for change, _ in logged}
@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Agent 2'))
+
+from fake_clickup_server import generate_workspace
+from organize_tasks import get_task_statistics, organize_tasks_by_employee
+from task_aggregates import TaskAggregates
+from task_pipeline import stream_tasks_to_files
+from task_shards import iter_jsonl_shards, organize_tasks_sharded, shard_tasks_to_files, split_tasks
+
+NOW_MS = 1_700_000_000_000
+
+
+@pytest.fixture(scope="module")
+def raw_tasks():
+    return list(generate_workspace(600, num_members=6, seed=3, now_ms=NOW_MS)["tasks"].values())
+
+
+def _read(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def test_organize_tasks_sharded_matches_serial(raw_tasks):
+    employee_tasks, stats = organize_tasks_sharded(raw_tasks, workers=2, shard_size=150, now_ms=NOW_MS)
+
+    serial = organize_tasks_by_employee(raw_tasks)
+    assert employee_tasks == serial
+    assert list(employee_tasks) == list(serial)
+    assert stats == get_task_statistics(serial, NOW_MS)
+
+
+def test_jsonl_shards_match_streamed_files(raw_tasks, tmp_path):
+    export = tmp_path / "tasks.jsonl"
+    with open(export, "w", encoding="utf-8") as f:
+        for task in raw_tasks:
+            f.write(json.dumps(task) + "\n")
+    assert sum(1 for _ in iter_jsonl_shards(str(export), shard_size=128)) == 5
+
+    sharded = tmp_path / "sharded"
+    serial = tmp_path / "serial"
+    sharded.mkdir()
+    serial.mkdir()
+    outputs = ("summary_clickup.json", "clickup_statistics.json", "clickup_timing.json", "clickup_aggregates.json")
+
+    sharded_stats = shard_tasks_to_files(iter_jsonl_shards(str(export), shard_size=128),
+                                         *[str(sharded / name) for name in outputs[:3]], workers=2,
+                                         now_ms=NOW_MS, aggregates_filename=str(sharded / outputs[3]))
+    serial_stats = stream_tasks_to_files(split_tasks(raw_tasks, 128), str(serial / outputs[0]),
+                                         str(serial / outputs[1]), NOW_MS, timing_filename=str(serial / outputs[2]),
+                                         aggregates_filename=str(serial / outputs[3]))
+
+    assert sharded_stats == serial_stats
+    for name in outputs[:3]:
+        assert _read(sharded / name) == _read(serial / name), name
+    assert TaskAggregates.load(str(sharded / outputs[3])).to_dict()["tables"] == \
+        TaskAggregates.load(str(serial / outputs[3])).to_dict()["tables"]
+
+
+def test_no_shards_writes_nothing(tmp_path):
+    tasks_filename = tmp_path / "summary_clickup.json"
+    aggregates_filename = tmp_path / "clickup_aggregates.json"
+
+    shard_tasks_to_files([], str(tasks_filename), str(tmp_path / "clickup_statistics.json"), workers=1,
+                         now_ms=NOW_MS, aggregates_filename=str(aggregates_filename))
+
+    assert not tasks_filename.exists()
+    assert not aggregates_filename.exists()